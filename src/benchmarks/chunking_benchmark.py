@@ -0,0 +1,94 @@
+"""
+Compare character-based and token-aware chunking
+
+Reports throughput (MB/s, chunks/s) for each chunking method and how many
+chunks would be truncated when embedded, either by the provider's
+INPUT_DAFAULT_MAX_CHARACTERS cut or by the embedding model's token window.
+
+Run from the src directory:
+    python -m benchmarks.chunking_benchmark --files assets/files/<project_id>/policy.txt
+    python -m benchmarks.chunking_benchmark --synthetic-paragraphs 5000
+"""
+from helpers.config import get_settings
+from controllers.ProcessController import get_text_splitter, get_token_splitter, get_tokenizer
+import argparse
+import random
+import time
+
+WORDS = [
+    "employee", "policy", "leave", "annual", "manager", "approval", "salary", "benefits",
+    "probation", "contract", "notice", "period", "overtime", "remote", "work", "holiday",
+    "insurance", "performance", "review", "training", "allowance", "termination", "the",
+    "shall", "be", "in", "accordance", "with", "of", "and", "to", "for", "a", "each",
+]
+
+
+def build_synthetic_text(paragraphs: int, seed: int = 42):
+    rng = random.Random(seed)
+    blocks = []
+    for p in range(paragraphs):
+        sentences = [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))).capitalize() + "."
+            for _ in range(rng.randint(2, 8))
+        ]
+        if p % 10 == 0:
+            blocks.append(f"Section {p // 10 + 1}\n")
+        blocks.append(" ".join(sentences))
+    return "\n\n".join(blocks)
+
+
+def run(name: str, splitter, text: str, tokenizer, max_tokens: int, max_characters: int):
+    started = time.perf_counter()
+    chunks = splitter.split_text(text)
+    elapsed = time.perf_counter() - started
+
+    token_counts = [len(tokenizer.encode(chunk)) for chunk in chunks]
+    truncated_by_tokens = sum(1 for count in token_counts if count > max_tokens)
+    truncated_by_characters = sum(1 for chunk in chunks if len(chunk) > max_characters)
+
+    return {
+        "method": name,
+        "chunks": len(chunks),
+        "seconds": round(elapsed, 3),
+        "mb_per_second": round(len(text.encode("utf-8")) / 1048576 / elapsed, 2),
+        "chunks_per_second": round(len(chunks) / elapsed, 1),
+        "avg_tokens": round(sum(token_counts) / max(len(token_counts), 1), 1),
+        "max_tokens": max(token_counts, default=0),
+        "truncated_by_tokens": truncated_by_tokens,
+        "truncated_by_characters": truncated_by_characters,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", nargs="*", default=[], help="text files to chunk")
+    parser.add_argument("--synthetic-paragraphs", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap-size", type=int, default=200)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    max_tokens = settings.EMBEDDING_MODEL_MAX_TOKENS
+
+    if args.files:
+        text = "\n\n".join(open(path, encoding="utf-8").read() for path in args.files)
+    else:
+        text = build_synthetic_text(args.synthetic_paragraphs)
+
+    tokenizer = get_tokenizer(settings.EMBEDDING_MODEL_ID)
+    overlap_tokens = max_tokens * args.overlap_size // args.chunk_size
+
+    results = [
+        run("character", get_text_splitter(args.chunk_size, args.overlap_size),
+            text, tokenizer, max_tokens, settings.INPUT_DAFAULT_MAX_CHARACTERS),
+        run("token", get_token_splitter(settings.EMBEDDING_MODEL_ID, max_tokens, overlap_tokens),
+            text, tokenizer, max_tokens, settings.INPUT_DAFAULT_MAX_CHARACTERS),
+    ]
+
+    print(f"corpus: {len(text)} characters, model: {settings.EMBEDDING_MODEL_ID} ({max_tokens} tokens)")
+    for result in results:
+        print(" | ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Synthetic HR policy corpora for the benchmarks
+
+Documents are built from per-topic vocabularies with a seeded random
+generator: the same seed, size and formats always give the same files.
+PDFs are written with PyMuPDF, which the PDF loader already depends on.
+"""
+import os
+import random
+
+TOPICS = {
+    "annual leave": ["vacation", "days", "accrual", "carry-over", "approval", "calendar", "holiday", "request"],
+    "remote work": ["home", "office", "hybrid", "equipment", "schedule", "availability", "stipend", "security"],
+    "overtime": ["hours", "compensation", "manager", "approval", "weekend", "rate", "timesheet", "limit"],
+    "performance review": ["goals", "feedback", "rating", "cycle", "calibration", "promotion", "self-assessment", "manager"],
+    "health insurance": ["coverage", "dependents", "premium", "claims", "dental", "vision", "enrollment", "provider"],
+    "onboarding": ["orientation", "buddy", "laptop", "training", "probation", "checklist", "access", "welcome"],
+    "parental leave": ["birth", "adoption", "weeks", "pay", "return", "notice", "caregiver", "benefits"],
+    "expense reimbursement": ["receipts", "travel", "meals", "mileage", "approval", "card", "deadline", "policy"],
+    "code of conduct": ["respect", "harassment", "reporting", "confidential", "conflict", "ethics", "investigation", "discipline"],
+    "resignation": ["notice", "exit", "interview", "handover", "final", "paycheck", "equipment", "reference"],
+}
+
+SENTENCE_TEMPLATES = [
+    "Employees must submit {a} requests for {topic} through the HR portal before the {b} deadline.",
+    "The {topic} policy defines how {a} and {b} are handled across all departments.",
+    "Managers review {a} within five working days and confirm the {b} in writing.",
+    "Questions about {a} under the {topic} policy should be sent to the HR business partner.",
+    "Part-time staff receive {a} in proportion to their contracted hours, including {b}.",
+    "Any exception to the {topic} rules on {a} requires approval from the department head.",
+    "The {b} limit is reviewed every year together with the {a} guidelines.",
+    "Records of {a} and {b} are kept for three years in line with data retention rules.",
+]
+
+FORMATS = ["txt", "md", "pdf"]
+
+
+def generate_document(rng: random.Random, topic: str, words: int):
+    """Title and sections (heading, paragraph) of about words words"""
+    vocabulary = TOPICS[topic]
+    sections = []
+    written = 0
+
+    while written < words:
+        heading = f"{topic.title()}: {rng.choice(vocabulary).title()}"
+        sentences = []
+        for _ in range(rng.randint(4, 8)):
+            a, b = rng.sample(vocabulary, 2)
+            sentences.append(rng.choice(SENTENCE_TEMPLATES).format(topic=topic, a=a, b=b))
+        paragraph = " ".join(sentences)
+        sections.append((heading, paragraph))
+        written += len(paragraph.split())
+
+    return f"{topic.title()} Policy", sections
+
+
+def write_txt(file_path: str, title: str, sections: list):
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(title + "\n\n")
+        for heading, paragraph in sections:
+            f.write(f"{heading}\n{paragraph}\n\n")
+
+
+def write_md(file_path: str, title: str, sections: list):
+    with open(file_path, "w", encoding="utf-8") as f:
+        f.write(f"# {title}\n\n")
+        for heading, paragraph in sections:
+            f.write(f"## {heading}\n\n{paragraph}\n\n")
+
+
+def write_pdf(file_path: str, title: str, sections: list, sections_per_page: int=3):
+    import fitz
+
+    document = fitz.open()
+    for start in range(0, len(sections), sections_per_page):
+        page = document.new_page()
+        text = "\n\n".join(f"{heading}\n{paragraph}" for heading, paragraph in sections[start:start + sections_per_page])
+        if start == 0:
+            text = f"{title}\n\n{text}"
+        page.insert_textbox(fitz.Rect(50, 50, page.rect.width - 50, page.rect.height - 50), text, fontsize=9)
+    document.save(file_path)
+    document.close()
+
+
+WRITERS = {"txt": write_txt, "md": write_md, "pdf": write_pdf}
+
+
+def generate_corpus(output_dir: str, documents: int, words_per_document: int,
+                    formats: list=None, seed: int=0):
+    """
+    Write documents files cycling through topics and formats
+
+    Returns:
+        List of {"file_path", "topic", "format"}
+    """
+    rng = random.Random(seed)
+    formats = formats or FORMATS
+    topics = list(TOPICS)
+    os.makedirs(output_dir, exist_ok=True)
+
+    corpus = []
+    for i in range(documents):
+        topic = topics[i % len(topics)]
+        file_format = formats[i % len(formats)]
+        title, sections = generate_document(rng, topic, words_per_document)
+
+        file_path = os.path.join(output_dir, f"hr_policy_{i:04d}_{topic.replace(' ', '_')}.{file_format}")
+        WRITERS[file_format](file_path, title, sections)
+        corpus.append({"file_path": file_path, "topic": topic, "format": file_format})
+
+    return corpus
+
+
+def generate_queries(count: int, seed: int=0):
+    """Questions about the corpus topics, as {"text", "topic"}"""
+    rng = random.Random(seed)
+    queries = []
+    for i in range(count):
+        topic = rng.choice(list(TOPICS))
+        term = rng.choice(TOPICS[topic])
+        queries.append({"text": f"What does the {topic} policy say about {term}?", "topic": topic})
+    return queries
@@ -0,0 +1,110 @@
+"""
+Compare local embedding backends: HuggingFaceEmbeddings (PyTorch) against
+ONNX Runtime, fp32 and int8-quantized
+
+Each backend embeds the same synthetic sentences; the report gives
+sentences/sec, resident memory added by loading and running the model, and
+the cosine similarity of every ONNX embedding to its PyTorch counterpart
+(parity check: mean and minimum should stay close to 1.0, int8 a bit lower).
+
+Run from the src directory:
+    python -m benchmarks.embedding_backend_benchmark --sentences 2000 --threads 4
+"""
+from stores.llm.providers import LangChainHFProvider, ONNXEmbeddingProvider
+import argparse
+import gc
+import math
+import os
+import random
+import tempfile
+import time
+
+
+WORDS = ("employee benefits leave policy onboarding payroll contract review training salary "
+         "manager remote office insurance holiday overtime promotion feedback hiring team").split()
+
+
+def build_sentences(count: int, seed: int=7):
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 60))).capitalize() + "."
+        for _ in range(count)
+    ]
+
+
+def get_rss_mb():
+    # current resident set size, from /proc on Linux, peak RSS elsewhere
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 / 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def cosine(a: list, b: list) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    return dot / ((math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))) or 1.0)
+
+
+def run_backend(label: str, build_provider, model_id: str, embedding_size: int, sentences: list):
+    gc.collect()
+    rss_before = get_rss_mb()
+
+    provider = build_provider()
+    provider.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    provider.embed_texts(sentences[:32])  # warm up
+
+    started = time.perf_counter()
+    embeddings = provider.embed_texts(sentences)
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "backend": label,
+        "sentences_per_sec": round(len(sentences) / elapsed, 1),
+        "rss_added_mb": round(get_rss_mb() - rss_before, 1),
+    }
+    return result, embeddings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model-id", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--embedding-size", type=int, default=384)
+    parser.add_argument("--sentences", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=0, help="ONNX intra-op threads, 0 lets ONNX Runtime decide")
+    parser.add_argument("--max-length", type=int, default=256)
+    parser.add_argument("--model-dir", default=None, help="where to export the ONNX models (default: a temp dir)")
+    args = parser.parse_args()
+
+    sentences = build_sentences(args.sentences)
+    model_dir = args.model_dir or tempfile.mkdtemp(prefix="onnx_models_")
+
+    backends = [
+        ("pytorch", lambda: LangChainHFProvider(default_input_max_characters=10000)),
+        ("onnx", lambda: ONNXEmbeddingProvider(model_dir=model_dir, quantize=False, intra_op_threads=args.threads,
+                                               batch_size=args.batch_size, max_length=args.max_length,
+                                               default_input_max_characters=10000)),
+        ("onnx-int8", lambda: ONNXEmbeddingProvider(model_dir=model_dir, quantize=True, intra_op_threads=args.threads,
+                                                    batch_size=args.batch_size, max_length=args.max_length,
+                                                    default_input_max_characters=10000)),
+    ]
+
+    reference = None
+    for label, build_provider in backends:
+        result, embeddings = run_backend(label, build_provider, args.model_id, args.embedding_size, sentences)
+
+        if reference is None:
+            reference = embeddings
+        else:
+            similarities = [ cosine(a, b) for a, b in zip(reference, embeddings) ]
+            result["parity_mean_cosine"] = round(sum(similarities) / len(similarities), 5)
+            result["parity_min_cosine"] = round(min(similarities), 5)
+
+        print(" | ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
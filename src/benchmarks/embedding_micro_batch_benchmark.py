@@ -0,0 +1,110 @@
+"""
+Load-test query embedding with and without the micro-batcher
+
+Simulated users each send single-query aembed_text calls back to back. The
+default backend models a local CPU embedding model: one forward pass at a
+time, costing a fixed overhead plus a per-text cost, so batching amortizes
+the overhead. --live uses the configured HuggingFace model instead.
+
+Run from the src directory:
+    python -m benchmarks.embedding_micro_batch_benchmark --users 50 --queries 20 --max-wait-ms 5 --max-batch-size 32
+"""
+from stores.llm.MicroBatchingProvider import MicroBatchingProvider
+import argparse
+import asyncio
+import threading
+import time
+
+
+class SimulatedCPUEmbeddingProvider:
+    """One forward pass at a time, costing overhead_ms + per_text_ms per text"""
+
+    def __init__(self, overhead_ms: float, per_text_ms: float, embedding_size: int=384):
+        self.overhead_ms = overhead_ms
+        self.per_text_ms = per_text_ms
+        self.embedding_size = embedding_size
+        self.forward_passes = 0
+        self.lock = threading.Lock()
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        with self.lock:
+            self.forward_passes += 1
+            time.sleep((self.overhead_ms + self.per_text_ms * len(texts)) / 1000)
+        return [[0.1] * self.embedding_size for _ in texts]
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        return await asyncio.to_thread(self.embed_texts, texts, document_type)
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        embeddings = await self.aembed_texts([text], document_type)
+        return embeddings[0]
+
+
+def percentile(values: list, p: float):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def run_load(provider, users: int, queries: int):
+    latencies = []
+
+    async def user(user_id: int):
+        for i in range(queries):
+            started = time.perf_counter()
+            embedding = await provider.aembed_text(text=f"user {user_id} question {i} about leave policy",
+                                                   document_type="query")
+            if embedding is None:
+                raise RuntimeError("embedding failed")
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[user(user_id) for user_id in range(users)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "queries": len(latencies),
+        "throughput_qps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+    }
+
+
+def build_backend(args):
+    if not args.live:
+        return SimulatedCPUEmbeddingProvider(overhead_ms=args.overhead_ms, per_text_ms=args.per_text_ms)
+
+    from helpers.config import get_settings
+    from stores.llm.providers import LangChainHFProvider
+
+    settings = get_settings()
+    provider = LangChainHFProvider(default_input_max_characters=settings.INPUT_DAFAULT_MAX_CHARACTERS)
+    provider.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID, embedding_size=settings.EMBEDDING_MODEL_SIZE)
+    return provider
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=20, help="queries per user")
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    parser.add_argument("--max-batch-size", type=int, default=32)
+    parser.add_argument("--overhead-ms", type=float, default=8, help="simulated cost of one forward pass")
+    parser.add_argument("--per-text-ms", type=float, default=0.5, help="simulated cost per text in a pass")
+    parser.add_argument("--live", action="store_true", help="use the configured HuggingFace embedding model")
+    args = parser.parse_args()
+
+    backend = build_backend(args)
+
+    direct = await run_load(backend, args.users, args.queries)
+    print("direct:  " + " | ".join(f"{key}={value}" for key, value in direct.items()))
+
+    batcher = MicroBatchingProvider(provider=backend, max_wait_ms=args.max_wait_ms,
+                                    max_batch_size=args.max_batch_size)
+    batched = await run_load(batcher, args.users, args.queries)
+    batch_metrics = batcher.get_metrics()
+    print("batched: " + " | ".join(f"{key}={value}" for key, value in batched.items())
+          + f" | batches={batch_metrics['batches']} | mean_batch_size={batch_metrics['mean_batch_size']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+"""
+Deterministic stand-ins for the LLM providers, used by the pipeline benchmark
+
+Both implement LLMInterface so the controllers run unchanged, and both return
+the same output for the same input on every run and machine, which keeps
+benchmark runs comparable.
+"""
+from stores.llm.LLMInterface import LLMInterface
+from stores.llm.LLMEnums import OpenAIEnums
+import asyncio
+import hashlib
+import math
+import re
+import time
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+class HashEmbeddingProvider(LLMInterface):
+    """
+    Hashed bag-of-words embeddings
+
+    Every word is hashed (blake2b, not the salted builtin hash) to a dimension
+    and a sign; the vector is L2-normalized. Texts sharing words get close
+    vectors, so search results are meaningful. latency_ms simulates the cost
+    of one forward pass, per_text_ms its growth with the batch size.
+    """
+
+    def __init__(self, embedding_size: int=384, latency_ms: float=0.0, per_text_ms: float=0.0):
+        self.embedding_model_id = "hash-bow"
+        self.embedding_size = embedding_size
+        self.generation_model_id = None
+
+        self.latency_ms = latency_ms
+        self.per_text_ms = per_text_ms
+
+        self.enums = OpenAIEnums
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def vectorize(self, text: str):
+        vector = [0.0] * self.embedding_size
+        for token in TOKEN_PATTERN.findall(text.lower()):
+            digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            vector[value % self.embedding_size] += 1.0 if value & (1 << 63) else -1.0
+
+        norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+        return [ value / norm for value in vector ]
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        if self.latency_ms or self.per_text_ms:
+            time.sleep((self.latency_ms + self.per_text_ms * len(texts)) / 1000)
+        return [ self.vectorize(text) for text in texts ]
+
+    def embed_text(self, text: str, document_type: str = None):
+        return self.embed_texts([text], document_type)[0]
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        if self.latency_ms or self.per_text_ms:
+            await asyncio.sleep((self.latency_ms + self.per_text_ms * len(texts)) / 1000)
+        return [ self.vectorize(text) for text in texts ]
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        embeddings = await self.aembed_texts([text], document_type)
+        return embeddings[0]
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        return None
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        return None
+
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        return None
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        return
+        yield
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {"role": role, "content": prompt}
+
+
+class FakeGenerationProvider(LLMInterface):
+    """
+    Canned generation with a simulated latency
+
+    The reply quotes the start of the last message, its usage is estimated
+    with count_tokens. latency_ms is the time to the first token; the stream
+    then yields one word every per_token_ms.
+    """
+
+    def __init__(self, latency_ms: float=0.0, per_token_ms: float=0.0, output_words: int=40):
+        self.generation_model_id = "fake-generation"
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        self.latency_ms = latency_ms
+        self.per_token_ms = per_token_ms
+        self.output_words = output_words
+
+        self.enums = OpenAIEnums
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def get_reply(self, prompt: str, max_output_tokens: int=None):
+        words = TOKEN_PATTERN.findall(prompt)[-self.output_words:]
+        if max_output_tokens:
+            words = words[:max_output_tokens]
+        return "Based on the policy: " + " ".join(words)
+
+    def get_usage(self, messages: list, reply: str):
+        return {
+            "prompt_tokens": sum(self.count_tokens(message["content"]) for message in messages),
+            "completion_tokens": self.count_tokens(reply),
+            "cached_tokens": 0,
+        }
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        time.sleep(self.latency_ms / 1000)
+        return self.get_reply(prompt, max_output_tokens)
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self.get_reply(prompt, max_output_tokens)
+
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        reply = self.get_reply(messages[-1]["content"], max_output_tokens)
+        await asyncio.sleep((self.latency_ms + self.per_token_ms * len(reply.split())) / 1000)
+        return {"text": reply, "usage": self.get_usage(messages, reply)}
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        reply = self.get_reply(messages[-1]["content"], max_output_tokens)
+        await asyncio.sleep(self.latency_ms / 1000)
+        for i, word in enumerate(reply.split()):
+            if i:
+                await asyncio.sleep(self.per_token_ms / 1000)
+            yield {"text": word if i == 0 else " " + word}
+        yield {"usage": self.get_usage(messages, reply)}
+
+    def embed_text(self, text: str, document_type: str = None):
+        return None
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        return None
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        return None
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        return None
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {"role": role, "content": prompt}
@@ -0,0 +1,115 @@
+"""
+Compare HR email latency between the template fast path and the LLM path
+
+Both paths run through HREmailController.generate_email with the same fully
+structured contexts; the LLM path is forced with generation_mode="llm" against a
+fake generation client that sleeps for a simulated round trip, or against the
+configured GENERATION_BACKEND with --live.
+
+Run from the src directory:
+    python -m benchmarks.hr_email_benchmark --emails 200 --llm-latency-ms 1500
+    python -m benchmarks.hr_email_benchmark --emails 20 --live
+"""
+from controllers import HREmailController
+from stores.llm.templates.template_parser import TemplateParser
+import argparse
+import asyncio
+import random
+import time
+
+
+class FakeGenerationClient:
+    """Stands in for an LLM provider, returning a canned email after a simulated round trip"""
+
+    class enums:
+        class SYSTEM:
+            value = "system"
+
+    def __init__(self, latency_ms: float):
+        self.latency_ms = latency_ms
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {"role": role, "content": prompt}
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                             temperature: float=None):
+        await asyncio.sleep(self.latency_ms / 1000 * random.uniform(0.7, 1.3))
+        return "**Subject:** Interview Invitation\n\nDear Candidate,\n\nSee you soon.\n\nBest regards,\nHR Team"
+
+
+def build_cases(emails: int):
+    cases = []
+    for i in range(emails):
+        email_type = ["interview_invitation", "performance_review", "reminder"][i % 3]
+        if email_type == "reminder":
+            context = f"Subject: Benefits enrollment deadline, Date: March {1 + i % 28}th, 2025"
+        else:
+            context = (f"Position: Backend Engineer {i}, Date: March {1 + i % 28}th, 2025, "
+                       f"Time: {9 + i % 8}:00, Location: Building {i % 5}, Room {100 + i % 50}")
+        cases.append((email_type, f"Candidate {i}", context))
+    return cases
+
+
+def percentile(values: list, p: float):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def run_path(controller: HREmailController, cases: list, generation_mode: str):
+    latencies, modes = [], set()
+    for email_type, recipient_name, context in cases:
+        started = time.perf_counter()
+        _, mode, _ = await controller.generate_email(email_type=email_type, recipient_name=recipient_name,
+                                                  context=context, generation_mode=generation_mode)
+        latencies.append((time.perf_counter() - started) * 1000)
+        modes.add(mode)
+
+    return {
+        "mode": ",".join(sorted(modes)),
+        "emails": len(cases),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--llm-latency-ms", type=float, default=1500,
+                        help="simulated LLM round trip when not running --live")
+    parser.add_argument("--live", action="store_true", help="call the configured GENERATION_BACKEND")
+    args = parser.parse_args()
+
+    provider_factory = None
+    if args.live:
+        from helpers.config import get_settings
+        from stores.llm.LLMProviderFactory import LLMProviderFactory
+
+        settings = get_settings()
+        provider_factory = LLMProviderFactory(settings)
+        generation_client = provider_factory.create(provider=settings.GENERATION_BACKEND)
+        generation_client.set_generation_model(model_id=settings.GENERATION_MODEL_ID)
+    else:
+        generation_client = FakeGenerationClient(latency_ms=args.llm_latency_ms)
+
+    controller = HREmailController(generation_client=generation_client, template_parser=TemplateParser("en"))
+    cases = build_cases(args.emails)
+
+    try:
+        # warm up the template module import so it is not counted in the first sample
+        await controller.generate_email(*cases[0])
+
+        template_result = await run_path(controller, cases, "template")
+        llm_result = await run_path(controller, cases, "llm")
+    finally:
+        if provider_factory:
+            await provider_factory.close()
+
+    for result in (template_result, llm_result):
+        print(" | ".join(f"{key}={value}" for key, value in result.items()))
+    print(f"speedup_p50={round(llm_result['p50_ms'] / max(template_result['p50_ms'], 1e-6))}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
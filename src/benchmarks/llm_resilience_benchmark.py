@@ -0,0 +1,105 @@
+"""
+Exercise the async LLM provider layer against a local mock OpenAI-compatible server
+
+The server injects latency and errors (429 with Retry-After, 503) at configurable
+rates; the client side runs concurrent agenerate_text / aembed_texts calls through
+the shared connection pool and retry policy, and reports success rate, upstream
+attempts per call and latency percentiles.
+
+Run from the src directory:
+    python -m benchmarks.llm_resilience_benchmark --requests 200 --concurrency 50 \
+        --latency-ms 80 --rate-limit-ratio 0.1 --server-error-ratio 0.05
+"""
+from http.server import ThreadingHTTPServer
+from stores.llm.HTTPClientPool import HTTPClientPool
+from stores.llm.RetryPolicy import RetryPolicy
+from stores.llm.providers import OpenAIProvider
+from tests.mock_llm_server import MockLLMHandler
+import argparse
+import asyncio
+import threading
+import time
+
+
+def percentile(values: list, p: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+async def run(provider: OpenAIProvider, requests: int, concurrency: int, embed: bool):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, failures = [], 0
+
+    async def one_call(i: int):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                if embed:
+                    result = await provider.aembed_texts(texts=[f"text {i}", f"text {i + 1}"])
+                else:
+                    result = await provider.agenerate_text(prompt=f"question {i}", chat_history=[])
+                if not result:
+                    failures += 1
+            except Exception:
+                failures += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*[one_call(i) for i in range(requests)])
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "failures": failures,
+        "upstream_attempts": MockLLMHandler.attempts,
+        "throughput_rps": round(requests / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.1)
+    parser.add_argument("--server-error-ratio", type=float, default=0.05)
+    parser.add_argument("--max-connections", type=int, default=100)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--deadline", type=float, default=30.0)
+    parser.add_argument("--embed", action="store_true", help="benchmark aembed_texts instead of agenerate_text")
+    args = parser.parse_args()
+
+    MockLLMHandler.latency_ms = args.latency_ms
+    MockLLMHandler.rate_limit_ratio = args.rate_limit_ratio
+    MockLLMHandler.server_error_ratio = args.server_error_ratio
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    http_pool = HTTPClientPool(max_connections=args.max_connections, timeout=10)
+    provider = OpenAIProvider(
+        api_key="mock",
+        api_url=f"http://127.0.0.1:{server.server_address[1]}/v1",
+        http_pool=http_pool,
+        retry_policy=RetryPolicy(max_retries=args.max_retries, backoff_base=0.05,
+                                 backoff_max=2.0, deadline=args.deadline),
+    )
+    provider.set_generation_model(model_id="mock-model")
+    provider.set_embedding_model(model_id="mock-embedding", embedding_size=8)
+
+    try:
+        result = await run(provider, args.requests, args.concurrency, args.embed)
+        print(" | ".join(f"{key}={value}" for key, value in result.items()))
+    finally:
+        await http_pool.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+"""
+Measure RSS per worker and search throughput for 1..N uvicorn workers
+
+For each worker count the app is started with `uvicorn main:app --workers N`
+and loaded with concurrent /api/v1/nlp/index/search requests for a fixed
+duration. In "per-worker" mode every worker loads the configured embedding
+model itself; in "sidecar" mode the workers use EMBEDDING_BACKEND="SIDECAR"
+and one embedding_sidecar process holds the model. Several workers need a
+Qdrant server (VECTOR_DB_URL) and an indexed project.
+
+Run from the src directory:
+    python -m benchmarks.multi_worker_benchmark --project-id 1 --workers 1 2 4 --mode sidecar
+"""
+from benchmarks.startup_benchmark import get_free_port, wait_for
+from helpers.config import get_settings
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import httpx
+
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUERIES = ["What is the annual leave policy?", "How do I request remote work?",
+           "Who approves overtime?", "When are performance reviews held?",
+           "What does health insurance cover?", "How is onboarding organized?"]
+
+
+def get_rss_mb(pid: int):
+    try:
+        with open(f"/proc/{pid}/status") as status_file:
+            for line in status_file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+def get_children(pid: int):
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as stat_file:
+                # the ppid is the 2nd field after the ")" closing the command name
+                if int(stat_file.read().rsplit(")", 1)[1].split()[1]) == pid:
+                    children.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            pass
+    return children
+
+
+async def run_load(base_url: str, project_id: str, concurrency: int, duration: float):
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        async def user(user_id: int):
+            nonlocal errors
+            i = user_id
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.post(f"/nlp/index/search/{project_id}",
+                                             json={"text": QUERIES[i % len(QUERIES)], "limit": 5})
+                if response.status_code == 200:
+                    latencies.append((time.perf_counter() - started) * 1000)
+                else:
+                    errors += 1
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*[ user(user_id) for user_id in range(concurrency) ])
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput_qps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(latencies[len(latencies) // 2], 1) if latencies else None,
+        "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 1) if latencies else None,
+        "errors": errors,
+    }
+
+
+def run_workers(workers: int, args, env: dict):
+    port = get_free_port()
+    base_url = f"http://127.0.0.1:{port}/api/v1"
+
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+                               "--workers", str(workers)],
+                              cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        ready = wait_for(f"{base_url}/health/ready", started, args.timeout)
+        if ready is None:
+            return {"workers": workers, "error": "not ready"}
+
+        # with several workers a request only reaches some of them, warm all up before measuring
+        asyncio.run(run_load(base_url, args.project_id, args.concurrency, duration=2))
+        result = asyncio.run(run_load(base_url, args.project_id, args.concurrency, args.duration))
+
+        worker_pids = get_children(server.pid) if workers > 1 else [server.pid]
+        worker_rss = [ get_rss_mb(pid) for pid in worker_pids ]
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "workers": workers,
+        "ready_s": round(ready, 1),
+        **result,
+        "rss_per_worker_mb": round(statistics.mean(worker_rss), 1) if worker_rss else None,
+        "rss_workers_total_mb": round(sum(worker_rss), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--project-id", required=True, help="an already indexed project")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--mode", choices=["per-worker", "sidecar"], default="sidecar")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load per worker count")
+    parser.add_argument("--timeout", type=float, default=300)
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if max(args.workers) > 1 and not settings.VECTOR_DB_URL:
+        parser.error("several workers need a Qdrant server, set VECTOR_DB_URL")
+
+    env = dict(os.environ)
+    sidecar = None
+
+    if args.mode == "sidecar":
+        socket_path = os.path.join(tempfile.mkdtemp(prefix="embedding_sidecar_"), "embeddings.sock")
+        env["EMBEDDING_SIDECAR_BACKEND"] = settings.EMBEDDING_BACKEND
+        env["EMBEDDING_SIDECAR_SOCKET"] = socket_path
+        env["EMBEDDING_BACKEND"] = "SIDECAR"
+        sidecar = subprocess.Popen([sys.executable, "-m", "uvicorn", "embedding_sidecar:app", "--uds", socket_path],
+                                   cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        for workers in args.workers:
+            result = run_workers(workers, args, env)
+            if sidecar:
+                result["rss_sidecar_mb"] = round(get_rss_mb(sidecar.pid), 1)
+            print(f"mode={args.mode} | " + " | ".join(f"{key}={value}" for key, value in result.items()))
+    finally:
+        if sidecar:
+            sidecar.terminate()
+            sidecar.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+End-to-end benchmark of upload, process, push, search, search-batch and answer
+
+A synthetic HR corpus (TXT, MD and PDF, see benchmarks/corpus.py) is pushed
+through the real data and nlp routes in-process (httpx ASGITransport), with
+deterministic fake embedding and generation providers (benchmarks/fakes.py),
+an embedded Qdrant in a temporary directory and mongomock-motor (or a local
+Mongo with --mongo-url). Only the repo's own code is measured, so runs on the
+same machine with the same arguments are comparable; use --embedding-latency-ms
+and --generation-latency-ms to add a fixed model cost.
+
+For each stage it reports throughput and p50/p95/p99 latency, and with
+--output writes them to JSON together with the arguments and the git commit.
+
+Run from the src directory:
+    python -m benchmarks.pipeline_benchmark --documents 30 --words 2000 --queries 200 --output run.json
+"""
+from benchmarks.corpus import FORMATS, generate_corpus, generate_queries
+from benchmarks.fakes import FakeGenerationProvider, HashEmbeddingProvider
+from controllers import ProjectController
+from helpers.config import get_settings
+from helpers.readiness import ReadinessTracker
+from stores.llm.templates.template_parser import TemplateParser
+import argparse
+import asyncio
+import json
+import mimetypes
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+import httpx
+
+READINESS_COMPONENTS = ["mongodb", "vector_db", "embedding_model"]
+
+
+def percentile(values: list, p: float):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def summarize(latencies: list, elapsed: float, errors: int, **items):
+    """Throughput per second of every items count, and latency percentiles in ms"""
+    summary = {
+        "requests": len(latencies),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else None,
+    }
+    for name, count in items.items():
+        summary[name] = count
+        summary[f"{name}_per_s"] = round(count / elapsed, 1) if elapsed else None
+
+    if latencies:
+        summary.update({
+            "p50_ms": round(percentile(latencies, 50), 1),
+            "p95_ms": round(percentile(latencies, 95), 1),
+            "p99_ms": round(percentile(latencies, 99), 1),
+            "max_ms": round(max(latencies), 1),
+        })
+    return summary
+
+
+async def run_requests(send_requests: list, concurrency: int):
+    """
+    Run the send_requests coroutine functions with at most concurrency in flight
+
+    Returns:
+        Latencies (ms) and JSON bodies of the successful responses, elapsed seconds, errors
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, bodies = [], []
+    errors = 0
+
+    async def run(send_request):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            response = await send_request()
+            if response.status_code != 200:
+                errors += 1
+                return
+            latencies.append((time.perf_counter() - started) * 1000)
+            bodies.append(response.json())
+
+    started = time.perf_counter()
+    await asyncio.gather(*[ run(send_request) for send_request in send_requests ])
+    return latencies, bodies, time.perf_counter() - started, errors
+
+
+def create_db_client(mongo_url: str, database: str):
+    if mongo_url:
+        from motor.motor_asyncio import AsyncIOMotorClient
+        mongo_conn = AsyncIOMotorClient(mongo_url)
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit("mongomock-motor is not installed, pip install -r requirements-dev.txt or pass --mongo-url")
+        mongo_conn = AsyncMongoMockClient()
+
+    return mongo_conn, mongo_conn[database]
+
+
+async def create_app(args, qdrant_dir: str):
+    """The data and nlp routers with fakes and local stores in place of the startup components"""
+    from fastapi import FastAPI
+    from routes import data, nlp
+    from stores.vectordb.providers import QdrantDBProvider
+
+    settings = get_settings()
+
+    app = FastAPI()
+    app.include_router(data.data_router)
+    app.include_router(nlp.nlp_router)
+
+    app.mongo_conn, app.db_client = create_db_client(args.mongo_url, args.mongo_database)
+
+    app.vectordb_client = QdrantDBProvider(db_path=qdrant_dir,
+                                           distance_method=settings.VECTOR_DB_DISTANCE_METHOD)
+    app.vectordb_client.connect()
+
+    app.embedding_client = HashEmbeddingProvider(embedding_size=args.embedding_size,
+                                                 latency_ms=args.embedding_latency_ms,
+                                                 per_text_ms=args.embedding_per_text_ms)
+    app.generation_client = FakeGenerationProvider(latency_ms=args.generation_latency_ms)
+    app.template_parser = TemplateParser(language=settings.PRIMARY_LANG, default_language=settings.DEFAULT_LANG)
+
+    app.readiness = ReadinessTracker(components=READINESS_COMPONENTS)
+    for name in READINESS_COMPONENTS:
+        await app.readiness.run(name, asyncio.sleep(0))
+
+    return app
+
+
+async def run_benchmark(args, corpus: list, queries: list, qdrant_dir: str):
+    app = await create_app(args, qdrant_dir)
+    project_id = args.project_id
+    results = {}
+
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark/api/v1",
+                                     timeout=None) as client:
+
+            def upload(document):
+                async def send_request():
+                    with open(document["file_path"], "rb") as f:
+                        content = f.read()
+                    file_name = os.path.basename(document["file_path"])
+                    content_type = mimetypes.guess_type(file_name)[0] or "text/plain"
+                    return await client.post(f"/data/upload/{project_id}",
+                                             files={"file": (file_name, content, content_type)})
+                return send_request
+
+            latencies, _, elapsed, errors = await run_requests([ upload(document) for document in corpus ],
+                                                               args.concurrency)
+            results["upload"] = summarize(latencies, elapsed, errors, files=len(latencies),
+                                          mb=round(sum(os.path.getsize(d["file_path"]) for d in corpus) / 2**20, 2))
+
+            # process and push cover the whole project per request, they are repeated
+            # with do_reset so every round does the full work
+            def process():
+                return client.post(f"/data/process/{project_id}", json={
+                    "chunk_size": args.chunk_size, "overlap_size": args.overlap_size,
+                    "chunking_method": args.chunking_method, "do_reset": 1,
+                })
+
+            latencies, bodies, elapsed, errors = await run_requests([ process ] * args.rounds, concurrency=1)
+            results["process"] = summarize(latencies, elapsed, errors,
+                                           files=sum(body["processed_files"] for body in bodies),
+                                           chunks=sum(body["inserted_chunks"] for body in bodies))
+
+            def push():
+                return client.post(f"/nlp/index/push/{project_id}", json={"do_reset": 1})
+
+            latencies, bodies, elapsed, errors = await run_requests([ push ] * args.rounds, concurrency=1)
+            results["push"] = summarize(latencies, elapsed, errors,
+                                        chunks=sum(body["inserted_items_count"] for body in bodies))
+
+            for stage in ["search", "answer"]:
+                def query(text, stage=stage):
+                    return lambda: client.post(f"/nlp/index/{stage}/{project_id}",
+                                               json={"text": text, "limit": args.limit})
+
+                latencies, _, elapsed, errors = await run_requests([ query(q["text"]) for q in queries ],
+                                                                   args.concurrency)
+                results[stage] = summarize(latencies, elapsed, errors, queries=len(latencies))
+
+            # the same queries through /index/search-batch, compare queries_per_s with the search stage
+            def search_batch(texts):
+                return lambda: client.post(f"/nlp/index/search-batch/{project_id}",
+                                           json={"texts": texts, "limit": args.limit})
+
+            batches = [ [ q["text"] for q in queries[i:i + args.search_batch_size] ]
+                        for i in range(0, len(queries), args.search_batch_size) ]
+            latencies, bodies, elapsed, errors = await run_requests([ search_batch(texts) for texts in batches ],
+                                                                   args.concurrency)
+            results["search_batch"] = summarize(latencies, elapsed, errors,
+                                                queries=sum(len(body["results"]) for body in bodies))
+    finally:
+        shutil.rmtree(ProjectController().get_project_path(project_id=project_id), ignore_errors=True)
+        if args.mongo_url:
+            await app.mongo_conn.drop_database(args.mongo_database)
+        app.mongo_conn.close()
+        app.vectordb_client.disconnect()
+
+    return results
+
+
+def get_git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=30)
+    parser.add_argument("--words", type=int, default=2000, help="words per document")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--queries", type=int, default=200, help="requests of the search and answer stages")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--concurrency", type=int, default=8, help="in-flight upload, search and answer requests")
+    parser.add_argument("--rounds", type=int, default=3, help="repetitions of the process and push stages")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--overlap-size", type=int, default=200)
+    parser.add_argument("--chunking-method", default="character")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--search-batch-size", type=int, default=20, help="queries per /index/search-batch request")
+    parser.add_argument("--embedding-size", type=int, default=384)
+    parser.add_argument("--embedding-latency-ms", type=float, default=0.0, help="fixed cost of an embedding call")
+    parser.add_argument("--embedding-per-text-ms", type=float, default=0.0, help="added cost per embedded text")
+    parser.add_argument("--generation-latency-ms", type=float, default=0.0)
+    parser.add_argument("--mongo-url", help="a local Mongo instead of mongomock-motor, its database is dropped afterwards")
+    parser.add_argument("--mongo-database", default="hr_toolkit_benchmark")
+    parser.add_argument("--project-id", default=f"benchmark{os.getpid()}")
+    parser.add_argument("--output", help="JSON file for the results")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="pipeline_benchmark_")
+    try:
+        corpus = generate_corpus(os.path.join(work_dir, "corpus"), documents=args.documents,
+                                 words_per_document=args.words, formats=args.formats, seed=args.seed)
+        queries = generate_queries(args.queries, seed=args.seed)
+        results = asyncio.run(run_benchmark(args, corpus, queries, qdrant_dir=os.path.join(work_dir, "qdrant")))
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for stage, summary in results.items():
+        print(f"stage={stage} | " + " | ".join(f"{key}={value}" for key, value in summary.items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "args": vars(args),
+                "git_commit": get_git_commit(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
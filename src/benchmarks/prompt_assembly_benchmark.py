@@ -0,0 +1,71 @@
+"""
+Time RAG prompt assembly (system, document block and footer) for N documents
+
+Compares the previous TemplateParser.get, which checked the locale files and
+imported the group module on every call with one Template.substitute per
+document, against the in-memory registry with render_block.
+
+Run from the src directory:
+    python -m benchmarks.prompt_assembly_benchmark --documents 50 --repeat 2000
+"""
+from stores.llm.templates.template_parser import TemplateParser
+import argparse
+import os
+import timeit
+
+
+def legacy_get(parser: TemplateParser, group: str, key: str, vars: dict={}):
+    """TemplateParser.get as it was before the registry"""
+    group_path = os.path.join(parser.current_path, "locales", parser.language, f"{group}.py")
+    targeted_language = parser.language
+    if not os.path.exists(group_path):
+        group_path = os.path.join(parser.current_path, "locales", parser.default_language, f"{group}.py")
+        targeted_language = parser.default_language
+
+    if not os.path.exists(group_path):
+        return None
+
+    module = __import__(f"stores.llm.templates.locales.{targeted_language}.{group}", fromlist=[group])
+    return getattr(module, key).substitute(vars)
+
+
+def assemble_legacy(parser: TemplateParser, documents: list):
+    system_prompt = legacy_get(parser, "rag", "system_prompt")
+    documents_prompts = "\n\n".join([
+        legacy_get(parser, "rag", "document_prompt", document)
+        for document in documents
+    ])
+    footer_prompt = legacy_get(parser, "rag", "footer_prompt")
+    return system_prompt, documents_prompts, footer_prompt
+
+
+def assemble_registry(parser: TemplateParser, documents: list):
+    system_prompt = parser.get("rag", "system_prompt")
+    documents_prompts = parser.render_block("rag", "document_prompt", documents)
+    footer_prompt = parser.get("rag", "footer_prompt")
+    return system_prompt, documents_prompts, footer_prompt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=50)
+    parser.add_argument("--chunk-chars", type=int, default=800)
+    parser.add_argument("--repeat", type=int, default=2000)
+    parser.add_argument("--language", default="en")
+    args = parser.parse_args()
+
+    template_parser = TemplateParser(language=args.language)
+    documents = [
+        {"doc_num": i + 1, "chunk_text": (f"Chunk {i} about leave policy and benefits. " * 40)[:args.chunk_chars]}
+        for i in range(args.documents)
+    ]
+
+    assert assemble_legacy(template_parser, documents) == assemble_registry(template_parser, documents)
+
+    for label, assemble in (("legacy", assemble_legacy), ("registry", assemble_registry)):
+        seconds = min(timeit.repeat(lambda: assemble(template_parser, documents), number=args.repeat, repeat=3))
+        print(f"{label}: documents={args.documents} | per_prompt_us={round(seconds / args.repeat * 1e6, 1)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+Retrieval quality and latency of NLPController.search_vector_db_collection
+
+The files of a project (src/assets/files/<project_id>) are chunked with
+ProcessController and indexed into a temporary embedded Qdrant once per
+chunking setting. Every configuration then runs the labeled queries through
+search_vector_db_collection and reports recall@k, MRR and nDCG@k next to
+p50/p95 latency and cost (indexed chunks, candidates fetched per query,
+tokens of the top-k context, texts sent to the embedding model).
+
+Embeddings are cached on disk under src/assets/cache (--cache-dir) keyed by
+model, document type and text, and the embedding model is only loaded on a
+cache miss: once a corpus has been evaluated, later runs are fully offline.
+Queries are embedded before timing, so latency covers the cached query
+embedding, the vector search and the re-ranking.
+
+Labels (--labels) list the relevant chunks of each query in any of three
+forms. Chunk keys only match the chunking they were labeled with, texts and
+files also match after re-chunking:
+    {"project_id": "1", "queries": [{
+        "text": "How many vacation days can I carry over?",
+        "relevant_chunks": [{"file_id": "x_leave.pdf", "source_document": 0, "chunk_index": 2}],
+        "relevant_texts": ["up to five days of unused leave"],
+        "relevant_files": ["x_leave.pdf"]}]}
+
+Configurations (--configs) are a JSON list overriding chunk_size,
+overlap_size, chunking_method, limit and any RAG_RETRIEVAL_* / RAG_RERANK_*
+setting, e.g. [{"name": "no-rerank", "RAG_RERANK_LENGTH_BONUS": 0,
+"RAG_RERANK_COMPLETENESS_BONUS": 0}]. Without --labels, --synthetic N
+evaluates N queries over a generated corpus (benchmarks/corpus.py) where the
+files of the query's topic are relevant.
+
+Run from the src directory:
+    python -m benchmarks.retrieval_eval --labels labels.json --configs configs.json --output eval.json
+    python -m benchmarks.retrieval_eval --synthetic 100 --embedding-backend hash
+"""
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.fakes import HashEmbeddingProvider
+from bson.objectid import ObjectId
+from controllers import NLPController, ProcessController, ProjectController
+from controllers.BaseController import BaseController
+from helpers.config import get_settings
+from models.db_schemes import Project
+from stores.llm.GenerationCache import GenerationCache
+from stores.llm.LLMInterface import LLMInterface
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import time
+
+DEFAULT_CONFIGS = [
+    {"name": "baseline"},
+    {"name": "no-rerank", "RAG_RERANK_LENGTH_BONUS": 0, "RAG_RERANK_COMPLETENESS_BONUS": 0},
+    {"name": "deep-retrieval", "RAG_RETRIEVAL_DEPTH_FACTOR": 10, "RAG_RETRIEVAL_MAX_CANDIDATES": 100},
+    {"name": "small-chunks", "chunk_size": 500, "overlap_size": 100},
+]
+
+CHUNKING_KEYS = {"chunk_size": 1000, "overlap_size": 200, "chunking_method": "character"}
+
+
+class CachedEmbeddingProvider(LLMInterface):
+    """
+    Embedding provider answering from an on-disk cache
+
+    create_provider builds the real provider, it is only called on the first
+    cache miss so an evaluation over cached texts never loads the model.
+    """
+
+    def __init__(self, create_provider, cache: GenerationCache, model_id: str, embedding_size: int):
+        self.create_provider = create_provider
+        self.provider = None
+        self.cache = cache
+
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+        self.generation_model_id = None
+
+        self.misses = 0
+
+    def get_provider(self):
+        if self.provider is None:
+            self.provider = self.create_provider()
+            self.provider.set_embedding_model(model_id=self.embedding_model_id,
+                                              embedding_size=self.embedding_size)
+        return self.provider
+
+    def make_key(self, text: str, document_type: str):
+        return self.cache.make_key("embedding", {"text": text, "document_type": document_type},
+                                   model_id=self.embedding_model_id)
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        keys = [ self.make_key(text, document_type) for text in texts ]
+        cached = [ self.cache.get(key) for key in keys ]
+
+        missing = [ i for i, value in enumerate(cached) if value is None ]
+        if missing:
+            self.misses += len(missing)
+            vectors = self.get_provider().embed_texts([ texts[i] for i in missing ], document_type)
+            if not vectors:
+                return None
+            for i, vector in zip(missing, vectors):
+                cached[i] = json.dumps(vector)
+                self.cache.set(keys[i], cached[i], ttl=0)
+
+        return [ json.loads(value) for value in cached ]
+
+    def embed_text(self, text: str, document_type: str = None):
+        vectors = self.embed_texts([text], document_type)
+        return vectors[0] if vectors else None
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        return await asyncio.to_thread(self.embed_texts, texts, document_type)
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        vectors = await self.aembed_texts([text], document_type)
+        return vectors[0] if vectors else None
+
+    def set_generation_model(self, model_id: str):
+        self.generation_model_id = model_id
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        return None
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        return None
+
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        return None
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        return
+        yield
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {"role": role, "content": prompt}
+
+
+def normalize(text: str):
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def get_hits(document, query: dict):
+    """Labels of query matched by a retrieved document"""
+    metadata = document.metadata or {}
+    text = normalize(document.text)
+    hits = set()
+
+    for i, chunk in enumerate(query.get("relevant_chunks", [])):
+        if all(metadata.get(key) == value for key, value in chunk.items()):
+            hits.add(("chunk", i))
+    for i, relevant_text in enumerate(query.get("relevant_texts", [])):
+        if normalize(relevant_text) in text:
+            hits.add(("text", i))
+    for i, file_id in enumerate(query.get("relevant_files", [])):
+        if metadata.get("file_id") == file_id:
+            hits.add(("file", i))
+
+    return hits
+
+
+def score_query(results: list, query: dict, k: int):
+    """recall@k, reciprocal rank and nDCG@k with binary gains, a label counting once"""
+    labels = sum(len(query.get(key, [])) for key in ("relevant_chunks", "relevant_texts", "relevant_files"))
+    found, reciprocal_rank, dcg = set(), 0.0, 0.0
+
+    for rank, document in enumerate(results[:k]):
+        hits = get_hits(document, query)
+        if hits and not reciprocal_rank:
+            reciprocal_rank = 1 / (rank + 1)
+        if hits - found:
+            dcg += 1 / math.log2(rank + 2)
+        found |= hits
+
+    ideal_dcg = sum(1 / math.log2(rank + 2) for rank in range(min(labels, k)))
+    return {
+        "recall": len(found) / labels if labels else 0.0,
+        "reciprocal_rank": reciprocal_rank,
+        "ndcg": dcg / ideal_dcg if ideal_dcg else 0.0,
+    }
+
+
+def percentile(values: list, p: float):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+
+def list_project_files(project_path: str):
+    file_ids = []
+    for root, _, files in os.walk(project_path):
+        for file_name in files:
+            file_ids.append(os.path.relpath(os.path.join(root, file_name), project_path))
+    return sorted(file_ids)
+
+
+async def index_project(nlp_controller: NLPController, process_controller: ProcessController,
+                        file_ids: list, collection_project: Project, chunking: dict, batch_size: int):
+    """Chunk every file with the chunking setting and push the chunks, returns the chunk count"""
+    no_chunks = 0
+    for file_id in file_ids:
+        for batch in process_controller.iter_chunk_batches(file_id=file_id, project_id=ObjectId(),
+                                                            asset_id=ObjectId(), batch_size=batch_size,
+                                                            **chunking):
+            is_inserted = await nlp_controller.index_into_vector_db(
+                project=collection_project,
+                chunks=batch,
+                chunks_ids=list(range(no_chunks, no_chunks + len(batch))),
+                do_reset=no_chunks == 0,
+            )
+            if not is_inserted:
+                raise RuntimeError(f"indexing {file_id} failed")
+            no_chunks += len(batch)
+    return no_chunks
+
+
+async def evaluate(args, project_id: str, queries: list, configs: list, embedding_client, qdrant_dir: str):
+    from stores.vectordb.providers import QdrantDBProvider
+
+    settings = get_settings()
+    vectordb_client = QdrantDBProvider(db_path=qdrant_dir, distance_method=settings.VECTOR_DB_DISTANCE_METHOD)
+    vectordb_client.connect()
+
+    nlp_controller = NLPController(vectordb_client=vectordb_client, generation_client=None,
+                                   embedding_client=embedding_client, template_parser=None)
+    process_controller = ProcessController(project_id=project_id, embedding_client=embedding_client)
+    file_ids = list_project_files(process_controller.project_path)
+    if not file_ids:
+        raise SystemExit(f"no files in {process_controller.project_path}")
+
+    # warm the query embeddings so latency does not include the model
+    await embedding_client.aembed_texts([ query["text"] for query in queries ], document_type="query")
+
+    indexes, results = {}, []
+    for config in configs:
+        chunking = { key: config.get(key, default) for key, default in CHUNKING_KEYS.items() }
+        chunking_key = tuple(chunking.values())
+
+        misses_before = embedding_client.misses
+        if chunking_key not in indexes:
+            collection_project = Project(project_id=f"eval{len(indexes)}")
+            started = time.perf_counter()
+            no_chunks = await index_project(nlp_controller, process_controller, file_ids, collection_project,
+                                            chunking, batch_size=settings.FILE_PROCESSING_BATCH_SIZE)
+            indexes[chunking_key] = (collection_project, no_chunks, time.perf_counter() - started)
+        collection_project, no_chunks, index_seconds = indexes[chunking_key]
+
+        nlp_controller.app_settings = settings.model_copy(update={
+            key: value for key, value in config.items() if key.startswith("RAG_")
+        })
+        k = config.get("limit", args.limit)
+
+        scores, latencies, context_tokens = [], [], []
+        for query in queries:
+            started = time.perf_counter()
+            documents = await nlp_controller.search_vector_db_collection(
+                project=collection_project, text=query["text"], limit=k
+            )
+            latencies.append((time.perf_counter() - started) * 1000)
+
+            documents = documents or []
+            scores.append(score_query(documents, query, k))
+            context_tokens.append(sum(embedding_client.count_tokens(document.text) for document in documents))
+
+        results.append({
+            "name": config.get("name", f"config{len(results)}"),
+            "k": k,
+            **chunking,
+            f"recall@{k}": round(sum(s["recall"] for s in scores) / len(scores), 4),
+            "mrr": round(sum(s["reciprocal_rank"] for s in scores) / len(scores), 4),
+            f"ndcg@{k}": round(sum(s["ndcg"] for s in scores) / len(scores), 4),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "chunks": no_chunks,
+            "index_s": round(index_seconds, 2),
+            "candidates": min(k * nlp_controller.app_settings.RAG_RETRIEVAL_DEPTH_FACTOR,
+                              nlp_controller.app_settings.RAG_RETRIEVAL_MAX_CANDIDATES),
+            "context_tokens": round(sum(context_tokens) / len(context_tokens)),
+            "embedded_texts": embedding_client.misses - misses_before,
+        })
+
+    vectordb_client.disconnect()
+    return results
+
+
+def create_embedding_client(args):
+    settings = get_settings()
+
+    if args.embedding_backend == "hash":
+        create_provider, model_id, embedding_size = HashEmbeddingProvider, "hash-bow", 384
+    else:
+        from stores.llm.LLMProviderFactory import LLMProviderFactory
+        backend = args.embedding_backend or settings.EMBEDDING_BACKEND
+        create_provider = lambda: LLMProviderFactory(settings).create(provider=backend)
+        model_id, embedding_size = settings.EMBEDDING_MODEL_ID, settings.EMBEDDING_MODEL_SIZE
+
+    cache = GenerationCache(
+        cache_dir=BaseController().get_cache_path(cache_name=args.cache_dir),
+        max_size_bytes=args.cache_max_size_mb * 1024 * 1024,
+        default_ttl=0,
+        name="embedding",
+    )
+    return CachedEmbeddingProvider(create_provider, cache, model_id=model_id, embedding_size=embedding_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--labels", help="JSON file of the project id and its labeled queries")
+    parser.add_argument("--synthetic", type=int, help="queries over a generated corpus instead of --labels")
+    parser.add_argument("--documents", type=int, default=30, help="documents of the synthetic corpus")
+    parser.add_argument("--configs", help="JSON list of configurations, defaults to a built-in sweep")
+    parser.add_argument("--limit", type=int, default=5, help="k, unless a configuration sets limit")
+    parser.add_argument("--embedding-backend", help='"hash" for the deterministic fake, defaults to EMBEDDING_BACKEND')
+    parser.add_argument("--cache-dir", default="eval_embeddings", help="embedding cache under src/assets/cache")
+    parser.add_argument("--cache-max-size-mb", type=int, default=2048)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file for the results")
+    args = parser.parse_args()
+
+    if not args.labels and not args.synthetic:
+        parser.error("pass --labels or --synthetic")
+
+    configs = DEFAULT_CONFIGS
+    if args.configs:
+        with open(args.configs, encoding="utf-8") as f:
+            configs = json.load(f)
+
+    project_path = None
+    if args.labels:
+        with open(args.labels, encoding="utf-8") as f:
+            labels = json.load(f)
+        project_id, queries = str(labels["project_id"]), labels["queries"]
+    else:
+        project_id = f"evalsynthetic{os.getpid()}"
+        project_path = ProjectController().get_project_path(project_id=project_id)
+        corpus = generate_corpus(project_path, documents=args.documents, words_per_document=1500, seed=args.seed)
+        queries = [
+            {"text": query["text"], "relevant_files": [
+                os.path.basename(document["file_path"]) for document in corpus if document["topic"] == query["topic"]
+            ]}
+            for query in generate_queries(args.synthetic, seed=args.seed)
+        ]
+
+    embedding_client = create_embedding_client(args)
+    qdrant_dir = tempfile.mkdtemp(prefix="retrieval_eval_")
+    try:
+        results = asyncio.run(evaluate(args, project_id, queries, configs, embedding_client, qdrant_dir))
+    finally:
+        shutil.rmtree(qdrant_dir, ignore_errors=True)
+        if project_path:
+            shutil.rmtree(project_path, ignore_errors=True)
+
+    for result in results:
+        print(" | ".join(f"{key}={value}" for key, value in result.items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "queries": len(queries), "results": results}, f, indent=2)
+        print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
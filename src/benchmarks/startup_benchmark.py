@@ -0,0 +1,121 @@
+"""
+Measure import time of the app module and cold start to liveness and readiness
+
+Import time comes from `python -X importtime -c "import main"` in a fresh
+interpreter: total time, the slowest top-level packages, and which heavy
+packages (embedding model stack, vector store, PDF parsing) were imported
+eagerly although startup loads them lazily. Cold start launches uvicorn and
+polls /api/v1/health/live and /api/v1/health/ready until they answer 200.
+Needs the app's .env (MongoDB reachable for readiness).
+
+Run from the src directory:
+    python -m benchmarks.startup_benchmark --runs 3
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+
+
+HEAVY_MODULES = ["torch", "sentence_transformers", "transformers", "langchain_community",
+                 "qdrant_client", "fitz", "openai", "cohere", "onnxruntime"]
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_imports(top: int):
+    """Parse -X importtime output of a fresh `import main`"""
+    probe = f"import main, sys, json; print(json.dumps([m for m in {HEAVY_MODULES!r} if m in sys.modules]))"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", probe],
+                            cwd=SRC_DIR, capture_output=True, text=True, check=True)
+
+    # lines look like "import time:       412 |      10823 |   package.module"
+    packages = {}
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("  "):
+            continue
+        name = name.strip()
+        packages[name] = int(cumulative)
+        total_us += int(cumulative)
+
+    slowest = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "import_main_ms": round(packages.get("main", total_us) / 1000, 1),
+        "slowest": [ f"{name}:{round(us / 1000, 1)}ms" for name, us in slowest ],
+        "heavy_imported": json.loads(result.stdout.strip().splitlines()[-1]),
+    }
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(url: str, started: float, timeout: float):
+    """Seconds since started until url answers 200, None on timeout"""
+    while time.perf_counter() - started < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    return None
+
+
+def measure_cold_start(timeout: float):
+    port = get_free_port()
+    base_url = f"http://127.0.0.1:{port}/api/v1"
+
+    started = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+                              cwd=SRC_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        live = wait_for(f"{base_url}/health/live", started, timeout)
+        ready = wait_for(f"{base_url}/health/ready", started, timeout)
+    finally:
+        server.terminate()
+        server.wait()
+
+    return live, ready
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to measure")
+    parser.add_argument("--top", type=int, default=8, help="slowest top-level imports to list")
+    parser.add_argument("--timeout", type=float, default=180)
+    args = parser.parse_args()
+
+    imports = measure_imports(args.top)
+    print(f"import: import_main_ms={imports['import_main_ms']} | heavy_imported={imports['heavy_imported']}")
+    print("slowest: " + " | ".join(imports["slowest"]))
+
+    lives, readies = [], []
+    for run in range(args.runs):
+        live, ready = measure_cold_start(args.timeout)
+        print(f"cold start {run + 1}: live_s={round(live, 2) if live else None} | "
+              f"ready_s={round(ready, 2) if ready else None}")
+        if live:
+            lives.append(live)
+        if ready:
+            readies.append(ready)
+
+    print(f"median: live_s={round(statistics.median(lives), 2) if lives else None} | "
+          f"ready_s={round(statistics.median(readies), 2) if readies else None}")
+
+
+if __name__ == "__main__":
+    main()
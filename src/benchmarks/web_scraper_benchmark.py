@@ -0,0 +1,77 @@
+"""
+Crawl a local fixture website with the async WebScraper, cold then warm
+
+The fixture server generates a same-domain site (each page links to a few
+others plus an external link that must not be followed), answers with an ETag
+and Last-Modified, honors If-None-Match with 304 and injects latency. The
+second crawl revalidates every page from the response cache, so it reports
+how much a repeat scrape saves.
+
+Run from the src directory:
+    python -m benchmarks.web_scraper_benchmark --pages 50 --depth 2 --max-pages 30 --latency-ms 100
+"""
+from http.server import ThreadingHTTPServer
+from stores.llm.HTTPClientPool import HTTPClientPool
+from stores.llm.GenerationCache import GenerationCache
+from stores.scraping.WebScraper import WebScraper, HTML_PARSER
+from tests.fixture_site import FixtureSiteHandler
+import argparse
+import asyncio
+import tempfile
+import threading
+import time
+
+
+async def run_crawl(scraper: WebScraper, url: str, depth: int, max_pages: int):
+    FixtureSiteHandler.full_responses = 0
+    FixtureSiteHandler.not_modified_responses = 0
+
+    started = time.perf_counter()
+    pages = await scraper.crawl(url, max_depth=depth, max_pages=max_pages)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "pages": len(pages),
+        "from_cache": sum(page.from_cache for page in pages),
+        "full_responses": FixtureSiteHandler.full_responses,
+        "not_modified": FixtureSiteHandler.not_modified_responses,
+        "characters": sum(len(page.text) for page in pages),
+        "elapsed_ms": round(elapsed * 1000, 1),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=50, help="pages on the fixture site")
+    parser.add_argument("--depth", type=int, default=2)
+    parser.add_argument("--max-pages", type=int, default=30)
+    parser.add_argument("--concurrency", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=100)
+    args = parser.parse_args()
+
+    FixtureSiteHandler.pages = args.pages
+    FixtureSiteHandler.latency_ms = args.latency_ms
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureSiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        scraper = WebScraper(
+            http_pool=HTTPClientPool(max_connections=args.concurrency * 2, timeout=10, follow_redirects=True),
+            response_cache=GenerationCache(cache_dir=cache_dir, name="web_pages"),
+            max_concurrency=args.concurrency,
+        )
+
+        try:
+            print(f"parser={HTML_PARSER}")
+            for label in ("cold", "warm"):
+                result = await run_crawl(scraper, url, args.depth, args.max_pages)
+                print(f"{label}: " + " | ".join(f"{key}={value}" for key, value in result.items()))
+        finally:
+            await scraper.close()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
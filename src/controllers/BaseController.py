@@ -19,6 +19,11 @@ class BaseController:
             self.base_dir,
             "assets/database"
         )
+
+        self.cache_dir = os.path.join(
+            self.base_dir,
+            "assets/cache"
+        )
         
     def generate_random_string(self, length: int=12):
         return ''.join(random.choices(string.ascii_lowercase + string.digits, k=length))
@@ -32,4 +37,15 @@ class BaseController:
         if not os.path.exists(database_path):
             os.makedirs(database_path)
 
-        return database_path
\ No newline at end of file
+        return database_path
+
+    def get_cache_path(self, cache_name: str):
+
+        cache_path = os.path.join(
+            self.cache_dir, cache_name
+        )
+
+        if not os.path.exists(cache_path):
+            os.makedirs(cache_path)
+
+        return cache_path
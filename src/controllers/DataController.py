@@ -2,6 +2,7 @@ from .BaseController import BaseController
 from .ProjectController import ProjectController
 from fastapi import UploadFile
 from models import ResponseSignal
+from stores.loaders.LoaderRegistry import loader_registry
 import re
 import os
 
@@ -20,15 +21,9 @@ class DataController(BaseController):
         # Extract the extension (e.g., .md, .pdf)
         _, file_extension = os.path.splitext(filename.lower())
         
-        # Mapping common file extensions to the allowed content types set in .env
-        extension_map = {
-            ".txt": "text/plain",
-            ".pdf": "application/pdf",
-            ".md": "text/markdown",
-        }
-        
-        # Check if the file's expected content type is in the allowed list
-        expected_content_type = extension_map.get(file_extension)
+        # Map the extension to its content type through the loader registry,
+        # so only files we can actually process are accepted
+        expected_content_type = loader_registry.get_mime_type(file_extension)
 
         if expected_content_type and expected_content_type in self.app_settings.FILE_ALLOWED_TYPES:
             return True
@@ -1,15 +1,20 @@
 from .BaseController import BaseController
+from models import EmailGenerationModeEnum
+from typing import Optional
+import asyncio
 import logging
+import re
 
 logger = logging.getLogger('uvicorn.error')
 
 class HREmailController(BaseController):
     """Controller for HR email generation"""
     
-    def __init__(self, generation_client=None, template_parser=None):
+    def __init__(self, generation_client=None, template_parser=None, generation_cache=None):
         super().__init__()
         self.generation_client = generation_client
         self.template_parser = template_parser
+        self.generation_cache = generation_cache
         
         # Email type templates
         self.email_templates = {
@@ -23,7 +28,8 @@ class HREmailController(BaseController):
             },
             "interview_invitation": {
                 "description": "Interview invitation email",
-                "prompt_template": "Create an interview invitation email for {recipient_name}. Details: {context}"
+                "prompt_template": "Create an interview invitation email for {recipient_name}. Details: {context}",
+                "template_fields": ["position", "date", "time", "location"]
             },
             "onboarding": {
                 "description": "New employee onboarding email",
@@ -31,7 +37,8 @@ class HREmailController(BaseController):
             },
             "performance_review": {
                 "description": "Performance review invitation",
-                "prompt_template": "Create a performance review invitation email for {recipient_name}. Details: {context}"
+                "prompt_template": "Create a performance review invitation email for {recipient_name}. Details: {context}",
+                "template_fields": ["date", "time", "location"]
             },
             "termination": {
                 "description": "Employment termination letter",
@@ -39,7 +46,8 @@ class HREmailController(BaseController):
             },
             "reminder": {
                 "description": "General reminder email",
-                "prompt_template": "Create a reminder email for {recipient_name}. About: {context}"
+                "prompt_template": "Create a reminder email for {recipient_name}. About: {context}",
+                "template_fields": ["subject", "date"]
             },
             "announcement": {
                 "description": "Company or team announcement",
@@ -55,7 +63,209 @@ class HREmailController(BaseController):
             }
         }
 
-    def generate_email(self, email_type: str, recipient_name: str, context: str, tone: str = "professional") -> str:
+    def validate_email_type(self, email_type: str):
+        if email_type not in self.email_templates:
+            raise ValueError(f"Invalid email type: {email_type}. Valid types: {', '.join(self.email_templates.keys())}")
+
+    def get_tone_description(self, tone: str) -> str:
+        tone_descriptions = {
+            "professional": "professional and polite",
+            "friendly": "warm and friendly while maintaining professionalism",
+            "formal": "very formal and official"
+        }
+        return tone_descriptions.get(tone, "professional and polite")
+
+    def get_tone_salutations(self, tone: str, recipient_name: str):
+        salutations = {
+            "professional": ("Dear {recipient_name},", "Best regards,"),
+            "friendly": ("Hi {recipient_name},", "Warm regards,"),
+            "formal": ("Dear {recipient_name},", "Yours sincerely,"),
+        }
+        greeting, closing = salutations.get(tone, salutations["professional"])
+        return greeting.format(recipient_name=recipient_name), closing
+
+    def parse_structured_context(self, context: str) -> Optional[dict]:
+        """
+        Parse a "Key: Value, Key: Value" context into a dict of fields
+
+        Returns:
+            Fields keyed by lower_snake_case name, or None when any part of the
+            context is free-form text
+        """
+        if not context or not context.strip():
+            return None
+
+        # only split on commas that start a new "Key:" part, so values such as
+        # "January 15th, 2024" or "2:00 PM" stay intact
+        parts = re.split(r"[;\n]|,\s*(?=[A-Za-z][\w ]{0,30}:)", context)
+
+        fields = {}
+        for part in parts:
+            if not part.strip():
+                continue
+            match = re.match(r"^\s*([A-Za-z][\w ]{0,30}?)\s*:\s*(.+?)\s*$", part)
+            if not match:
+                return None
+            key = re.sub(r"\s+", "_", match.group(1).strip().lower())
+            fields[key] = match.group(2)
+
+        return fields or None
+
+    def render_template_email(self, email_type: str, recipient_name: str, context: str,
+                              tone: str = "professional", details: dict = None) -> Optional[str]:
+        """
+        Render the email from its deterministic template, skipping the LLM
+
+        Returns:
+            The rendered email, or None when the email type has no template or
+            the request does not carry every field the template needs
+        """
+        required_fields = self.email_templates[email_type].get("template_fields")
+        if not required_fields or not self.template_parser:
+            return None
+
+        fields = {}
+        if context and context.strip():
+            fields = self.parse_structured_context(context)
+            if fields is None:
+                return None
+
+        for key, value in (details or {}).items():
+            fields[re.sub(r"\s+", "_", key.strip().lower())] = value
+
+        if any(not str(fields.get(field, "")).strip() for field in required_fields):
+            return None
+
+        greeting, closing = self.get_tone_salutations(tone, recipient_name)
+        additional_details = "".join([
+            f"- **{key.replace('_', ' ').title()}:** {value}\n"
+            for key, value in fields.items()
+            if key not in required_fields
+        ])
+
+        email_content = self.template_parser.get("hr_email_templates", email_type, {
+            **{ field: fields[field] for field in required_fields },
+            "greeting": greeting,
+            "closing": closing,
+            "additional_details": additional_details,
+        })
+
+        return email_content.strip() if email_content else None
+
+    def build_system_prompt(self, tone_desc: str) -> str:
+        """Build the system prompt, shared by every email of the same tone"""
+
+        # Construct the system prompt
+        system_prompt = (
+            f"You are an expert HR professional who writes clear, empathetic, and {tone_desc} emails. "
+            f"Generate well-structured emails that are concise, respectful, and include all necessary information. "
+            f"Format the email with proper subject line, greeting, body, and closing using **Markdown**. "
+            f"**IMPORTANT: Output ONLY the email content.** DO NOT include any introductory/closing phrases, explanatory text, or **Markdown code fences** (e.g., ```markdown, ```json)."
+            f"\n\n--- EXPECTED OUTPUT FORMAT EXAMPLE ---\n"
+            f"**Subject:** Your Subject Here\n\n"
+            f"Dear [Recipient Name],\n\n"
+            f"This is the main body of the email. Please use paragraphs and **bold** formatting for emphasis where appropriate.\n\n"
+            f"Sincerely,\n"
+            f"HR Team"
+        )
+        
+        # Get custom system prompt from template parser if available
+        if self.template_parser:
+            try:
+                custom_prompt = self.template_parser.get("hr_email", "system_prompt")
+                if custom_prompt:
+                    # If a custom prompt is found, it overrides the default system_prompt completely
+                    system_prompt = custom_prompt
+                    logger.info("Using custom system prompt from template parser")
+                else:
+                    logger.info("Template returned None, using default system prompt")
+            except Exception as e:
+                logger.warning(f"Could not get template: {e}, using default")
+
+        return system_prompt
+
+    def build_user_prompt(self, email_type: str, recipient_name: str, context: str, tone_desc: str) -> str:
+        # Get the specific template for this email type
+        template = self.email_templates[email_type]
+        
+        # Construct the user prompt
+        user_prompt = template["prompt_template"].format(
+            recipient_name=recipient_name,
+            context=context
+        )
+        return user_prompt + f"\n\nTone: {tone_desc}"
+
+    def merge_details_into_context(self, context: str, details: dict = None) -> str:
+        # the LLM path reads structured details as extra "Key: Value" context
+        return ", ".join([
+            part for part in [context.strip() if context else ""] + [
+                f"{key}: {value}" for key, value in (details or {}).items()
+            ]
+            if part
+        ])
+
+    def get_template_requirements_error(self, email_type: str) -> str:
+        required_fields = self.email_templates[email_type].get("template_fields")
+        if not required_fields:
+            return f"Email type {email_type} has no template, use the llm generation mode"
+        return f"Template generation for {email_type} requires a structured context with: {', '.join(required_fields)}"
+
+    async def generate_from_prompts(self, system_prompt: str, user_prompt: str) -> str:
+        # Construct chat history
+        chat_history = [
+            self.generation_client.construct_prompt(
+                prompt=system_prompt,
+                role=self.generation_client.enums.SYSTEM.value,
+            )
+        ]
+        
+        logger.info("Generating email content")
+        
+        # Generate the email
+        email_content = await self.generation_client.agenerate_text(
+            prompt=user_prompt,
+            chat_history=chat_history
+        )
+        
+        if not email_content:
+            raise ValueError("Generation client returned empty email content")
+        
+        # Since the model is now strictly instructed not to use fences, 
+        # we rely on it, but we strip surrounding whitespace just in case.
+        return email_content.strip()
+
+    async def generate_cached_email(self, email_type: str, recipient_name: str, context: str, tone: str,
+                                    system_prompt: str, user_prompt: str, use_cache: bool = True):
+        """
+        Generate through the LLM, reusing a cached email for an identical request
+
+        Returns:
+            Tuple of the email content and the cache status (None without a cache)
+        """
+        if not self.generation_cache:
+            return await self.generate_from_prompts(system_prompt, user_prompt), None
+
+        cache_key = self.generation_cache.make_key(
+            namespace="hr_email",
+            payload={
+                "email_type": email_type,
+                "recipient_name": recipient_name,
+                "context": context,
+                "tone": tone,
+            },
+            model_id=getattr(self.generation_client, "generation_model_id", None),
+            temperature=getattr(self.generation_client, "default_generation_temperature", None),
+        )
+
+        return await self.generation_cache.get_or_generate(
+            key=cache_key,
+            generate=lambda: self.generate_from_prompts(system_prompt, user_prompt),
+            use_cache=use_cache,
+        )
+
+    async def generate_email(self, email_type: str, recipient_name: str, context: str, tone: str = "professional",
+                             generation_mode: str = EmailGenerationModeEnum.AUTO.value, details: dict = None,
+                             use_cache: bool = True):
         """
         Generate an HR email based on the type and context
         
@@ -64,96 +274,128 @@ class HREmailController(BaseController):
             recipient_name: Name of the recipient
             context: Additional context and details
             tone: Tone of the email (professional, friendly, formal)
+            generation_mode: auto (template when the context is fully structured,
+                LLM otherwise), template or llm
+            details: Structured fields merged over the ones parsed from context
+            use_cache: Reuse (and store) the LLM generation for identical requests
             
         Returns:
-            Generated email content
+            Tuple of the generated email content, the mode that produced it and
+            the cache status (hit, miss, coalesced, bypass or None)
         """
-        if not self.generation_client:
-            raise ValueError("Generation client not initialized")
-        
         try:
             # Validate email type
-            if email_type not in self.email_templates:
-                raise ValueError(f"Invalid email type: {email_type}. Valid types: {', '.join(self.email_templates.keys())}")
+            self.validate_email_type(email_type)
             
             logger.info(f"Generating {email_type} email for {recipient_name}")
+
+            if generation_mode != EmailGenerationModeEnum.LLM.value:
+                email_content = self.render_template_email(email_type, recipient_name, context, tone, details)
+                if email_content:
+                    logger.info("Email rendered from template")
+                    return email_content, EmailGenerationModeEnum.TEMPLATE.value, None
+
+                if generation_mode == EmailGenerationModeEnum.TEMPLATE.value:
+                    raise ValueError(self.get_template_requirements_error(email_type))
+
+            if not self.generation_client:
+                raise ValueError("Generation client not initialized")
+
+            context = self.merge_details_into_context(context, details)
             
-            # Get tone description
-            tone_descriptions = {
-                "professional": "professional and polite",
-                "friendly": "warm and friendly while maintaining professionalism",
-                "formal": "very formal and official"
-            }
-            tone_desc = tone_descriptions.get(tone, "professional and polite")
-            
-            # Construct the system prompt
-            system_prompt = (
-                f"You are an expert HR professional who writes clear, empathetic, and {tone_desc} emails. "
-                f"Generate well-structured emails that are concise, respectful, and include all necessary information. "
-                f"Format the email with proper subject line, greeting, body, and closing using **Markdown**. "
-                f"**IMPORTANT: Output ONLY the email content.** DO NOT include any introductory/closing phrases, explanatory text, or **Markdown code fences** (e.g., ```markdown, ```json)."
-                f"\n\n--- EXPECTED OUTPUT FORMAT EXAMPLE ---\n"
-                f"**Subject:** Your Subject Here\n\n"
-                f"Dear [Recipient Name],\n\n"
-                f"This is the main body of the email. Please use paragraphs and **bold** formatting for emphasis where appropriate.\n\n"
-                f"Sincerely,\n"
-                f"HR Team"
-            )
-            
-            # Get custom system prompt from template parser if available
-            if self.template_parser:
-                try:
-                    custom_prompt = self.template_parser.get("hr_email", "system_prompt")
-                    if custom_prompt:
-                        # If a custom prompt is found, it overrides the default system_prompt completely
-                        system_prompt = custom_prompt
-                        logger.info("Using custom system prompt from template parser")
-                    else:
-                        logger.info("Template returned None, using default system prompt")
-                except Exception as e:
-                    logger.warning(f"Could not get template: {e}, using default")
-            
-            # Get the specific template for this email type
-            template = self.email_templates[email_type]
-            
-            # Construct the user prompt
-            user_prompt = template["prompt_template"].format(
-                recipient_name=recipient_name,
-                context=context
-            )
-            user_prompt += f"\n\nTone: {tone_desc}"
-            
-            # Construct chat history
-            chat_history = [
-                self.generation_client.construct_prompt(
-                    prompt=system_prompt,
-                    role=self.generation_client.enums.SYSTEM.value,
-                )
-            ]
-            
-            logger.info("Generating email content")
-            
-            # Generate the email
-            email_content = self.generation_client.generate_text(
-                prompt=user_prompt,
-                chat_history=chat_history
+            tone_desc = self.get_tone_description(tone)
+            system_prompt = self.build_system_prompt(tone_desc)
+            user_prompt = self.build_user_prompt(email_type, recipient_name, context, tone_desc)
+
+            email_content, cache_status = await self.generate_cached_email(
+                email_type, recipient_name, context, tone, system_prompt, user_prompt, use_cache
             )
             
-            if not email_content:
-                raise ValueError("Generation client returned empty email content")
-            
-            # Since the model is now strictly instructed not to use fences, 
-            # we rely on it, but we strip surrounding whitespace just in case.
-            email_content = email_content.strip()
-            
-            logger.info("Email generated successfully")
-            return email_content
+            logger.info(f"Email generated successfully (cache: {cache_status})")
+            return email_content, EmailGenerationModeEnum.LLM.value, cache_status
             
         except Exception as e:
             logger.error(f"Error in generate_email: {str(e)}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise
+
+    async def generate_emails_batch(self, email_type: str, recipients: list, tone: str = "professional",
+                                    max_concurrency: int = 8,
+                                    generation_mode: str = EmailGenerationModeEnum.AUTO.value,
+                                    use_cache: bool = True):
+        """
+        Generate one email per recipient, sharing email type, tone and system prompt
+        
+        Args:
+            email_type: Type of email to generate
+            recipients: List of dicts with recipient_name and context
+            tone: Tone of the emails (professional, friendly, formal)
+            max_concurrency: Maximum number of generations running at once
+            generation_mode: auto, template or llm, applied to every recipient
+            use_cache: Reuse (and store) LLM generations for identical recipients
+            
+        Yields:
+            Per-recipient result dicts (index, recipient_name, generation_mode and
+            email or error), in completion order
+        """
+        self.validate_email_type(email_type)
+
+        logger.info(f"Generating {len(recipients)} {email_type} emails")
+
+        # the system prompt is the same for the whole batch, build it once
+        tone_desc = self.get_tone_description(tone)
+        system_prompt = self.build_system_prompt(tone_desc)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate_one(index: int, recipient: dict):
+            result = {"index": index, "recipient_name": recipient["recipient_name"]}
+
+            # fully structured recipients never wait on the LLM semaphore
+            if generation_mode != EmailGenerationModeEnum.LLM.value:
+                email_content = self.render_template_email(
+                    email_type, recipient["recipient_name"], recipient["context"], tone, recipient.get("details")
+                )
+                if email_content:
+                    result["generation_mode"] = EmailGenerationModeEnum.TEMPLATE.value
+                    result["email"] = email_content
+                    return result
+
+                if generation_mode == EmailGenerationModeEnum.TEMPLATE.value:
+                    result["error"] = self.get_template_requirements_error(email_type)
+                    return result
+
+            async with semaphore:
+                try:
+                    if not self.generation_client:
+                        raise ValueError("Generation client not initialized")
+                    context = self.merge_details_into_context(recipient["context"], recipient.get("details"))
+                    user_prompt = self.build_user_prompt(
+                        email_type, recipient["recipient_name"], context, tone_desc
+                    )
+                    result["generation_mode"] = EmailGenerationModeEnum.LLM.value
+                    result["email"], result["cache"] = await self.generate_cached_email(
+                        email_type, recipient["recipient_name"], context, tone,
+                        system_prompt, user_prompt, use_cache
+                    )
+                except Exception as e:
+                    logger.error(f"Error generating email for recipient {index}: {str(e)}")
+                    result["error"] = str(e)
+            return result
+
+        tasks = [
+            asyncio.create_task(generate_one(index, recipient))
+            for index, recipient in enumerate(recipients)
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # the client went away: stop the generations still queued or running
+            for task in tasks:
+                task.cancel()
     
     def get_available_email_types(self):
         """
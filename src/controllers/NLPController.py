@@ -1,8 +1,13 @@
 from .BaseController import BaseController
-from models.db_schemes import Project, DataChunk
-from stores.llm.LLMEnums import DocumentTypeEnum
+from models.db_schemes import Project, DataChunk, RetrievedDocument
+from stores.llm.LLMEnums import DocumentTypeEnum, ChatRoleEnum
+from helpers.metrics import track_stage, PIPELINE_STAGE_SECONDS
 from typing import List
 import json
+import logging
+import time
+
+logger = logging.getLogger('uvicorn.error')
 
 class NLPController(BaseController):
 
@@ -30,7 +35,7 @@ class NLPController(BaseController):
             json.dumps(collection_info, default=lambda x: x.__dict__)
         )
     
-    def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
+    async def index_into_vector_db(self, project: Project, chunks: List[DataChunk],
                                    chunks_ids: List[int], 
                                    do_reset: bool = False):
         
@@ -40,11 +45,12 @@ class NLPController(BaseController):
         # step2: manage items
         texts = [ c.chunk_text for c in chunks ]
         metadata = [ c.chunk_metadata for c in  chunks]
-        vectors = [
-            self.embedding_client.embed_text(text=text, 
-                                             document_type=DocumentTypeEnum.DOCUMENT.value)
-            for text in texts
-        ]
+        with track_stage("index", "embed_documents"):
+            vectors = await self.embedding_client.aembed_texts(texts=texts,
+                                                               document_type=DocumentTypeEnum.DOCUMENT.value)
+
+        if not vectors:
+            return False
 
         # step3: create collection if not exists
         _ = self.vectordb_client.create_collection(
@@ -54,47 +60,86 @@ class NLPController(BaseController):
         )
 
         # step4: insert into vector db
-        _ = self.vectordb_client.insert_many(
-            collection_name=collection_name,
-            texts=texts,
-            metadata=metadata,
-            vectors=vectors,
-            record_ids=chunks_ids,
-        )
+        with track_stage("index", "vector_insert"):
+            _ = self.vectordb_client.insert_many(
+                collection_name=collection_name,
+                texts=texts,
+                metadata=metadata,
+                vectors=vectors,
+                record_ids=chunks_ids,
+            )
 
         return True
 
-    def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
+    async def search_vector_db_collection(self, project: Project, text: str, limit: int = 10):
 
         # step1: get collection name
         collection_name = self.create_collection_name(project_id=project.project_id)
 
         # step2: get text embedding vector
-        vector = self.embedding_client.embed_text(text=text, 
-                                                 document_type=DocumentTypeEnum.QUERY.value)
+        with track_stage("rag", "embed_query"):
+            vector = await self.embedding_client.aembed_text(text=text,
+                                                             document_type=DocumentTypeEnum.QUERY.value)
 
         if not vector or len(vector) == 0:
             return False
 
         # step3: do semantic search with increased limit for re-ranking
-        retrieval_limit = min(limit * 3, 50)
-        results = self.vectordb_client.search_by_vector(
-            collection_name=collection_name,
-            vector=vector,
-            limit=retrieval_limit
-        )
+        with track_stage("rag", "vector_search"):
+            results = self.vectordb_client.search_by_vector(
+                collection_name=collection_name,
+                vector=vector,
+                limit=self.get_retrieval_limit(limit)
+            )
 
         if not results:
             return False
 
         # step4: Apply simple re-ranking
-        for result in results:
-            text_length = len(result.text)
-            length_bonus = min(text_length / 1000, 0.1)
-            completeness_bonus = 0.05 if result.text.strip().endswith(('.', '!', '?')) else 0
-            result.score = result.score + length_bonus + completeness_bonus
+        return self.rerank_results(results, limit)
+
+    async def search_vector_db_collection_batch(self, project: Project, texts: List[str], limit: int = 10):
+        """
+        Search several texts with one embedding call and one vector db round trip
+
+        Returns:
+            One list of re-ranked results per text (empty when nothing matched),
+            or False when the texts could not be embedded
+        """
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        with track_stage("rag", "embed_query_batch"):
+            vectors = await self.embedding_client.aembed_texts(texts=texts,
+                                                               document_type=DocumentTypeEnum.QUERY.value)
+
+        if not vectors or len(vectors) != len(texts):
+            return False
 
-        results.sort(key=lambda x: x.score, reverse=True)
+        with track_stage("rag", "vector_search_batch"):
+            batch_results = self.vectordb_client.search_by_vectors(
+                collection_name=collection_name,
+                vectors=vectors,
+                limit=self.get_retrieval_limit(limit)
+            )
+
+        return [ self.rerank_results(results, limit) for results in batch_results ]
+
+    def get_retrieval_limit(self, limit: int) -> int:
+        # candidates fetched for re-ranking
+        return min(limit * self.app_settings.RAG_RETRIEVAL_DEPTH_FACTOR,
+                   self.app_settings.RAG_RETRIEVAL_MAX_CANDIDATES)
+
+    def rerank_results(self, results: List[RetrievedDocument], limit: int) -> List[RetrievedDocument]:
+        """Add the length and completeness bonuses to the scores, keep the limit best"""
+        with track_stage("rag", "rerank"):
+            for result in results:
+                text_length = len(result.text)
+                length_bonus = min(text_length / 1000, self.app_settings.RAG_RERANK_LENGTH_BONUS)
+                completeness_bonus = self.app_settings.RAG_RERANK_COMPLETENESS_BONUS \
+                                     if result.text.strip().endswith(('.', '!', '?')) else 0
+                result.score = result.score + length_bonus + completeness_bonus
+
+            results.sort(key=lambda x: x.score, reverse=True)
         return results[:limit]
     
     def deduplicate_results(self, results: List):
@@ -119,68 +164,241 @@ class NLPController(BaseController):
         
         return deduplicated
     
-    def answer_rag_question(self, project: Project, query: str, limit: int = 10):
-        
-        answer, full_prompt, chat_history = None, None, None
+    def get_chunk_group(self, document: RetrievedDocument):
+        # chunks are adjacent when they share a file and page/segment and their chunk_index follow
+        metadata = document.metadata or {}
+        if metadata.get("file_id") is None or metadata.get("chunk_index") is None:
+            return None
+        return (metadata["file_id"], metadata.get("source_document"))
+
+    def merge_chunk_texts(self, first: str, second: str, max_overlap: int = 1000) -> str:
+        """Concatenate two adjacent chunks, dropping the overlap the splitter repeated"""
+        for size in range(min(len(first), len(second), max_overlap), 0, -1):
+            if first.endswith(second[:size]):
+                return first + second[size:]
+        return f"{first}\n{second}"
+
+    def merge_adjacent_chunks(self, documents: List[RetrievedDocument]) -> List[RetrievedDocument]:
+        """
+        Merge runs of consecutive chunks of the same file into one document
+
+        A merged document keeps its best score and the metadata of its first
+        chunk; results are ordered by score.
+        """
+        groups, merged = {}, []
+        for document in documents:
+            group = self.get_chunk_group(document)
+            if group is None:
+                merged.append(document)
+            else:
+                groups.setdefault(group, []).append(document)
+
+        for group_documents in groups.values():
+            group_documents.sort(key=lambda document: document.metadata["chunk_index"])
+
+            run = [group_documents[0]]
+            for document in group_documents[1:] + [None]:
+                if document is not None and \
+                        document.metadata["chunk_index"] == run[-1].metadata["chunk_index"] + 1:
+                    run.append(document)
+                    continue
+
+                text = run[0].text.strip()
+                for next_document in run[1:]:
+                    text = self.merge_chunk_texts(text, next_document.text.strip())
+
+                merged.append(RetrievedDocument(
+                    text=text,
+                    score=max(run_document.score for run_document in run),
+                    metadata={**run[0].metadata, "merged_chunks": len(run)},
+                ))
+                run = [document]
+
+        merged.sort(key=lambda document: document.score, reverse=True)
+        return merged
+
+    def pack_context(self, documents: List[RetrievedDocument], token_budget: int) -> List[RetrievedDocument]:
+        """
+        Select the highest-scoring documents that fit in token_budget, counted
+        with the generation model's tokenizer, then merge adjacent chunks
+
+        Documents are expected in score order. A document that does not fit is
+        skipped so smaller, lower-ranked ones can still fill the budget; the top
+        document is truncated rather than dropped if it alone exceeds it.
+        """
+        if not documents:
+            return documents
+
+        count_tokens = self.generation_client.count_tokens
+
+        # tokens of the "## Document No / ### Content" wrapper and the separator
+        overhead = count_tokens(self.template_parser.get("rag", "document_prompt", {
+            "doc_num": len(documents),
+            "chunk_text": "",
+        })) + 1
+
+        selected, used_tokens = [], 0
+        for document in documents:
+            tokens = count_tokens(document.text.strip()) + overhead
+            if used_tokens + tokens > token_budget:
+                continue
+            selected.append(document)
+            used_tokens += tokens
+
+        if not selected:
+            top_document = documents[0]
+            tokens = count_tokens(top_document.text.strip())
+            keep_characters = int(len(top_document.text) * max(token_budget - overhead, 1) / max(tokens, 1))
+            selected = [RetrievedDocument(
+                text=top_document.text[:keep_characters],
+                score=top_document.score,
+                metadata=top_document.metadata,
+            )]
+
+        return self.merge_adjacent_chunks(selected)
+
+    async def build_rag_messages(self, project: Project, query: str, limit: int = 10):
+        """
+        Retrieve, pack and lay out the RAG prompt as chat messages
+
+        The system message holds only static text (system prompt and answering
+        instructions) so it forms a prefix providers can cache across questions;
+        documents and the question go in the user message.
+
+        Returns:
+            Tuple of messages, the user prompt and the context packing info,
+            or (None, None, None) when nothing was retrieved
+        """
 
         # step1: retrieve related documents
         retrieval_limit = max(limit, 15)
-        retrieved_documents = self.search_vector_db_collection(
+        retrieved_documents = await self.search_vector_db_collection(
             project=project,
             text=query,
             limit=retrieval_limit,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
+            return None, None, None
         
         # step2: Deduplicate results
-        retrieved_documents = self.deduplicate_results(retrieved_documents)
-        
-        # step3: Construct system prompt
-        system_prompt = self.template_parser.get("rag", "system_prompt")
-
-        # step4: Build document context - NO TRUNCATION
-        documents_prompts = "\n\n".join([
-            self.template_parser.get("rag", "document_prompt", {
-                    "doc_num": idx + 1,
-                    "chunk_text": doc.text.strip(),
-            })
-            for idx, doc in enumerate(retrieved_documents)
+        with track_stage("rag", "dedup"):
+            retrieved_documents = self.deduplicate_results(retrieved_documents)
+
+        # step2b: pack the best chunks into the context token budget
+        token_budget = self.app_settings.RAG_CONTEXT_MAX_TOKENS
+        with track_stage("rag", "pack_context"):
+            packed_documents = self.pack_context(retrieved_documents, token_budget=token_budget)
+
+        prompt_started_at = time.perf_counter()
+
+        # step3: Construct system prompt, static across questions
+        system_prompt = "\n\n".join([
+            self.template_parser.get("rag", "system_prompt"),
+            "Provide a comprehensive answer based on the provided documents. If the documents don't contain "
+            "enough information to fully answer the question, say so and provide what information is available.",
         ])
 
-        footer_prompt = self.template_parser.get("rag", "footer_prompt")
-        enhanced_footer = f"{footer_prompt}\n\nUser Question: {query}\n\nProvide a comprehensive answer based on the context above. If the context doesn't contain enough information to fully answer the question, say so and provide what information is available."
-
-        # step5: Build full prompt without truncation
-        full_prompt = "\n\n".join([documents_prompts, enhanced_footer])
-
-        # step6: Manually construct chat history to avoid truncation
-        chat_history = [
-            self.generation_client.construct_prompt(
-                prompt=system_prompt,
-                role=self.generation_client.enums.SYSTEM.value,
-            ),
-            # Add user message directly without processing
+        # step4: Build document context from the packed documents
+        documents_prompts = self.template_parser.render_block("rag", "document_prompt", [
             {
-                "role": self.generation_client.enums.USER.value,
-                "content": full_prompt  # Full content, no truncation
+                "doc_num": idx + 1,
+                "chunk_text": doc.text.strip(),
             }
+            for idx, doc in enumerate(packed_documents)
+        ])
+
+        context_info = {
+            "token_budget": token_budget,
+            "packed_tokens": self.generation_client.count_tokens(documents_prompts),
+            "retrieved_documents": len(retrieved_documents),
+            "packed_documents": len(packed_documents),
+            "packed_chunks": sum((doc.metadata or {}).get("merged_chunks", 1) for doc in packed_documents),
+        }
+
+        footer_prompt = self.template_parser.get("rag", "footer_prompt")
+
+        # step5: Build the user prompt, the per-question part goes last
+        full_prompt = "\n\n".join([documents_prompts, footer_prompt, f"User Question: {query}"])
+
+        # step6: provider-agnostic messages, sent without truncation
+        messages = [
+            {"role": ChatRoleEnum.SYSTEM.value, "content": system_prompt},
+            {"role": ChatRoleEnum.USER.value, "content": full_prompt},
         ]
 
-        # step7: Call the API directly with pre-built chat history
+        PIPELINE_STAGE_SECONDS.labels(pipeline="rag", stage="prompt_assembly").observe(
+            time.perf_counter() - prompt_started_at
+        )
+
+        return messages, full_prompt, context_info
+
+    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+        """
+        Returns:
+            Tuple of the answer, the user prompt, the chat messages and metrics
+            (context packing, token usage including cached prompt tokens, latency)
+        """
+        messages, full_prompt, context_info = await self.build_rag_messages(project, query, limit)
+        if not messages:
+            return None, None, None, None
+
+        # step7: generate through the provider interface
+        started_at = time.perf_counter()
         try:
-            response = self.generation_client.client.chat.completions.create(
-                model=self.generation_client.generation_model_id,
-                messages=chat_history,
-                max_tokens=500,
-                temperature=0.3
-            )
-            
-            if response and response.choices and len(response.choices) > 0:
-                answer = response.choices[0].message.content
+            with track_stage("rag", "generation"):
+                response = await self.generation_client.achat(
+                    messages=messages,
+                    max_output_tokens=self.app_settings.RAG_ANSWER_MAX_TOKENS,
+                    temperature=self.app_settings.RAG_ANSWER_TEMPERATURE,
+                )
         except Exception as e:
-            self.generation_client.logger.error(f"Error generating RAG answer: {e}")
-            return None, full_prompt, chat_history
+            logger.error(f"Error generating RAG answer: {e}")
+            response = None
+
+        metrics = {
+            "context": context_info,
+            "usage": response["usage"] if response else None,
+            "latency_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        }
+
+        answer = response["text"] if response else None
+        return answer, full_prompt, messages, metrics
+
+    async def stream_rag_answer(self, project: Project, query: str, limit: int = 10):
+        """
+        Stream the RAG answer
+
+        Yields:
+            {"text": delta} events, then one {"metrics": ...} event (same metrics
+            as answer_rag_question, latency_ms being the time to first token and
+            total_ms the full generation)
+        """
+        messages, _, context_info = await self.build_rag_messages(project, query, limit)
+        if not messages:
+            raise ValueError("No documents retrieved for the question")
+
+        started_at = time.perf_counter()
+        first_token_ms, usage = None, None
+
+        async for event in self.generation_client.achat_stream(
+            messages=messages,
+            max_output_tokens=self.app_settings.RAG_ANSWER_MAX_TOKENS,
+            temperature=self.app_settings.RAG_ANSWER_TEMPERATURE,
+        ):
+            if "text" in event:
+                if first_token_ms is None:
+                    first_token_ms = round((time.perf_counter() - started_at) * 1000, 1)
+                    PIPELINE_STAGE_SECONDS.labels(pipeline="rag", stage="first_token").observe(first_token_ms / 1000)
+                yield event
+            elif "usage" in event:
+                usage = event["usage"]
+
+        PIPELINE_STAGE_SECONDS.labels(pipeline="rag", stage="generation").observe(time.perf_counter() - started_at)
 
-        return answer, full_prompt, chat_history
\ No newline at end of file
+        yield {"metrics": {
+            "context": context_info,
+            "usage": usage,
+            "latency_ms": first_token_ms,
+            "total_ms": round((time.perf_counter() - started_at) * 1000, 1),
+        }}
@@ -1,31 +1,179 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
 import os
-from langchain_community.document_loaders import TextLoader
-from langchain_community.document_loaders import PyMuPDFLoader
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-from models import ProcessingEnum
+from stores.loaders.LoaderRegistry import loader_registry
+from langchain_text_splitters import RecursiveCharacterTextSplitter, TextSplitter
+from langchain_core.documents import Document
+from models import ChunkingMethodEnum
+from stores.llm.LLMEnums import LLMEnums, DocumentTypeEnum
+from helpers.metrics import track_stage
+from models.db_schemes import DataChunk
+from bson.objectid import ObjectId
+from functools import lru_cache
+from typing import Iterator, List
+import hashlib
+import json
 import logging
+import math
+import re
 
 logger = logging.getLogger('uvicorn.error')
 
+
+# Prioritize splitting at semantic boundaries
+TEXT_SEPARATORS = [
+    "\n\n\n",  # Multiple blank lines (section breaks)
+    "\n\n",    # Paragraph breaks
+    "\n",      # Line breaks
+    ". ",      # Sentence endings
+    "! ",      # Exclamations
+    "? ",      # Questions
+    "; ",      # Semicolons
+    ", ",      # Commas
+    " ",       # Spaces
+    "",        # Characters (last resort)
+]
+
+
+@lru_cache(maxsize=32)
+def get_text_splitter(chunk_size: int, overlap_size: int):
+    """Build (once per chunk settings) the character-based splitter used for all files"""
+    # Use RecursiveCharacterTextSplitter with better separators
+    # This splits on semantic boundaries (paragraphs, sentences) rather than arbitrary characters
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=overlap_size,
+        length_function=len,
+        separators=TEXT_SEPARATORS,
+        is_separator_regex=False,
+    )
+
+
+@lru_cache(maxsize=4)
+def get_tokenizer(model_id: str):
+    """Load (once per model) the HuggingFace tokenizer of the embedding model"""
+    from transformers import AutoTokenizer
+    return AutoTokenizer.from_pretrained(model_id)
+
+
+@lru_cache(maxsize=32)
+def get_token_splitter(model_id: str, chunk_tokens: int, overlap_tokens: int):
+    """Build (once per model and chunk settings) a splitter that measures chunks in model tokens"""
+    return RecursiveCharacterTextSplitter.from_huggingface_tokenizer(
+        get_tokenizer(model_id),
+        chunk_size=chunk_tokens,
+        chunk_overlap=overlap_tokens,
+        separators=TEXT_SEPARATORS,
+        is_separator_regex=False,
+    )
+
+
+class SemanticTextSplitter(TextSplitter):
+    """
+    Split text where the meaning changes instead of at fixed separators
+
+    Sentences are embedded in large batches with the configured embedding client,
+    and a chunk boundary is placed wherever the cosine distance between adjacent
+    sentences is above the breakpoint percentile (or the chunk would exceed chunk_size).
+    """
+
+    sentence_pattern = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+    def __init__(self, embedding_client, breakpoint_percentile: int=90,
+                       embedding_batch_size: int=64, **kwargs):
+        super().__init__(**kwargs)
+
+        self.embedding_client = embedding_client
+        self.breakpoint_percentile = breakpoint_percentile
+        self.embedding_batch_size = embedding_batch_size
+
+        # used for sentences longer than a chunk and when embedding fails
+        self.fallback_splitter = get_text_splitter(self._chunk_size, self._chunk_overlap)
+
+    def split_sentences(self, text: str) -> List[str]:
+        sentences = []
+        for sentence in self.sentence_pattern.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+
+            if len(sentence) > self._chunk_size:
+                sentences.extend(self.fallback_splitter.split_text(sentence))
+            else:
+                sentences.append(sentence)
+
+        return sentences
+
+    def embed_sentences(self, sentences: List[str]):
+        vectors = []
+        for i in range(0, len(sentences), self.embedding_batch_size):
+            batch_vectors = self.embedding_client.embed_texts(
+                texts=sentences[i:i + self.embedding_batch_size],
+                document_type=DocumentTypeEnum.DOCUMENT.value
+            )
+
+            if not batch_vectors:
+                return None
+
+            vectors.extend(batch_vectors)
+
+        return vectors
+
+    @staticmethod
+    def cosine_distance(a: list, b: list) -> float:
+        dot = sum(x * y for x, y in zip(a, b))
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+        return 1 - dot / norm if norm else 1.0
+
+    def split_text(self, text: str) -> List[str]:
+        sentences = self.split_sentences(text)
+        if len(sentences) <= 1:
+            return sentences
+
+        with track_stage("process", "semantic_embed"):
+            vectors = self.embed_sentences(sentences)
+        if not vectors:
+            logger.warning("Sentence embedding failed, falling back to character chunking")
+            return self.fallback_splitter.split_text(text)
+
+        distances = [
+            self.cosine_distance(vectors[i], vectors[i + 1])
+            for i in range(len(vectors) - 1)
+        ]
+        sorted_distances = sorted(distances)
+        threshold = sorted_distances[
+            min(len(sorted_distances) - 1, len(sorted_distances) * self.breakpoint_percentile // 100)
+        ]
+
+        chunks, current, current_size = [], [sentences[0]], len(sentences[0])
+        for sentence, distance in zip(sentences[1:], distances):
+            if distance > threshold or current_size + 1 + len(sentence) > self._chunk_size:
+                chunks.append(" ".join(current))
+                current, current_size = [], -1
+
+            current.append(sentence)
+            current_size += 1 + len(sentence)
+
+        chunks.append(" ".join(current))
+        return chunks
+
+
 class ProcessController(BaseController):
 
-    def __init__(self, project_id: str):
+    def __init__(self, project_id: str, embedding_client=None):
         super().__init__()
 
         self.project_id = project_id
+        self.embedding_client = embedding_client
         self.project_path = ProjectController().get_project_path(project_id=project_id)
 
     def get_file_extension(self, file_id: str):
         """Extract file extension from file_id (handles paths with folders)"""
         return os.path.splitext(file_id)[-1].lower()
 
-    def get_file_loader(self, file_id: str):
-        """Get appropriate file loader for the file"""
-        
-        file_ext = self.get_file_extension(file_id=file_id)
-        
+    def get_file_path(self, file_id: str):
+        """Resolve a file_id (which may include folders) to its path in the project directory"""
+
         # Normalize path separators for the OS
         normalized_file_id = file_id.replace('/', os.sep).replace('\\', os.sep)
         
@@ -36,7 +184,13 @@ class ProcessController(BaseController):
         )
         
         # Normalize the entire path to ensure consistency
-        file_path = os.path.normpath(file_path)
+        return os.path.normpath(file_path)
+
+    def get_file_loader(self, file_id: str, chunk_size: int=1000):
+        """Get appropriate file loader for the file from the loader registry"""
+        
+        file_ext = self.get_file_extension(file_id=file_id)
+        file_path = self.get_file_path(file_id=file_id)
 
         logger.info(f"Attempting to load file: {file_path}")
 
@@ -54,16 +208,19 @@ class ProcessController(BaseController):
 
         # Return appropriate loader based on extension
         try:
-            if file_ext == ProcessingEnum.TXT.value or file_ext == ProcessingEnum.MD.value:
-                logger.info(f"Creating TextLoader for {file_id}")
-                return TextLoader(file_path, encoding="utf-8")
-            
-            if file_ext == ProcessingEnum.PDF.value:
-                logger.info(f"Creating PyMuPDFLoader for {file_id}")
-                return PyMuPDFLoader(file_path)
-            
-            logger.error(f"Unsupported file extension: {file_ext} for file: {file_id}")
-            return None
+            loader = loader_registry.create(
+                file_path=file_path,
+                extension=file_ext,
+                segment_size=self.app_settings.FILE_SEGMENT_SIZE,
+                max_characters=chunk_size,
+            )
+
+            if loader is None:
+                logger.error(f"Unsupported file extension: {file_ext} for file: {file_id}")
+                return None
+
+            logger.info(f"Creating {type(loader).__name__} for {file_id}")
+            return loader
             
         except Exception as e:
             logger.error(f"Error creating loader for {file_id}: {e}", exc_info=True)
@@ -87,8 +244,216 @@ class ProcessController(BaseController):
             logger.error(f"Error loading content for {file_id}: {e}", exc_info=True)
             return None
 
+    def compute_file_hash(self, file_path: str):
+        """SHA-256 of the file bytes, read in FILE_DEFAULT_CHUNK_SIZE blocks"""
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            while block := f.read(self.app_settings.FILE_DEFAULT_CHUNK_SIZE):
+                file_hash.update(block)
+
+        return file_hash.hexdigest()
+
+    def get_processing_state(self, file_id: str, previous_state: dict=None,
+                             chunk_size: int=1000, overlap_size: int=200,
+                             chunking_method: str=ChunkingMethodEnum.CHARACTER.value):
+        """
+        Build the processing state of a file and tell whether it must be (re-)chunked
+
+        A file is unchanged when its chunk settings match previous_state and either its
+        size and mtime match (no read at all) or its content hash does.
+
+        Returns:
+            (is_changed, state) or (None, None) if the file does not exist
+        """
+        file_path = self.get_file_path(file_id=file_id)
+        if not os.path.isfile(file_path):
+            logger.error(f"File not found: {file_path}")
+            return None, None
+
+        file_stat = os.stat(file_path)
+        chunk_settings = {
+            "chunk_size": chunk_size,
+            "overlap_size": overlap_size,
+            "chunking_method": chunking_method,
+        }
+        if chunking_method != ChunkingMethodEnum.CHARACTER.value:
+            chunk_settings["embedding_model_id"] = self.app_settings.EMBEDDING_MODEL_ID
+
+        state = {
+            "file_size": file_stat.st_size,
+            "file_mtime": file_stat.st_mtime,
+            "chunk_settings": chunk_settings,
+        }
+
+        previous_state = previous_state or {}
+        same_settings = previous_state.get("chunk_settings") == chunk_settings
+
+        if same_settings and previous_state.get("file_size") == state["file_size"] \
+                and previous_state.get("file_mtime") == state["file_mtime"]:
+            state["content_hash"] = previous_state.get("content_hash")
+        else:
+            with track_stage("process", "fingerprint"):
+                state["content_hash"] = self.compute_file_hash(file_path=file_path)
+
+        state["fingerprint"] = hashlib.sha256(
+            json.dumps([state["content_hash"], chunk_settings], sort_keys=True).encode("utf-8")
+        ).hexdigest()
+
+        is_changed = state["fingerprint"] != previous_state.get("fingerprint")
+
+        return is_changed, state
+
+    def get_text_splitter(self, chunk_size: int=1000, overlap_size: int=200,
+                          chunking_method: str=ChunkingMethodEnum.CHARACTER.value):
+        """
+        Get the splitter for the requested chunking method
+
+        In token mode chunks are sized to the embedding model's token window
+        (EMBEDDING_MODEL_MAX_TOKENS, special tokens included) so nothing is truncated
+        at embedding time; the overlap keeps the same ratio to chunk_size as requested.
+        In semantic mode chunk_size is an upper bound and chunks do not overlap.
+        """
+        if chunking_method == ChunkingMethodEnum.CHARACTER.value:
+            return get_text_splitter(chunk_size, overlap_size)
+
+        if chunking_method == ChunkingMethodEnum.TOKEN.value:
+            if self.app_settings.EMBEDDING_BACKEND not in [LLMEnums.HUGGINGFACE.value, LLMEnums.ONNX.value,
+                                                           LLMEnums.SIDECAR.value]:
+                logger.warning(
+                    f"Token chunking needs a local tokenizer, not available for "
+                    f"{self.app_settings.EMBEDDING_BACKEND}; using character chunking"
+                )
+                return get_text_splitter(chunk_size, overlap_size)
+
+            chunk_tokens = self.app_settings.EMBEDDING_MODEL_MAX_TOKENS
+            overlap_tokens = chunk_tokens * overlap_size // chunk_size
+
+            return get_token_splitter(
+                self.app_settings.EMBEDDING_MODEL_ID, chunk_tokens, overlap_tokens
+            )
+
+        if chunking_method == ChunkingMethodEnum.SEMANTIC.value:
+            if not self.embedding_client:
+                raise ValueError("Semantic chunking requires an embedding client")
+
+            return SemanticTextSplitter(
+                embedding_client=self.embedding_client,
+                breakpoint_percentile=self.app_settings.SEMANTIC_CHUNK_BREAKPOINT_PERCENTILE,
+                embedding_batch_size=self.app_settings.SEMANTIC_CHUNK_EMBEDDING_BATCH_SIZE,
+                chunk_size=chunk_size,
+                chunk_overlap=0,
+            )
+
+        raise ValueError(f"Unsupported chunking method: {chunking_method}")
+
+    def iter_file_content(self, file_id: str, chunk_size: int=1000) -> Iterator[Document]:
+        """Lazily yield the pages, text segments or row groups of a file"""
+
+        loader = self.get_file_loader(file_id=file_id, chunk_size=chunk_size)
+        if loader is None:
+            logger.error(f"No loader available for file: {file_id}")
+            return
+
+        logger.info(f"Lazily loading content for: {file_id}")
+        pages = loader.lazy_load()
+        while True:
+            # loading is timed per page, the consumer's work between pages is not
+            with track_stage("process", "load_page"):
+                page = next(pages, None)
+            if page is None:
+                return
+            yield page
+
+    def iter_file_chunks(self, file_content, file_id: str,
+                         chunk_size: int=1000, overlap_size: int=200,
+                         chunking_method: str=ChunkingMethodEnum.CHARACTER.value) -> Iterator[Document]:
+        """
+        Split an iterable of loaded pages into chunks one page at a time
+
+        Only the current page and its chunks are held in memory.
+        """
+        text_splitter = self.get_text_splitter(
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            chunking_method=chunking_method
+        )
+
+        for i, page in enumerate(file_content):
+            if page.metadata.get('row_group'):
+                # Tabular row groups are already sized to a chunk and must not be split
+                sub_chunks = [page]
+            else:
+                # Split the text into chunks
+                with track_stage("process", "split_page"):
+                    sub_chunks = text_splitter.create_documents(
+                        [page.page_content],
+                        metadatas=[page.metadata]
+                    )
+
+            # Enhance metadata for each chunk
+            for j, chunk in enumerate(sub_chunks):
+                # Add file identification
+                chunk.metadata['file_id'] = file_id
+                chunk.metadata['source_document'] = i
+                chunk.metadata['chunk_index'] = j
+                chunk.metadata['total_chunks'] = len(sub_chunks)
+
+                # Add a preview for better context
+                preview = chunk.page_content[:100].replace('\n', ' ').strip()
+                chunk.metadata['preview'] = preview + '...' if len(chunk.page_content) > 100 else preview
+
+                yield chunk
+
+    def iter_chunk_batches(self, file_id: str, project_id: ObjectId, asset_id: ObjectId,
+                           chunk_size: int=1000, overlap_size: int=200,
+                           chunking_method: str=ChunkingMethodEnum.CHARACTER.value,
+                           chunk_fingerprint: str=None,
+                           batch_size: int=100) -> Iterator[List[DataChunk]]:
+        """
+        Stream a file from disk into DataChunk batches of at most batch_size records
+
+        Peak memory is bounded by one page/segment plus one batch, not by the file size.
+        """
+        batch = []
+        no_chunks, total_characters = 0, 0
+
+        chunks = self.iter_file_chunks(
+            file_content=self.iter_file_content(file_id=file_id, chunk_size=chunk_size),
+            file_id=file_id,
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            chunking_method=chunking_method
+        )
+
+        for chunk in chunks:
+            no_chunks += 1
+            total_characters += len(chunk.page_content)
+
+            batch.append(
+                DataChunk(
+                    chunk_text=chunk.page_content,
+                    chunk_metadata=chunk.metadata,
+                    chunk_order=no_chunks,
+                    chunk_project_id=project_id,
+                    chunk_asset_id=asset_id,
+                    chunk_fingerprint=chunk_fingerprint
+                )
+            )
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+        if batch:
+            yield batch
+
+        if no_chunks:
+            logger.info(f"Created {no_chunks} chunks from {file_id}")
+            logger.info(f"Average chunk size: {total_characters // no_chunks} characters")
+
     def process_file_content(self, file_content: list, file_id: str,
-                            chunk_size: int=1000, overlap_size: int=200):
+                            chunk_size: int=1000, overlap_size: int=200,
+                            chunking_method: str=ChunkingMethodEnum.CHARACTER.value):
         """
         Process loaded file content into chunks with improved semantic awareness
         
@@ -102,61 +467,13 @@ class ProcessController(BaseController):
             return None
 
         try:
-            # Use RecursiveCharacterTextSplitter with better separators
-            # This splits on semantic boundaries (paragraphs, sentences) rather than arbitrary characters
-            text_splitter = RecursiveCharacterTextSplitter(
+            chunks = list(self.iter_file_chunks(
+                file_content=file_content,
+                file_id=file_id,
                 chunk_size=chunk_size,
-                chunk_overlap=overlap_size,
-                length_function=len,
-                # Prioritize splitting at semantic boundaries
-                separators=[
-                    "\n\n\n",  # Multiple blank lines (section breaks)
-                    "\n\n",    # Paragraph breaks
-                    "\n",      # Line breaks
-                    ". ",      # Sentence endings
-                    "! ",      # Exclamations
-                    "? ",      # Questions
-                    "; ",      # Semicolons
-                    ", ",      # Commas
-                    " ",       # Spaces
-                    "",        # Characters (last resort)
-                ],
-                is_separator_regex=False,
-            )
-
-            # Extract text and metadata from loaded documents
-            file_content_texts = [
-                rec.page_content
-                for rec in file_content
-            ]
-
-            file_content_metadata = [
-                rec.metadata
-                for rec in file_content
-            ]
-
-            # Create chunks with enhanced metadata
-            chunks = []
-            for i, (text, metadata) in enumerate(zip(file_content_texts, file_content_metadata)):
-                # Split the text into chunks
-                sub_chunks = text_splitter.create_documents(
-                    [text],
-                    metadatas=[metadata]
-                )
-                
-                # Enhance metadata for each chunk
-                for j, chunk in enumerate(sub_chunks):
-                    # Add file identification
-                    chunk.metadata['file_id'] = file_id
-                    chunk.metadata['source_document'] = i
-                    chunk.metadata['chunk_index'] = j
-                    chunk.metadata['total_chunks'] = len(sub_chunks)
-                    
-                    # Add a preview for better context
-                    preview = chunk.page_content[:100].replace('\n', ' ').strip()
-                    chunk.metadata['preview'] = preview + '...' if len(chunk.page_content) > 100 else preview
-                    
-                    chunks.append(chunk)
+                overlap_size=overlap_size,
+                chunking_method=chunking_method
+            ))
 
             logger.info(f"Created {len(chunks)} chunks from {file_id}")
             logger.info(f"Average chunk size: {sum(len(c.page_content) for c in chunks) // len(chunks)} characters")
@@ -165,4 +482,4 @@ class ProcessController(BaseController):
             
         except Exception as e:
             logger.error(f"Error processing content for {file_id}: {e}", exc_info=True)
-            return None
\ No newline at end of file
+            return None
@@ -1,58 +1,229 @@
 from .BaseController import BaseController
-import requests
-from bs4 import BeautifulSoup
-from typing import Dict
+from .ProcessController import TEXT_SEPARATORS
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+from typing import List
+import asyncio
+import hashlib
 import logging
+import math
 
 logger = logging.getLogger('uvicorn.error')
 
-class Website:
-    """Helper class to scrape and parse website content"""
-    
-    def __init__(self, url: str):
-        self.url = url
-        response = requests.get(url, timeout=10)
-        self.body = response.content
-        soup = BeautifulSoup(self.body, 'html.parser')
-        self.title = soup.title.string if soup.title else "No title found"
-        
-        if soup.body:
-            for irrelevant in soup.body(['script', 'style', 'input', 'img']):
-                irrelevant.decompose()
-            self.text = soup.body.get_text(separator='\n', strip=True)
-        else:
-            self.text = soup.get_text(separator='\n', strip=True)
-
-    def get_content(self) -> str:
-        return f"website title:\n {self.title}\n webpage content: \n {self.text}\n\n"
-
 
 class WebScrapingController(BaseController):
     """Controller for web scraping and summarization operations"""
     
-    def __init__(self, generation_client=None, template_parser=None):
+    def __init__(self, generation_client=None, template_parser=None, generation_cache=None,
+                 web_scraper=None):
         super().__init__()
         self.generation_client = generation_client
         self.template_parser = template_parser
+        self.generation_cache = generation_cache
+        self.web_scraper = web_scraper
 
-    def summarize_website(self, company_name: str, url: str) -> str:
+    def get_website_content(self, pages: List) -> str:
+        # landing page first, then the crawled pages labelled with their url
+        content = pages[0].get_content()
+        for page in pages[1:]:
+            content += f"page: {page.url}\n{page.get_content()}"
+        return content
+
+    def get_section_length(self, text: str) -> int:
         """
-        Scrape a website and generate a summary
+        Size of text against the WEB_SUMMARY_SECTION_TOKENS budget
+
+        Tokens of the generation model, or more when the text would not fit in
+        the provider's input truncation (leaving room for the instructions).
+        """
+        section_tokens = self.app_settings.WEB_SUMMARY_SECTION_TOKENS
+        length = self.generation_client.count_tokens(text)
+
+        input_max_characters = getattr(self.generation_client, "default_input_max_characters", None)
+        if input_max_characters:
+            length = max(length, math.ceil(len(text) * section_tokens / (input_max_characters * 0.9)))
+
+        return length
+
+    def split_sections(self, pages: List) -> List[str]:
+        """
+        Split the scraped pages into sections within the section budget
+
+        Returns the whole website content as the only section when it fits.
+        Otherwise pages are split independently, so a change on one page leaves
+        the sections (and cached section summaries) of the other pages untouched.
+        Counting tokens is CPU bound, call it in a worker thread.
+        """
+        section_tokens = self.app_settings.WEB_SUMMARY_SECTION_TOKENS
+
+        website_content = self.get_website_content(pages)
+        if self.get_section_length(website_content) <= section_tokens:
+            return [website_content]
+
+        splitter = RecursiveCharacterTextSplitter(
+            chunk_size=section_tokens,
+            chunk_overlap=min(self.app_settings.WEB_SUMMARY_SECTION_OVERLAP_TOKENS, section_tokens // 4),
+            length_function=self.get_section_length,
+            separators=TEXT_SEPARATORS,
+            is_separator_regex=False,
+        )
+
+        sections = []
+        for page in pages:
+            page_content = f"page: {page.url}\n{page.get_content()}"
+            if self.get_section_length(page_content) <= section_tokens:
+                sections.append(page_content)
+                continue
+            sections.extend([
+                f"page: {page.url} (part {index + 1})\n{section}"
+                for index, section in enumerate(splitter.split_text(page.get_content()))
+            ])
+
+        return sections
+
+    async def summarize_section(self, company_name: str, section: str) -> str:
+        """Summarize one section into notes, cached by the section's content hash"""
+
+        async def generate():
+            notes = await self.generation_client.agenerate_text(
+                prompt=(
+                    f"Here is part of the website of {company_name}. Extract, as concise markdown notes, "
+                    f"every fact useful for a company brochure (products, services, customers, culture, "
+                    f"careers, locations, contact details). Skip navigation and boilerplate.\n\n{section}"
+                ),
+                chat_history=[],
+                max_output_tokens=self.app_settings.WEB_SUMMARY_SECTION_MAX_OUTPUT_TOKENS,
+            )
+            if not notes:
+                raise ValueError("Generation client returned empty section summary")
+            return notes.strip()
+
+        if not self.generation_cache:
+            return await generate()
+
+        cache_key = self.generation_cache.make_key(
+            namespace="web_summary_section",
+            payload={
+                "company_name": company_name,
+                "content_hash": hashlib.sha256(section.encode("utf-8")).hexdigest(),
+            },
+            model_id=getattr(self.generation_client, "generation_model_id", None),
+            temperature=getattr(self.generation_client, "default_generation_temperature", None),
+        )
+        notes, _ = await self.generation_cache.get_or_generate(key=cache_key, generate=generate)
+        return notes
+
+    async def summarize_sections(self, company_name: str, sections: List[str]) -> List[str]:
+        semaphore = asyncio.Semaphore(self.app_settings.WEB_SUMMARY_MAP_CONCURRENCY)
+
+        async def summarize_one(section: str):
+            async with semaphore:
+                return await self.summarize_section(company_name, section)
+
+        return await asyncio.gather(*[summarize_one(section) for section in sections])
+
+    async def map_reduce_content(self, company_name: str, pages: List) -> str:
+        """
+        Reduce the scraped content to notes that fit in one prompt
+
+        Sections are summarized concurrently (map); while the joined notes are
+        still over the section size they are grouped and summarized again.
+
+        Returns:
+            The combined section notes, or None when the whole website content
+            fits in one section (one generation call, no map-reduce)
+        """
+        sections = await asyncio.to_thread(self.split_sections, pages)
+        if len(sections) == 1:
+            return None
+
+        logger.info(f"Summarizing {len(sections)} website sections")
+        notes = await self.summarize_sections(company_name, sections)
+
+        section_tokens = self.app_settings.WEB_SUMMARY_SECTION_TOKENS
+        while len(notes) > 1 and self.get_section_length("\n\n".join(notes)) > section_tokens:
+            groups, group = [], ""
+            for note in notes:
+                if group and self.get_section_length(f"{group}\n\n{note}") > section_tokens:
+                    groups.append(group)
+                    group = ""
+                group = f"{group}\n\n{note}" if group else note
+            groups.append(group)
+
+            if len(groups) == len(notes):
+                # every note fills a section on its own, nothing left to merge
+                break
+
+            logger.info(f"Combining {len(notes)} section summaries into {len(groups)}")
+            notes = await self.summarize_sections(company_name, groups)
+
+        return "\n\n".join(notes)
+
+    async def summarize_website(self, company_name: str, url: str, use_cache: bool = True,
+                                crawl_depth: int = 0, max_pages: int = 1):
+        """
+        Scrape a website and generate a summary, reusing a cached summary of the
+        same page (the page is not scraped again on a cache hit)
         
         Args:
             company_name: Name of the company
             url: URL of the website to scrape
+            use_cache: Reuse (and store) the summary for identical requests
+            crawl_depth: Same-domain link hops to follow from the landing page
+            max_pages: Page budget for the crawl, landing page included
             
         Returns:
-            Generated summary text
+            Tuple of the generated summary text and the cache status
+            (hit, miss, coalesced, bypass or None without a cache)
         """
         if not self.generation_client:
             raise ValueError("Generation client not initialized")
+
+        if not self.web_scraper:
+            raise ValueError("Web scraper not initialized")
+
+        crawl_depth = max(0, min(crawl_depth, self.app_settings.WEB_SCRAPER_MAX_DEPTH))
+        max_pages = max(1, min(max_pages, self.app_settings.WEB_SCRAPER_MAX_PAGES))
+
+        if not self.generation_cache:
+            return await self.generate_summary(company_name, url, crawl_depth, max_pages), None
+
+        cache_key = self.generation_cache.make_key(
+            namespace="web_summary",
+            payload={
+                "company_name": company_name,
+                "url": self.generation_cache.normalize_url(url),
+                "crawl_depth": crawl_depth,
+                "max_pages": max_pages,
+            },
+            model_id=getattr(self.generation_client, "generation_model_id", None),
+            temperature=getattr(self.generation_client, "default_generation_temperature", None),
+        )
+
+        return await self.generation_cache.get_or_generate(
+            key=cache_key,
+            generate=lambda: self.generate_summary(company_name, url, crawl_depth, max_pages),
+            use_cache=use_cache,
+        )
+
+    async def generate_summary(self, company_name: str, url: str, crawl_depth: int = 0,
+                               max_pages: int = 1) -> str:
+        """
+        Scrape a website and generate a summary
         
+        Args:
+            company_name: Name of the company
+            url: URL of the website to scrape
+            crawl_depth: Same-domain link hops to follow from the landing page
+            max_pages: Page budget for the crawl, landing page included
+            
+        Returns:
+            Generated summary text
+        """
         try:
             # Scrape the website
-            logger.info(f"Scraping website: {url}")
-            website = Website(url)
+            logger.info(f"Scraping website: {url} (depth {crawl_depth}, up to {max_pages} pages)")
+            pages = await self.web_scraper.crawl(url, max_depth=crawl_depth, max_pages=max_pages)
+            logger.info(f"Scraped {len(pages)} pages, {sum(page.from_cache for page in pages)} unchanged since last scrape")
             
             # Construct the prompt - using the same pattern as NLPController
             system_prompt = (
@@ -73,11 +244,18 @@ class WebScrapingController(BaseController):
                 except Exception as e:
                     logger.warning(f"Could not get template: {e}, using default")
             
-            # Construct the user prompt
-            user_prompt = (
-                f"Please generate a brochure for the content about {company_name}. "
-                f"Here is their landing page:\n\n{website.get_content()}"
-            )
+            # Construct the user prompt, from section notes when the site is too large for one prompt
+            notes = await self.map_reduce_content(company_name, pages)
+            if notes:
+                user_prompt = (
+                    f"Please generate a brochure for the content about {company_name}. "
+                    f"Here are notes summarizing their website, section by section:\n\n{notes}"
+                )
+            else:
+                user_prompt = (
+                    f"Please generate a brochure for the content about {company_name}. "
+                    f"Here is their landing page:\n\n{self.get_website_content(pages)}"
+                )
             
             # Construct chat history - SAME WAY AS NLPController
             chat_history = [
@@ -90,7 +268,7 @@ class WebScrapingController(BaseController):
             logger.info("Generating brochure")
             
             # Generate the summary - SAME WAY AS NLPController
-            summary = self.generation_client.generate_text(
+            summary = await self.generation_client.agenerate_text(
                 prompt=user_prompt,
                 chat_history=chat_history
             )
@@ -102,7 +280,7 @@ class WebScrapingController(BaseController):
             return summary
             
         except Exception as e:
-            logger.error(f"Error in summarize_website: {str(e)}")
+            logger.error(f"Error in generate_summary: {str(e)}")
             import traceback
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise
\ No newline at end of file
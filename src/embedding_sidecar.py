@@ -0,0 +1,80 @@
+"""
+Embedding sidecar: one process holding the embedding model for all workers
+
+Run next to a multi-worker app (workers with EMBEDDING_BACKEND="SIDECAR"):
+    uvicorn embedding_sidecar:app --uds /tmp/hr-toolkit-embeddings.sock
+"""
+from fastapi import FastAPI, status
+from fastapi.responses import JSONResponse
+from helpers.config import get_settings
+from helpers.readiness import ReadinessTracker
+from routes.schemes.embedding_sidecar import EmbedRequest
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+import asyncio
+
+app = FastAPI()
+
+async def startup_span():
+    settings = get_settings()
+
+    app.llm_provider_factory = LLMProviderFactory(settings)
+    app.embedding_client = app.llm_provider_factory.create(provider=settings.EMBEDDING_SIDECAR_BACKEND)
+
+    def load_embedding_model():
+        app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                                 embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    app.readiness = ReadinessTracker(components=["embedding_model"])
+    app.startup_task = asyncio.ensure_future(
+        app.readiness.run("embedding_model", asyncio.to_thread(load_embedding_model))
+    )
+
+
+async def shutdown_span():
+    app.startup_task.cancel()
+    await app.llm_provider_factory.close()
+
+app.on_event("startup")(startup_span)
+app.on_event("shutdown")(shutdown_span)
+
+
+@app.get("/health/ready")
+async def readiness():
+
+    if not app.readiness.is_ready():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=app.readiness.get_status()
+        )
+
+    return {
+        "model_id": app.embedding_client.embedding_model_id,
+        "embedding_size": app.embedding_client.embedding_size,
+        "micro_batching": app.llm_provider_factory.get_micro_batch_metrics(),
+    }
+
+@app.post("/embed")
+async def embed(embed_request: EmbedRequest):
+
+    if not app.readiness.is_ready():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"embeddings": None}
+        )
+
+    # single queries from all workers are micro-batched together here
+    if len(embed_request.texts) == 1:
+        embedding = await app.embedding_client.aembed_text(text=embed_request.texts[0],
+                                                           document_type=embed_request.document_type)
+        embeddings = [embedding] if embedding else None
+    else:
+        embeddings = await app.embedding_client.aembed_texts(texts=embed_request.texts,
+                                                             document_type=embed_request.document_type)
+
+    if not embeddings:
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"embeddings": None}
+        )
+
+    return {"embeddings": embeddings}
@@ -9,6 +9,8 @@ class Settings(BaseSettings):
     FILE_ALLOWED_TYPES: list
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
+    FILE_SEGMENT_SIZE: int = 512000
+    FILE_PROCESSING_BATCH_SIZE: int = 100
 
     MONGODB_URL: str
     MONGODB_DATABASE: str
@@ -25,13 +27,89 @@ class Settings(BaseSettings):
     GENERATION_MODEL_ID: str = None
     EMBEDDING_MODEL_ID: str = None
     EMBEDDING_MODEL_SIZE: int = None
+    EMBEDDING_MODEL_MAX_TOKENS: int = 256
+
+    ONNX_MODEL_DIR: str = "onnx_models"
+    ONNX_QUANTIZE: bool = False
+    ONNX_INTRA_OP_THREADS: int = 0
+    ONNX_BATCH_SIZE: int = 32
     INPUT_DAFAULT_MAX_CHARACTERS: int = None
     GENERATION_DAFAULT_MAX_TOKENS: int = None
     GENERATION_DAFAULT_TEMPERATURE: float = None
 
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_TIMEOUT: float = 60.0
+    LLM_REQUEST_DEADLINE: float = 120.0
+    LLM_MAX_RETRIES: int = 3
+    LLM_RETRY_BACKOFF_BASE: float = 0.5
+    LLM_RETRY_BACKOFF_MAX: float = 20.0
+    LLM_RATE_LIMITS: dict = {}
+
+    EMBEDDING_MICRO_BATCH_ENABLED: bool = True
+    EMBEDDING_MICRO_BATCH_MAX_WAIT_MS: float = 5.0
+    EMBEDDING_MICRO_BATCH_MAX_SIZE: int = 32
+
+    EMBEDDING_SIDECAR_BACKEND: str = "HUGGINGFACE"
+    EMBEDDING_SIDECAR_SOCKET: str = "/tmp/hr-toolkit-embeddings.sock"
+    EMBEDDING_SIDECAR_TIMEOUT: float = 30.0
+    EMBEDDING_SIDECAR_READY_TIMEOUT: float = 300.0
+    EMBEDDING_SIDECAR_MAX_CONNECTIONS: int = 20
+
     VECTOR_DB_BACKEND : str
     VECTOR_DB_PATH : str
     VECTOR_DB_DISTANCE_METHOD: str = None
+    VECTOR_DB_URL: str = None
+
+    RAG_CONTEXT_MAX_TOKENS: int = 3000
+    RAG_ANSWER_MAX_TOKENS: int = 500
+    RAG_ANSWER_TEMPERATURE: float = 0.3
+    RAG_RETRIEVAL_DEPTH_FACTOR: int = 3
+    RAG_RETRIEVAL_MAX_CANDIDATES: int = 50
+    RAG_RERANK_LENGTH_BONUS: float = 0.1
+    RAG_RERANK_COMPLETENESS_BONUS: float = 0.05
+
+    SEMANTIC_CHUNK_BREAKPOINT_PERCENTILE: int = 90
+    SEMANTIC_CHUNK_EMBEDDING_BATCH_SIZE: int = 64
+
+    HR_EMAIL_BATCH_MAX_CONCURRENCY: int = 8
+
+    GENERATION_CACHE_ENABLED: bool = True
+    GENERATION_CACHE_DIR: str = "generations"
+    GENERATION_CACHE_TTL_SECONDS: int = 86400
+    GENERATION_CACHE_MAX_SIZE_MB: int = 256
+
+    WEB_SCRAPER_TIMEOUT: float = 10.0
+    WEB_SCRAPER_MAX_CONNECTIONS: int = 20
+    WEB_SCRAPER_MAX_CONCURRENCY: int = 5
+    WEB_SCRAPER_MAX_DEPTH: int = 2
+    WEB_SCRAPER_MAX_PAGES: int = 10
+    WEB_SCRAPER_USER_AGENT: str = "HR-Toolkit/1.0"
+    WEB_SCRAPER_CACHE_DIR: str = "web_pages"
+    WEB_SCRAPER_CACHE_MAX_SIZE_MB: int = 128
+    WEB_SCRAPER_CACHE_TTL_SECONDS: int = 604800
+    WEB_SCRAPER_CACHE_ENABLED: bool = True
+
+    WEB_SUMMARY_SECTION_TOKENS: int = 1500
+    WEB_SUMMARY_SECTION_OVERLAP_TOKENS: int = 50
+    WEB_SUMMARY_SECTION_MAX_OUTPUT_TOKENS: int = 400
+    WEB_SUMMARY_MAP_CONCURRENCY: int = 4
+
+    TRACING_ENABLED: bool = False
+    TRACING_EXPORTER: str = "file"
+    TRACING_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"
+    TRACING_FILE_PATH: str = "traces/spans.jsonl"
+    TRACING_SAMPLE_RATIO: float = 1.0
+
+    PROFILING_ENABLED: bool = False
+    PROFILING_ADMIN_TOKEN: str = None
+    PROFILING_MAX_SECONDS: float = 60.0
+    PROFILING_SAMPLE_INTERVAL_MS: float = 5.0
+    PROFILING_SLOW_REQUEST_MS: float = 0.0
+    PROFILING_OUTPUT_DIR: str = "profiles"
+
+    STARTUP_WAIT_FOR_READY: bool = False
+    READINESS_WAIT_TIMEOUT_SECONDS: float = 30.0
 
     PRIMARY_LANG: str = "en"
     DEFAULT_LANG: str = "en"
@@ -0,0 +1,88 @@
+from prometheus_client import (CollectorRegistry, Counter, Histogram, REGISTRY,
+                               CONTENT_TYPE_LATEST, generate_latest, multiprocess)
+from helpers.tracing import start_span
+from contextlib import contextmanager
+import os
+import time
+
+# seconds, from a cache lookup to a long generation
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+PIPELINE_STAGE_SECONDS = Histogram(
+    "hr_toolkit_pipeline_stage_seconds", "Latency of one stage of a pipeline (rag, index, process)",
+    ["pipeline", "stage"], buckets=LATENCY_BUCKETS,
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "hr_toolkit_llm_request_seconds", "Latency of LLM provider calls, rate limiter queueing excluded",
+    ["provider", "operation"], buckets=LATENCY_BUCKETS,
+)
+LLM_ERRORS = Counter(
+    "hr_toolkit_llm_errors_total", "LLM provider calls that raised or returned no result",
+    ["provider", "operation"],
+)
+LLM_TOKENS = Counter(
+    "hr_toolkit_llm_tokens_total", "Tokens reported by LLM providers (prompt, completion, cached)",
+    ["provider", "kind"],
+)
+CACHE_REQUESTS = Counter(
+    "hr_toolkit_cache_requests_total", "Cache lookups by outcome",
+    ["cache", "status"],
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    "hr_toolkit_http_request_seconds", "Latency of API requests until the response starts",
+    ["method", "route", "status_code"], buckets=LATENCY_BUCKETS,
+)
+
+
+@contextmanager
+def track_time(histogram: Histogram, errors: Counter=None, **labels):
+    """Observe the duration of the block in histogram, count it in errors if it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        if errors is not None:
+            errors.labels(**labels).inc()
+        raise
+    finally:
+        histogram.labels(**labels).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def track_stage(pipeline: str, stage: str):
+    """Time the block as a pipeline stage, in a "<pipeline>.<stage>" span when tracing is enabled"""
+    with start_span(f"{pipeline}.{stage}"), track_time(PIPELINE_STAGE_SECONDS, pipeline=pipeline, stage=stage):
+        yield
+
+
+def record_token_usage(provider: str, usage: dict):
+    for kind in ("prompt_tokens", "completion_tokens", "cached_tokens"):
+        if usage and usage.get(kind):
+            LLM_TOKENS.labels(provider=provider, kind=kind[:-len("_tokens")]).inc(usage[kind])
+
+
+async def track_request_latency(request, call_next):
+    """HTTP middleware observing every request under its route template"""
+    started = time.perf_counter()
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.labels(
+            method=request.method,
+            route=route.path if route else "unmatched",
+            status_code=status_code,
+        ).observe(time.perf_counter() - started)
+
+
+def get_metrics_payload():
+    """Exposition of all metrics, aggregated over workers in prometheus_client multiprocess mode"""
+    registry = REGISTRY
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,216 @@
+from collections import Counter
+from fastapi import HTTPException, Request, status
+from helpers.config import get_settings
+from models import ResponseSignal
+import cProfile
+import io
+import logging
+import os
+import pstats
+import re
+import secrets
+import sys
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger('uvicorn.error')
+
+
+async def require_admin(request: Request):
+    """Route dependency accepting only requests with the PROFILING_ADMIN_TOKEN in X-Admin-Token"""
+    admin_token = get_settings().PROFILING_ADMIN_TOKEN
+    token = request.headers.get("X-Admin-Token", "")
+
+    if not admin_token or not secrets.compare_digest(token.encode(), admin_token.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={"signal": ResponseSignal.ADMIN_TOKEN_INVALID.value},
+        )
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler over all threads of the process
+
+    A background thread records the stack of every other thread each
+    interval seconds (sys._current_frames), so it also sees a worker whose
+    event loop is busy in CPU-bound code. Identical stacks are counted once
+    with their number of samples and the wall time they cover, which is
+    longer than interval while a busy thread holds the GIL.
+    """
+
+    def __init__(self, interval: float=0.005):
+        self.interval = interval
+        self.samples = Counter()
+        self.weights = Counter()
+        self.sample_count = 0
+        self.started_at = None
+        self.duration = 0.0
+
+        self.thread = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name="sampling-profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        self.thread.join()
+        self.duration = time.perf_counter() - self.started_at
+
+    def run(self):
+        own_id = threading.get_ident()
+        sampled_at = time.perf_counter()
+        while not self.stop_event.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, sampled_at = now - sampled_at, now
+
+            thread_names = { thread.ident: thread.name for thread in threading.enumerate() }
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                    frame = frame.f_back
+
+                # root first, under the thread name
+                stack.append((thread_names.get(thread_id, str(thread_id)), "", 0))
+                stack = tuple(reversed(stack))
+                self.samples[stack] += 1
+                self.weights[stack] += elapsed
+            self.sample_count += 1
+
+    @staticmethod
+    def frame_name(frame: tuple):
+        name, file_name, line = frame
+        return f"{name} ({os.path.basename(file_name)}:{line})" if file_name else name
+
+    def to_collapsed(self) -> str:
+        """Folded stacks, one "frame;frame;... count" line per stack (flamegraph.pl, speedscope)"""
+        return "\n".join(
+            ";".join(self.frame_name(frame) for frame in stack) + f" {count}"
+            for stack, count in self.samples.most_common()
+        ) + "\n"
+
+    def to_speedscope(self, name: str) -> dict:
+        """Speedscope file with one sampled profile per thread, weights in seconds"""
+        frames, frame_index = [], {}
+        profiles = {}
+
+        for stack, weight in self.weights.items():
+            indices = []
+            for frame in stack[1:]:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+                indices.append(frame_index[frame])
+
+            profile = profiles.setdefault(stack[0][0], {"samples": [], "weights": []})
+            profile["samples"].append(indices)
+            profile["weights"].append(weight)
+
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": name,
+            "exporter": "hr-toolkit",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread_name,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(profile["weights"]),
+                    **profile,
+                }
+                for thread_name, profile in profiles.items()
+            ],
+        }
+
+
+def get_tracemalloc_snapshot(previous: tracemalloc.Snapshot=None, group_by: str="lineno", limit: int=20):
+    """
+    Top allocations of a new tracemalloc snapshot, and the growth since previous
+
+    Returns:
+        The snapshot (to compare the next one against) and its summary
+    """
+    snapshot = tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ])
+
+    def describe(stat):
+        return {
+            "location": [ f"{frame.filename}:{frame.lineno}" for frame in stat.traceback ],
+            "size_kb": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+
+    current, peak = tracemalloc.get_traced_memory()
+    summary = {
+        "traced_mb": round(current / 2**20, 2),
+        "peak_mb": round(peak / 2**20, 2),
+        "top": [ describe(stat) for stat in snapshot.statistics(group_by)[:limit] ],
+        "growth": None,
+    }
+
+    if previous is not None:
+        summary["growth"] = [
+            {**describe(stat), "size_diff_kb": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff}
+            for stat in snapshot.compare_to(previous, group_by)[:limit]
+        ]
+
+    return snapshot, summary
+
+
+def profile_slow_requests(threshold_ms: float, output_dir: str, top: int=30):
+    """
+    HTTP middleware running requests under cProfile and keeping the slow ones
+
+    A request slower than threshold_ms has its profile logged (top functions
+    by cumulative time) and dumped as a .prof file in output_dir. cProfile
+    follows the event loop thread, so the profile also contains whatever
+    other requests ran meanwhile; only one request is profiled at a time.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    profiling = False
+
+    async def middleware(request, call_next):
+        nonlocal profiling
+        if profiling:
+            return await call_next(request)
+
+        profiling = True
+        profiler = cProfile.Profile()
+        started = time.perf_counter()
+        try:
+            profiler.enable()
+            try:
+                response = await call_next(request)
+            finally:
+                profiler.disable()
+        finally:
+            profiling = False
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= threshold_ms:
+            route = request.scope.get("route")
+            route_name = re.sub(r"\W+", "_", route.path if route else request.url.path).strip("_") or "root"
+            file_path = os.path.join(output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}_{request.method}_{route_name}.prof")
+            profiler.dump_stats(file_path)
+
+            stream = io.StringIO()
+            pstats.Stats(profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+            logger.warning(f"Slow request {request.method} {request.url.path} took {elapsed_ms:.0f}ms, "
+                           f"profile saved to {file_path}\n{stream.getvalue()}")
+
+        return response
+
+    return middleware
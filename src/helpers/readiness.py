@@ -0,0 +1,87 @@
+from fastapi import HTTPException, Request, status
+from helpers.config import get_settings
+from models import ResponseSignal
+import asyncio
+import logging
+import time
+
+class ReadinessTracker:
+    """
+    Startup state of the components initialized in the background
+
+    Each component (database connection, vector store, embedding model) is
+    registered as pending at startup and marked ready or failed when its
+    initialization finishes, so the app can serve requests that do not need
+    it in the meantime.
+    """
+
+    PENDING = "pending"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, components: list):
+        self.started_at = time.perf_counter()
+        self.components = {
+            name: {"status": self.PENDING, "error": None, "duration_ms": None}
+            for name in components
+        }
+        self.events = { name: asyncio.Event() for name in components }
+        self.logger = logging.getLogger('uvicorn.error')
+
+    async def run(self, name: str, initialize):
+        """Await the initialize awaitable and record the outcome for name"""
+        started = time.perf_counter()
+        try:
+            await initialize
+            self.components[name]["status"] = self.READY
+            self.logger.info(f"{name} ready in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            self.components[name]["status"] = self.FAILED
+            self.components[name]["error"] = str(e)
+            self.logger.error(f"{name} failed to initialize: {e}")
+        finally:
+            self.components[name]["duration_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            self.events[name].set()
+
+    def is_ready(self, names: list=None) -> bool:
+        names = names if names is not None else self.components.keys()
+        return all(self.components[name]["status"] == self.READY for name in names)
+
+    def has_failed(self) -> bool:
+        return any(component["status"] == self.FAILED for component in self.components.values())
+
+    async def wait(self, names: list=None, timeout: float=None) -> bool:
+        """Wait until names are initialized (or timeout), return whether all of them are ready"""
+        names = names if names is not None else list(self.components.keys())
+        try:
+            await asyncio.wait_for(
+                asyncio.gather(*[ self.events[name].wait() for name in names ]),
+                timeout=timeout,
+            )
+        except asyncio.TimeoutError:
+            pass
+        return self.is_ready(names)
+
+    def get_status(self):
+        return {
+            "ready": self.is_ready(),
+            "uptime_seconds": round(time.perf_counter() - self.started_at, 2),
+            "components": self.components,
+        }
+
+
+def require_ready(*components: str):
+    """Route dependency answering 503 until components are ready (waiting up to READINESS_WAIT_TIMEOUT_SECONDS)"""
+
+    async def dependency(request: Request):
+        readiness = request.app.readiness
+        if not await readiness.wait(list(components), timeout=get_settings().READINESS_WAIT_TIMEOUT_SECONDS):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "signal": ResponseSignal.SERVICE_NOT_READY.value,
+                    "components": { name: readiness.components[name]["status"] for name in components },
+                },
+            )
+
+    return dependency
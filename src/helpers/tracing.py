@@ -0,0 +1,155 @@
+from contextlib import contextmanager
+import asyncio
+import functools
+import inspect
+import logging
+import os
+
+logger = logging.getLogger('uvicorn.error')
+
+# set by setup_tracing; while None every helper below is a no-op
+tracer = None
+tracer_provider = None
+
+
+def setup_tracing(settings, assets_dir: str):
+    """
+    Configure OpenTelemetry tracing when TRACING_ENABLED
+
+    Spans are exported in batches to an OTLP/HTTP collector (TRACING_EXPORTER="otlp")
+    or appended as JSON lines to a local file under assets (TRACING_EXPORTER="file").
+    The opentelemetry packages are optional and only imported here.
+    """
+    global tracer, tracer_provider
+
+    if not settings.TRACING_ENABLED:
+        return
+
+    try:
+        from opentelemetry import trace
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
+        from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    except ImportError:
+        logger.warning("TRACING_ENABLED is set but opentelemetry-sdk is not installed, tracing disabled")
+        return
+
+    if settings.TRACING_EXPORTER == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        exporter = OTLPSpanExporter(endpoint=settings.TRACING_OTLP_ENDPOINT)
+    else:
+        file_path = os.path.join(assets_dir, settings.TRACING_FILE_PATH)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        exporter = ConsoleSpanExporter(
+            out=open(file_path, "a", encoding="utf-8"),
+            formatter=lambda span: span.to_json(indent=None) + "\n",
+        )
+
+    tracer_provider = TracerProvider(
+        resource=Resource.create({"service.name": settings.APP_NAME, "service.version": settings.APP_VERSION}),
+        sampler=ParentBased(TraceIdRatioBased(settings.TRACING_SAMPLE_RATIO)),
+    )
+    tracer_provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(tracer_provider)
+
+    tracer = trace.get_tracer("hr-toolkit")
+    logger.info(f"Tracing enabled, exporting to {settings.TRACING_EXPORTER}")
+
+
+def shutdown_tracing():
+    # flushes the spans still queued in the batch processor
+    if tracer_provider is not None:
+        tracer_provider.shutdown()
+
+
+def clean_attributes(attributes: dict) -> dict:
+    # span attributes must be primitives, None values are dropped
+    return { key: value for key, value in attributes.items() if value is not None }
+
+
+@contextmanager
+def start_span(name: str, **attributes):
+    """Run the block in a child span of the current one, yields None when tracing is off"""
+    if tracer is None:
+        yield None
+        return
+
+    with tracer.start_as_current_span(name, attributes=clean_attributes(attributes)) as span:
+        yield span
+
+
+def set_span_attributes(span, **attributes):
+    if span is not None:
+        span.set_attributes(clean_attributes(attributes))
+
+
+def traced(name: str, attributes=None, result_attributes=None):
+    """
+    Decorate a sync or async function to run in a span named name
+
+    attributes receives the call arguments by name, result_attributes the
+    return value; both return a dict of span attributes.
+    """
+
+    def decorator(function):
+        signature = inspect.signature(function)
+
+        def get_call_attributes(args, kwargs):
+            if attributes is None:
+                return {}
+            call = signature.bind(*args, **kwargs)
+            call.apply_defaults()
+            return attributes(call.arguments)
+
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                if tracer is None:
+                    return await function(*args, **kwargs)
+
+                with start_span(name, **get_call_attributes(args, kwargs)) as span:
+                    result = await function(*args, **kwargs)
+                    if result_attributes is not None:
+                        set_span_attributes(span, **result_attributes(result))
+                    return result
+
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if tracer is None:
+                return function(*args, **kwargs)
+
+            with start_span(name, **get_call_attributes(args, kwargs)) as span:
+                result = function(*args, **kwargs)
+                if result_attributes is not None:
+                    set_span_attributes(span, **result_attributes(result))
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+async def trace_request(request, call_next):
+    """HTTP middleware opening one server span per request, continuing an incoming traceparent"""
+    if tracer is None:
+        return await call_next(request)
+
+    from opentelemetry import propagate
+    from opentelemetry.trace import SpanKind
+
+    with tracer.start_as_current_span(f"{request.method} {request.url.path}", kind=SpanKind.SERVER,
+                                      context=propagate.extract(dict(request.headers)),
+                                      attributes={"http.method": request.method,
+                                                  "http.target": request.url.path}) as span:
+        response = await call_next(request)
+
+        # the route template is known once routing is done, it keeps span names low-cardinality
+        route = request.scope.get("route")
+        if route:
+            span.update_name(f"{request.method} {route.path}")
+            span.set_attribute("http.route", route.path)
+        span.set_attribute("http.status_code", response.status_code)
+        return response
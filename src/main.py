@@ -1,11 +1,21 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from routes import base, data, nlp, web_scraping, hr_email  # Add hr_email import
+from routes import base, data, nlp, web_scraping, hr_email, metrics, profiling, admin  # Add hr_email import
 from motor.motor_asyncio import AsyncIOMotorClient
 from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.GenerationCache import GenerationCache
+from stores.llm.HTTPClientPool import HTTPClientPool
+from stores.scraping.WebScraper import WebScraper
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
+from controllers.BaseController import BaseController
+from helpers.readiness import ReadinessTracker
+from helpers.metrics import track_request_latency
+from helpers.tracing import setup_tracing, shutdown_tracing, trace_request
+from helpers.profiling import profile_slow_requests
+import asyncio
+import os
 
 app = FastAPI()
 
@@ -18,44 +28,116 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# per-route latency histograms for /metrics
+app.middleware("http")(track_request_latency)
+
+# one server span per request when TRACING_ENABLED, configured before the first request
+setup_tracing(get_settings(), assets_dir=os.path.join(BaseController().base_dir, "assets"))
+app.middleware("http")(trace_request)
+
+# admin-only live diagnosis: sampling profiler, tracemalloc snapshots, cProfile of slow requests
+if get_settings().PROFILING_ENABLED:
+    app.sampling_profiler = None
+    app.tracemalloc_snapshot = None
+    app.include_router(profiling.profiling_router)
+
+    if get_settings().PROFILING_SLOW_REQUEST_MS > 0:
+        app.middleware("http")(profile_slow_requests(
+            threshold_ms=get_settings().PROFILING_SLOW_REQUEST_MS,
+            output_dir=os.path.join(BaseController().base_dir, "assets", get_settings().PROFILING_OUTPUT_DIR),
+        ))
+
 async def startup_span():
     settings = get_settings()
     app.mongo_conn = AsyncIOMotorClient(settings.MONGODB_URL)
     app.db_client = app.mongo_conn[settings.MONGODB_DATABASE]
 
-    llm_provider_factory = LLMProviderFactory(settings)
+    app.llm_provider_factory = LLMProviderFactory(settings)
     vectordb_provider_factory = VectorDBProviderFactory(settings)
 
     # generation client
-    app.generation_client = llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
+    app.generation_client = app.llm_provider_factory.create(provider=settings.GENERATION_BACKEND)
     app.generation_client.set_generation_model(model_id = settings.GENERATION_MODEL_ID)
 
-    # embedding client
-    app.embedding_client = llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
-    app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
-                                             embedding_size=settings.EMBEDDING_MODEL_SIZE)
-    
-    # vector db client
-    app.vectordb_client = vectordb_provider_factory.create(
-        provider=settings.VECTOR_DB_BACKEND
+    # embedding client, its model is loaded in the background below
+    app.embedding_client = app.llm_provider_factory.create(provider=settings.EMBEDDING_BACKEND)
+
+    # generation cache shared by the HR email and website summary routes
+    app.generation_cache = GenerationCache(
+        cache_dir=BaseController().get_cache_path(cache_name=settings.GENERATION_CACHE_DIR),
+        max_size_bytes=settings.GENERATION_CACHE_MAX_SIZE_MB * 1024 * 1024,
+        default_ttl=settings.GENERATION_CACHE_TTL_SECONDS,
+        enabled=settings.GENERATION_CACHE_ENABLED,
+    )
+
+    # web scraper with its own connection pool and conditional-request cache
+    app.web_scraper = WebScraper(
+        http_pool=HTTPClientPool(
+            max_connections=settings.WEB_SCRAPER_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.WEB_SCRAPER_MAX_CONNECTIONS,
+            timeout=settings.WEB_SCRAPER_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": settings.WEB_SCRAPER_USER_AGENT},
+        ),
+        response_cache=GenerationCache(
+            cache_dir=BaseController().get_cache_path(cache_name=settings.WEB_SCRAPER_CACHE_DIR),
+            max_size_bytes=settings.WEB_SCRAPER_CACHE_MAX_SIZE_MB * 1024 * 1024,
+            default_ttl=settings.WEB_SCRAPER_CACHE_TTL_SECONDS,
+            enabled=settings.WEB_SCRAPER_CACHE_ENABLED,
+            name="web_pages",
+        ),
+        max_concurrency=settings.WEB_SCRAPER_MAX_CONCURRENCY,
     )
-    app.vectordb_client.connect()
 
     app.template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
         default_language=settings.DEFAULT_LANG,
     )
 
+    # slow components initialize concurrently while the app already serves
+    # the routes that do not need them (see /health/ready)
+    app.vectordb_client = None
+
+    def connect_vectordb():
+        vectordb_client = vectordb_provider_factory.create(
+            provider=settings.VECTOR_DB_BACKEND
+        )
+        vectordb_client.connect()
+        app.vectordb_client = vectordb_client
+
+    def load_embedding_model():
+        app.embedding_client.set_embedding_model(model_id=settings.EMBEDDING_MODEL_ID,
+                                                 embedding_size=settings.EMBEDDING_MODEL_SIZE)
+
+    app.readiness = ReadinessTracker(components=["mongodb", "vector_db", "embedding_model"])
+    app.startup_task = asyncio.gather(
+        app.readiness.run("mongodb", app.mongo_conn.admin.command("ping")),
+        app.readiness.run("vector_db", asyncio.to_thread(connect_vectordb)),
+        app.readiness.run("embedding_model", asyncio.to_thread(load_embedding_model)),
+        # loads (and on first use downloads) the generation tokenizer off the event loop
+        asyncio.to_thread(app.generation_client.count_tokens, ""),
+    )
+
+    if settings.STARTUP_WAIT_FOR_READY:
+        await app.startup_task
+
 
 async def shutdown_span():
+    app.startup_task.cancel()
     app.mongo_conn.close()
-    app.vectordb_client.disconnect()
+    if app.vectordb_client:
+        app.vectordb_client.disconnect()
+    await app.llm_provider_factory.close()
+    await app.web_scraper.close()
+    shutdown_tracing()
 
 app.on_event("startup")(startup_span)
 app.on_event("shutdown")(shutdown_span)
 
 app.include_router(base.base_router)
+app.include_router(metrics.metrics_router)
 app.include_router(data.data_router)
 app.include_router(nlp.nlp_router)
 app.include_router(web_scraping.web_scraping_router)  # Add web scraping router
-app.include_router(hr_email.hr_email_router)  # Add HR email router
\ No newline at end of file
+app.include_router(hr_email.hr_email_router)  # Add HR email router
+app.include_router(admin.admin_router)
\ No newline at end of file
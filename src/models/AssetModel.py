@@ -1,7 +1,8 @@
-from .BaseDataModel import BaseDataModel
+from .BaseDataModel import BaseDataModel, query_attributes, count_attributes
 from .db_schemes import Asset
 from .enums.DataBaseEnum import DataBaseEnum
 from bson import ObjectId
+from helpers.tracing import traced
 
 class AssetModel(BaseDataModel):
 
@@ -15,18 +16,11 @@ class AssetModel(BaseDataModel):
         await instance.init_collection()
         return instance
 
+    @traced("mongodb.assets.init_collection", attributes=query_attributes)
     async def init_collection(self):
-        all_collections = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_ASSET_NAME.value not in all_collections:
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_ASSET_NAME.value]
-            indexes = Asset.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"]
-                )
+        await self.ensure_indexes(Asset.get_indexes())
 
+    @traced("mongodb.assets.create_asset", attributes=query_attributes)
     async def create_asset(self, asset: Asset):
 
         result = await self.collection.insert_one(asset.dict(by_alias=True, exclude_unset=True))
@@ -34,6 +28,8 @@ class AssetModel(BaseDataModel):
 
         return asset
 
+    @traced("mongodb.assets.get_all_project_assets", attributes=query_attributes,
+            result_attributes=count_attributes)
     async def get_all_project_assets(self, asset_project_id: str, asset_type: str):
 
         records = await self.collection.find({
@@ -46,6 +42,8 @@ class AssetModel(BaseDataModel):
             for record in records
         ]
 
+    @traced("mongodb.assets.get_asset_record", attributes=query_attributes,
+            result_attributes=count_attributes)
     async def get_asset_record(self, asset_project_id: str, asset_name: str):
 
         record = await self.collection.find_one({
@@ -58,5 +56,23 @@ class AssetModel(BaseDataModel):
         
         return None
 
+    @traced("mongodb.assets.update_asset_config", attributes=query_attributes)
+    async def update_asset_config(self, asset_id: ObjectId, asset_config: dict):
 
-    
+        result = await self.collection.update_one(
+            {"_id": asset_id},
+            {"$set": {"asset_config": asset_config}}
+        )
+
+        return result.modified_count
+
+    @traced("mongodb.assets.clear_processing_state", attributes=query_attributes)
+    async def clear_processing_state(self, asset_project_id: str):
+        """Forget the processing fingerprint of every asset of a project, so all are re-chunked"""
+
+        result = await self.collection.update_many(
+            {"asset_project_id": ObjectId(asset_project_id) if isinstance(asset_project_id, str) else asset_project_id},
+            {"$unset": {"asset_config.processing": ""}}
+        )
+
+        return result.modified_count
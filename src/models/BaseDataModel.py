@@ -1,7 +1,38 @@
 from helpers.config import get_settings, Settings
 
+
+def query_attributes(call: dict) -> dict:
+    """Span attributes of a model query (see helpers.tracing.traced)"""
+    return {"db.system": "mongodb", "db.collection": call["self"].collection.name}
+
+
+def count_attributes(result) -> dict:
+    return {"db.result_count": len(result) if isinstance(result, list) else int(result is not None)}
+
 class BaseDataModel:
 
+    # (database, collection) pairs whose indexes were ensured by this process
+    ensured_indexes = set()
+
     def __init__(self, db_client: object):
         self.db_client = db_client
         self.app_settings = get_settings()
+
+    async def ensure_indexes(self, indexes: list):
+        """
+        Create the collection's indexes, once per process
+
+        create_index is a no-op for an existing index, so indexes added to a
+        schema are also built on collections created by an older version.
+        """
+        key = (self.db_client.name, self.collection.name)
+        if key in BaseDataModel.ensured_indexes:
+            return
+
+        for index in indexes:
+            await self.collection.create_index(
+                index["key"],
+                name=index["name"],
+                unique=index["unique"]
+            )
+        BaseDataModel.ensured_indexes.add(key)
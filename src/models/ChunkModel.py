@@ -1,8 +1,9 @@
-from .BaseDataModel import BaseDataModel
+from .BaseDataModel import BaseDataModel, query_attributes, count_attributes
 from .db_schemes import DataChunk
 from .enums.DataBaseEnum import DataBaseEnum
 from bson.objectid import ObjectId
 from pymongo import InsertOne
+from helpers.tracing import traced
 
 class ChunkModel(BaseDataModel):
 
@@ -16,23 +17,18 @@ class ChunkModel(BaseDataModel):
         await instance.init_collection()
         return instance
 
+    @traced("mongodb.chunks.init_collection", attributes=query_attributes)
     async def init_collection(self):
-        all_collections = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_CHUNK_NAME.value not in all_collections:
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_CHUNK_NAME.value]
-            indexes = DataChunk.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"]
-                )
+        await self.ensure_indexes(DataChunk.get_indexes())
 
+    @traced("mongodb.chunks.create_chunk", attributes=query_attributes)
     async def create_chunk(self, chunk: DataChunk):
         result = await self.collection.insert_one(chunk.dict(by_alias=True, exclude_unset=True))
         chunk._id = result.inserted_id
         return chunk
 
+    @traced("mongodb.chunks.get_chunk", attributes=query_attributes,
+            result_attributes=count_attributes)
     async def get_chunk(self, chunk_id: str):
         result = await self.collection.find_one({
             "_id": ObjectId(chunk_id)
@@ -43,6 +39,9 @@ class ChunkModel(BaseDataModel):
         
         return DataChunk(**result)
 
+    @traced("mongodb.chunks.insert_many_chunks", attributes=lambda call: {
+        **query_attributes(call), "db.chunk_count": len(call["chunks"]), "db.batch_size": call["batch_size"]
+    })
     async def insert_many_chunks(self, chunks: list, batch_size: int=100):
 
         for i in range(0, len(chunks), batch_size):
@@ -57,13 +56,43 @@ class ChunkModel(BaseDataModel):
         
         return len(chunks)
 
+    @traced("mongodb.chunks.delete_chunks_by_project_id", attributes=query_attributes,
+            result_attributes=lambda deleted: {"db.deleted_count": deleted})
     async def delete_chunks_by_project_id(self, project_id: ObjectId):
         result = await self.collection.delete_many({
             "chunk_project_id": project_id
         })
 
         return result.deleted_count
+
+    @traced("mongodb.chunks.delete_chunks_by_asset_id", attributes=query_attributes,
+            result_attributes=lambda deleted: {"db.deleted_count": deleted})
+    async def delete_chunks_by_asset_id(self, asset_id: ObjectId, except_fingerprint: str=None):
+        """Delete an asset's chunks, keeping the ones written with except_fingerprint"""
+        query = {
+            "chunk_asset_id": asset_id
+        }
+        if except_fingerprint:
+            query["chunk_fingerprint"] = {"$ne": except_fingerprint}
+
+        result = await self.collection.delete_many(query)
+
+        return result.deleted_count
+
+    @traced("mongodb.chunks.delete_chunks_by_fingerprint", attributes=query_attributes,
+            result_attributes=lambda deleted: {"db.deleted_count": deleted})
+    async def delete_chunks_by_fingerprint(self, asset_id: ObjectId, fingerprint: str):
+        result = await self.collection.delete_many({
+            "chunk_asset_id": asset_id,
+            "chunk_fingerprint": fingerprint,
+        })
+
+        return result.deleted_count
     
+    @traced("mongodb.chunks.get_poject_chunks", attributes=lambda call: {
+        **query_attributes(call), "db.page_no": call["page_no"], "db.page_size": call["page_size"]
+    },
+            result_attributes=count_attributes)
     async def get_poject_chunks(self, project_id: ObjectId, page_no: int=1, page_size: int=50):
         records = await self.collection.find({
                     "chunk_project_id": project_id
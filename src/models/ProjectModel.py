@@ -1,6 +1,7 @@
-from .BaseDataModel import BaseDataModel
+from .BaseDataModel import BaseDataModel, query_attributes
 from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
+from helpers.tracing import traced
 
 class ProjectModel(BaseDataModel):
 
@@ -14,19 +15,12 @@ class ProjectModel(BaseDataModel):
         await instance.init_collection()
         return instance
 
+    @traced("mongodb.projects.init_collection", attributes=query_attributes)
     async def init_collection(self):
-        all_collections = await self.db_client.list_collection_names()
-        if DataBaseEnum.COLLECTION_PROJECT_NAME.value not in all_collections:
-            self.collection = self.db_client[DataBaseEnum.COLLECTION_PROJECT_NAME.value]
-            indexes = Project.get_indexes()
-            for index in indexes:
-                await self.collection.create_index(
-                    index["key"],
-                    name=index["name"],
-                    unique=index["unique"]
-                )
+        await self.ensure_indexes(Project.get_indexes())
 
 
+    @traced("mongodb.projects.create_project", attributes=query_attributes)
     async def create_project(self, project: Project):
 
         result = await self.collection.insert_one(project.dict(by_alias=True, exclude_unset=True))
@@ -34,6 +28,7 @@ class ProjectModel(BaseDataModel):
 
         return project
 
+    @traced("mongodb.projects.get_project_or_create_one", attributes=query_attributes)
     async def get_project_or_create_one(self, project_id: str):
 
         record = await self.collection.find_one({
@@ -49,6 +44,10 @@ class ProjectModel(BaseDataModel):
         
         return Project(**record)
 
+    @traced("mongodb.projects.get_all_projects", attributes=lambda call: {
+        **query_attributes(call), "db.page_no": call["page"], "db.page_size": call["page_size"]
+    },
+            result_attributes=lambda result: {"db.result_count": len(result[0])})
     async def get_all_projects(self, page: int=1, page_size: int=10):
 
         # count total number of documents
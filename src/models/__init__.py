@@ -1,2 +1,4 @@
 from .enums.ResponseEnums import ResponseSignal
 from .enums.ProcessingEnum import ProcessingEnum
+from .enums.ChunkingMethodEnum import ChunkingMethodEnum
+from .enums.EmailGenerationModeEnum import EmailGenerationModeEnum
@@ -9,6 +9,7 @@ class DataChunk(BaseModel):
     chunk_order: int = Field(..., gt=0)
     chunk_project_id: ObjectId
     chunk_asset_id: ObjectId
+    chunk_fingerprint: Optional[str] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -22,9 +23,17 @@ class DataChunk(BaseModel):
                 ],
                 "name": "chunk_project_id_index_1",
                 "unique": False
+            },
+            {
+                "key": [
+                    ("chunk_asset_id", 1)
+                ],
+                "name": "chunk_asset_id_index_1",
+                "unique": False
             }
         ]
     
 class RetrievedDocument(BaseModel):
     text: str
     score: float
+    metadata: Optional[dict] = None
@@ -0,0 +1,7 @@
+from enum import Enum
+
+class ChunkingMethodEnum(Enum):
+
+    CHARACTER = "character"
+    TOKEN = "token"
+    SEMANTIC = "semantic"
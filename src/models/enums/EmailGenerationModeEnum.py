@@ -0,0 +1,7 @@
+from enum import Enum
+
+class EmailGenerationModeEnum(Enum):
+
+    AUTO = "auto"
+    TEMPLATE = "template"
+    LLM = "llm"
@@ -4,4 +4,9 @@ class ProcessingEnum(Enum):
 
     TXT = ".txt"
     PDF = ".pdf"
-    MD = ".md"
\ No newline at end of file
+    MD = ".md"
+    DOCX = ".docx"
+    HTML = ".html"
+    HTM = ".htm"
+    CSV = ".csv"
+    XLSX = ".xlsx"
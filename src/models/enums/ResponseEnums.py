@@ -9,6 +9,7 @@ class ResponseSignal(Enum):
     FILE_UPLOAD_FAILED = "file_upload_failed"
     PROCESSING_SUCCESS = "processing_success"
     PROCESSING_FAILED = "processing_failed"
+    CHUNKING_METHOD_NOT_SUPPORTED = "chunking_method_not_supported"
     NO_FILES_ERROR = "not_found_files"
     FILE_ID_ERROR = "no_file_found_with_this_id"
     PROJECT_NOT_FOUND_ERROR = "project_not_found"
@@ -23,4 +24,9 @@ class ResponseSignal(Enum):
     WEB_SUMMARY_ERROR = "web_summary_error"
     HR_EMAIL_SUCCESS = "hr_email_success"
     HR_EMAIL_ERROR = "hr_email_error"
+    SERVICE_NOT_READY = "service_not_ready"
+    ADMIN_TOKEN_INVALID = "admin_token_invalid"
+    PROFILER_BUSY = "profiler_busy"
+    TRACEMALLOC_NOT_STARTED = "tracemalloc_not_started"
+    TEMPLATES_RELOADED = "templates_reloaded"
     
\ No newline at end of file
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import JSONResponse
+from helpers.profiling import require_admin
+from models import ResponseSignal
+import asyncio
+
+admin_router = APIRouter(
+    prefix="/api/v1/admin",
+    tags=["api_v1", "admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+@admin_router.post("/templates/reload")
+async def reload_templates(request: Request):
+    """
+    Re-import the prompt template locale files of this worker
+
+    Every worker keeps its own registry, so with several workers send the
+    request once per worker (or restart them).
+    """
+
+    template_parser = request.app.template_parser
+    # importing the locale modules reads and compiles files, keep it off the event loop
+    await asyncio.to_thread(template_parser.reload)
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.TEMPLATES_RELOADED.value,
+            "languages": template_parser.get_languages(),
+        }
+    )
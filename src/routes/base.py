@@ -1,4 +1,5 @@
-from fastapi import FastAPI, APIRouter, Depends
+from fastapi import FastAPI, APIRouter, Depends, Request, status
+from fastapi.responses import JSONResponse
 import os
 from helpers.config import get_settings, Settings
 
@@ -17,3 +18,48 @@ async def welcome(app_settings: Settings = Depends(get_settings)):
         "app_name": app_name,
         "app_version": app_version,
     }
+
+@base_router.get("/health/live")
+async def liveness(request: Request):
+
+    # a component that failed to initialize will not recover without a restart
+    if request.app.readiness.has_failed():
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "failed", **request.app.readiness.get_status()}
+        )
+
+    return {"status": "alive"}
+
+@base_router.get("/health/ready")
+async def readiness(request: Request):
+
+    readiness_status = request.app.readiness.get_status()
+    if not readiness_status["ready"]:
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content=readiness_status
+        )
+
+    return readiness_status
+
+@base_router.get("/llm/rate-limits")
+async def llm_rate_limits(request: Request):
+
+    return {
+        "rate_limits": request.app.llm_provider_factory.get_rate_limit_metrics(),
+    }
+
+@base_router.get("/llm/embedding-batches")
+async def llm_embedding_batches(request: Request):
+
+    return {
+        "micro_batching": request.app.llm_provider_factory.get_micro_batch_metrics(),
+    }
+
+@base_router.get("/llm/cache")
+async def llm_generation_cache(request: Request):
+
+    return {
+        "generation_cache": request.app.generation_cache.get_metrics(),
+    }
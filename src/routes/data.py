@@ -2,9 +2,11 @@ from fastapi import FastAPI, APIRouter, Depends, UploadFile, status, Request, Fi
 from fastapi.responses import JSONResponse
 import os
 from helpers.config import get_settings, Settings
+from helpers.readiness import require_ready
 from controllers import DataController, ProjectController, ProcessController
 import aiofiles
-from models import ResponseSignal
+import asyncio
+from models import ResponseSignal, ChunkingMethodEnum
 import logging
 from .schemes.data import ProcessRequest
 from models.ProjectModel import ProjectModel
@@ -19,6 +21,7 @@ logger = logging.getLogger('uvicorn.error')
 data_router = APIRouter(
     prefix="/api/v1/data",
     tags=["api_v1", "data"],
+    dependencies=[Depends(require_ready("mongodb"))],
 )
 
 @data_router.post("/upload/{project_id}")
@@ -181,11 +184,25 @@ async def upload_folder(request: Request, project_id: str,
 
 
 @data_router.post("/process/{project_id}")
-async def process_endpoint(request: Request, project_id: str, process_request: ProcessRequest):
+async def process_endpoint(request: Request, project_id: str, process_request: ProcessRequest,
+                           app_settings: Settings = Depends(get_settings)):
 
     chunk_size = process_request.chunk_size
     overlap_size = process_request.overlap_size
     do_reset = process_request.do_reset
+    chunking_method = process_request.chunking_method
+
+    if chunking_method not in [method.value for method in ChunkingMethodEnum]:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.CHUNKING_METHOD_NOT_SUPPORTED.value,
+            }
+        )
+
+    # only semantic chunking embeds, the other methods do not wait for the embedding model
+    if chunking_method == ChunkingMethodEnum.SEMANTIC.value:
+        await require_ready("embedding_model")(request)
 
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client
@@ -199,7 +216,7 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
             db_client=request.app.db_client
         )
 
-    project_files_ids = {}
+    project_files = []
     if process_request.file_id:
         asset_record = await asset_model.get_asset_record(
             asset_project_id=project.id,
@@ -214,9 +231,7 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
                 }
             )
 
-        project_files_ids = {
-            asset_record.id: asset_record.asset_name
-        }
+        project_files = [ asset_record ]
     
     else:
         
@@ -226,12 +241,7 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
             asset_type=AssetTypeEnum.FILE.value,
         )
 
-        project_files_ids = {
-            record.id: record.asset_name
-            for record in project_files
-        }
-
-    if len(project_files_ids) == 0:
+    if len(project_files) == 0:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
@@ -239,40 +249,85 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
             }
         )
     
-    process_controller = ProcessController(project_id=project_id)
+    process_controller = ProcessController(
+        project_id=project_id,
+        embedding_client=request.app.embedding_client
+    )
 
     no_records = 0
     no_files = 0
+    no_skipped_files = 0
 
     chunk_model = await ChunkModel.create_instance(
                         db_client=request.app.db_client
                     )
 
     if do_reset == 1:
+        # every asset loses its chunks, not only the ones processed below (file_id,
+        # missing or empty files, an early failure), so none may keep a fingerprint
+        # that would mark it as already processed on the next run
+        _ = await asset_model.clear_processing_state(
+            asset_project_id=project.id
+        )
         _ = await chunk_model.delete_chunks_by_project_id(
             project_id=project.id
         )
 
-    for asset_id, file_id in project_files_ids.items():
+    for asset_record in project_files:
 
-        file_content = process_controller.get_file_content(file_id=file_id)
+        asset_id, file_id = asset_record.id, asset_record.asset_name
+        asset_config = asset_record.asset_config or {}
 
-        # This check is what was causing the issue for .md files
-        if file_content is None: 
-            logger.error(f"Error while processing file: {file_id}. File content could not be loaded.")
+        # skip files whose bytes and chunk settings did not change since the last run;
+        # hashing reads the whole file, so it runs in a worker thread
+        is_changed, processing_state = await asyncio.to_thread(
+            process_controller.get_processing_state,
+            file_id=file_id,
+            previous_state=None if do_reset == 1 else asset_config.get("processing"),
+            chunk_size=chunk_size,
+            overlap_size=overlap_size,
+            chunking_method=chunking_method
+        )
+
+        if processing_state is None:
+            logger.error(f"Error while processing file: {file_id}. File not found.")
+            continue
+
+        if not is_changed:
+            no_skipped_files += 1
             continue
 
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
+        # stream the file page by page and insert its chunks batch by batch,
+        # so memory stays bounded by the batch size instead of the file size;
+        # loading and splitting (semantic chunking embeds synchronously) run in a
+        # worker thread, one batch at a time, to keep the event loop free
+        file_chunk_batches = process_controller.iter_chunk_batches(
             file_id=file_id,
+            project_id=project.id,
+            asset_id=asset_id,
             chunk_size=chunk_size,
-            overlap_size=overlap_size
+            overlap_size=overlap_size,
+            chunking_method=chunking_method,
+            chunk_fingerprint=processing_state["fingerprint"],
+            batch_size=app_settings.FILE_PROCESSING_BATCH_SIZE
         )
 
-        if file_chunks is None or len(file_chunks) == 0:
-            # Note: This returns a 400 for the whole request if ANY file processing fails, 
-            # which might be too strict if multiple files are processed.
-            # However, I kept the original logic structure here.
+        file_records = 0
+        try:
+            while (file_chunks_records := await asyncio.to_thread(next, file_chunk_batches, None)) is not None:
+                file_records += await chunk_model.insert_many_chunks(
+                    chunks=file_chunks_records,
+                    batch_size=app_settings.FILE_PROCESSING_BATCH_SIZE
+                )
+        except Exception as e:
+            logger.error(f"Error while processing file: {file_id}: {e}", exc_info=True)
+
+            # drop the partial new chunks, the previous ones are still in place
+            _ = await chunk_model.delete_chunks_by_fingerprint(
+                asset_id=asset_id,
+                fingerprint=processing_state["fingerprint"]
+            )
+
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
@@ -280,25 +335,32 @@ async def process_endpoint(request: Request, project_id: str, process_request: P
                 }
             )
 
-        file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1,
-                chunk_project_id=project.id,
-                chunk_asset_id=asset_id
-            )
-            for i, chunk in enumerate(file_chunks)
-        ]
+        if file_records == 0:
+            logger.error(f"Error while processing file: {file_id}. File content could not be loaded.")
+            continue
+
+        # the new chunks are in place, now swap out the asset's previous ones
+        _ = await chunk_model.delete_chunks_by_asset_id(
+            asset_id=asset_id,
+            except_fingerprint=processing_state["fingerprint"]
+        )
+
+        processing_state["chunk_count"] = file_records
+        asset_config["processing"] = processing_state
+        _ = await asset_model.update_asset_config(
+            asset_id=asset_id,
+            asset_config=asset_config
+        )
 
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+        no_records += file_records
         no_files += 1
 
     return JSONResponse(
         content={
             "signal": ResponseSignal.PROCESSING_SUCCESS.value,
             "inserted_chunks": no_records,
-            "processed_files": no_files
+            "processed_files": no_files,
+            "skipped_files": no_skipped_files
         }
     )
     
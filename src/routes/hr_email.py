@@ -1,12 +1,25 @@
-from fastapi import APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.hr_email import HREmailRequest
+from fastapi import APIRouter, status, Request, Depends
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.hr_email import HREmailRequest, HREmailBatchRequest
+from helpers.config import get_settings, Settings
 from controllers import HREmailController
-from models import ResponseSignal
+from models import ResponseSignal, EmailGenerationModeEnum
+import json
 import logging
 
 logger = logging.getLogger('uvicorn.error')
 
+GENERATION_MODES = [ mode.value for mode in EmailGenerationModeEnum ]
+
+def generation_mode_error(generation_mode: str):
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={
+            "signal": ResponseSignal.HR_EMAIL_ERROR.value,
+            "error": f"Invalid generation mode: {generation_mode}. Valid modes: {', '.join(GENERATION_MODES)}"
+        }
+    )
+
 hr_email_router = APIRouter(
     prefix="/api/v1/hr-email",
     tags=["api_v1", "hr_email"],
@@ -17,23 +30,32 @@ async def generate_hr_email(request: Request, email_request: HREmailRequest):
     """
     Generate professional HR emails for various scenarios
     """
+    if email_request.generation_mode not in GENERATION_MODES:
+        return generation_mode_error(email_request.generation_mode)
+
     try:
         hr_email_controller = HREmailController(
             generation_client=request.app.generation_client,
-            template_parser=request.app.template_parser
+            template_parser=request.app.template_parser,
+            generation_cache=request.app.generation_cache
         )
         
-        email_content = hr_email_controller.generate_email(
+        email_content, generation_mode, cache_status = await hr_email_controller.generate_email(
             email_type=email_request.email_type,
             recipient_name=email_request.recipient_name,
             context=email_request.context,
-            tone=email_request.tone
+            tone=email_request.tone,
+            generation_mode=email_request.generation_mode,
+            details=email_request.details,
+            use_cache=email_request.use_cache
         )
         
         return JSONResponse(
             content={
                 "signal": ResponseSignal.HR_EMAIL_SUCCESS.value,
-                "email": email_content
+                "email": email_content,
+                "generation_mode": generation_mode,
+                "cache": cache_status
             }
         )
     except Exception as e:
@@ -44,4 +66,48 @@ async def generate_hr_email(request: Request, email_request: HREmailRequest):
                 "signal": ResponseSignal.HR_EMAIL_ERROR.value,
                 "error": str(e)
             }
-        )
\ No newline at end of file
+        )
+
+@hr_email_router.post("/generate-batch")
+async def generate_hr_email_batch(request: Request, batch_request: HREmailBatchRequest,
+                                  app_settings: Settings = Depends(get_settings)):
+    """
+    Generate one HR email per recipient and stream the results as NDJSON,
+    one line per recipient in completion order
+    """
+    if batch_request.generation_mode not in GENERATION_MODES:
+        return generation_mode_error(batch_request.generation_mode)
+
+    hr_email_controller = HREmailController(
+        generation_client=request.app.generation_client,
+        template_parser=request.app.template_parser,
+        generation_cache=request.app.generation_cache
+    )
+
+    try:
+        hr_email_controller.validate_email_type(batch_request.email_type)
+    except ValueError as e:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.HR_EMAIL_ERROR.value,
+                "error": str(e)
+            }
+        )
+
+    async def stream_results():
+        results = hr_email_controller.generate_emails_batch(
+            email_type=batch_request.email_type,
+            recipients=[ recipient.dict() for recipient in batch_request.recipients ],
+            tone=batch_request.tone,
+            max_concurrency=app_settings.HR_EMAIL_BATCH_MAX_CONCURRENCY,
+            generation_mode=batch_request.generation_mode,
+            use_cache=batch_request.use_cache
+        )
+
+        async for result in results:
+            result["signal"] = ResponseSignal.HR_EMAIL_ERROR.value if "error" in result \
+                               else ResponseSignal.HR_EMAIL_SUCCESS.value
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
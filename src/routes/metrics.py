@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Response
+from helpers.metrics import get_metrics_payload
+
+metrics_router = APIRouter(
+    tags=["metrics"],
+)
+
+@metrics_router.get("/metrics")
+async def metrics():
+
+    payload, content_type = get_metrics_payload()
+    return Response(content=payload, media_type=content_type)
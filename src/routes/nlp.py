@@ -1,11 +1,13 @@
-from fastapi import FastAPI, APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from fastapi import FastAPI, APIRouter, Depends, status, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.nlp import PushRequest, SearchRequest, SearchBatchRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
 from controllers import NLPController
 from models import ResponseSignal
+from helpers.readiness import require_ready
 
+import json
 import logging
 
 logger = logging.getLogger('uvicorn.error')
@@ -13,6 +15,7 @@ logger = logging.getLogger('uvicorn.error')
 nlp_router = APIRouter(
     prefix="/api/v1/nlp",
     tags=["api_v1", "nlp"],
+    dependencies=[Depends(require_ready("mongodb", "vector_db", "embedding_model"))],
 )
 
 @nlp_router.post("/index/push/{project_id}")
@@ -62,7 +65,7 @@ async def index_project(request: Request, project_id: str, push_request: PushReq
         chunks_ids =  list(range(idx, idx + len(page_chunks)))
         idx += len(page_chunks)
         
-        is_inserted = nlp_controller.index_into_vector_db(
+        is_inserted = await nlp_controller.index_into_vector_db(
             project=project,
             chunks=page_chunks,
             do_reset=push_request.do_reset,
@@ -132,7 +135,7 @@ async def search_index(request: Request, project_id: str, search_request: Search
         template_parser=request.app.template_parser,
     )
 
-    results = nlp_controller.search_vector_db_collection(
+    results = await nlp_controller.search_vector_db_collection(
         project=project, text=search_request.text, limit=search_request.limit
     )
 
@@ -151,6 +154,46 @@ async def search_index(request: Request, project_id: str, search_request: Search
         }
     )
 
+@nlp_router.post("/index/search-batch/{project_id}")
+async def search_index_batch(request: Request, project_id: str, search_request: SearchBatchRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    batch_results = await nlp_controller.search_vector_db_collection_batch(
+        project=project, texts=search_request.texts, limit=search_request.limit
+    )
+
+    if not batch_results:
+        return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+                }
+            )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                {"text": text, "results": [ result.dict() for result in results ]}
+                for text, results in zip(search_request.texts, batch_results)
+            ]
+        }
+    )
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: str, search_request: SearchRequest):
     
@@ -169,7 +212,7 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
         template_parser=request.app.template_parser,
     )
 
-    answer, full_prompt, chat_history = nlp_controller.answer_rag_question(
+    answer, full_prompt, chat_history, metrics = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit,
@@ -188,6 +231,52 @@ async def answer_rag(request: Request, project_id: str, search_request: SearchRe
             "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
             "answer": answer,
             "full_prompt": full_prompt,
-            "chat_history": chat_history
+            "chat_history": chat_history,
+            "metrics": metrics
         }
     )
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def answer_rag_stream(request: Request, project_id: str, search_request: SearchRequest):
+    """
+    Stream the RAG answer as NDJSON: one line per generated piece ("delta"),
+    then a final line with the metrics
+    """
+    
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+    )
+
+    async def stream_answer():
+        try:
+            async for event in nlp_controller.stream_rag_answer(
+                project=project,
+                query=search_request.text,
+                limit=search_request.limit,
+            ):
+                if "text" in event:
+                    yield json.dumps({"delta": event["text"]}) + "\n"
+                else:
+                    yield json.dumps({
+                        "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+                        "metrics": event["metrics"],
+                    }) + "\n"
+        except Exception as e:
+            logger.error(f"Error streaming RAG answer: {e}")
+            yield json.dumps({
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value,
+                "error": str(e),
+            }) + "\n"
+
+    return StreamingResponse(stream_answer(), media_type="application/x-ndjson")
@@ -0,0 +1,104 @@
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import JSONResponse
+from helpers.config import get_settings, Settings
+from helpers.profiling import SamplingProfiler, get_tracemalloc_snapshot, require_admin
+from models import ResponseSignal
+from typing import Literal
+import asyncio
+import json
+import time
+import tracemalloc
+
+profiling_router = APIRouter(
+    prefix="/api/v1/admin/profiling",
+    tags=["api_v1", "admin"],
+    dependencies=[Depends(require_admin)],
+)
+
+@profiling_router.post("/sample")
+async def sample_profile(request: Request,
+                         seconds: float = Query(default=10, gt=0),
+                         format: Literal["speedscope", "collapsed"] = "speedscope",
+                         interval_ms: float = Query(default=None, gt=0),
+                         app_settings: Settings = Depends(get_settings)):
+    """
+    Sample the stacks of all threads for seconds and return them as a file
+
+    "speedscope" opens in https://www.speedscope.app, "collapsed" (folded
+    stacks) in speedscope or flamegraph.pl.
+    """
+
+    if request.app.sampling_profiler is not None:
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "signal": ResponseSignal.PROFILER_BUSY.value
+            }
+        )
+
+    profiler = SamplingProfiler(interval=(interval_ms or app_settings.PROFILING_SAMPLE_INTERVAL_MS) / 1000)
+    request.app.sampling_profiler = profiler
+    try:
+        profiler.start()
+        await asyncio.sleep(min(seconds, app_settings.PROFILING_MAX_SECONDS))
+    finally:
+        await asyncio.to_thread(profiler.stop)
+        request.app.sampling_profiler = None
+
+    name = f"hr-toolkit-{time.strftime('%Y%m%d-%H%M%S')}"
+    if format == "collapsed":
+        content, media_type, file_name = profiler.to_collapsed(), "text/plain", f"{name}.folded"
+    else:
+        content, media_type, file_name = json.dumps(profiler.to_speedscope(name)), "application/json", f"{name}.speedscope.json"
+
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{file_name}"',
+            "X-Profile-Samples": str(profiler.sample_count),
+            "X-Profile-Duration": f"{profiler.duration:.2f}",
+        }
+    )
+
+@profiling_router.post("/tracemalloc/start")
+async def start_tracemalloc(request: Request, frames: int = Query(default=1, ge=1, le=64)):
+    """Start tracing allocations, keeping frames frames of traceback for each"""
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+        request.app.tracemalloc_snapshot = None
+
+    return {
+        "tracing": True,
+        "frames": tracemalloc.get_traceback_limit(),
+    }
+
+@profiling_router.get("/tracemalloc/snapshot")
+async def tracemalloc_snapshot(request: Request,
+                               group_by: Literal["lineno", "filename", "traceback"] = "lineno",
+                               limit: int = Query(default=20, ge=1, le=500)):
+    """Top allocations, and their growth since the previous snapshot"""
+
+    if not tracemalloc.is_tracing():
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.TRACEMALLOC_NOT_STARTED.value
+            }
+        )
+
+    snapshot, summary = await asyncio.to_thread(
+        get_tracemalloc_snapshot, request.app.tracemalloc_snapshot, group_by, limit
+    )
+    request.app.tracemalloc_snapshot = snapshot
+
+    return summary
+
+@profiling_router.post("/tracemalloc/stop")
+async def stop_tracemalloc(request: Request):
+
+    tracemalloc.stop()
+    request.app.tracemalloc_snapshot = None
+
+    return {"tracing": False}
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import Optional
+from models.enums.ChunkingMethodEnum import ChunkingMethodEnum
 
 class ProcessRequest(BaseModel):
     """
@@ -22,6 +23,12 @@ class ProcessRequest(BaseModel):
         le=1000,
         description="Overlap between chunks in characters. Helps maintain context across chunk boundaries."
     )
+    chunking_method: str = Field(
+        default=ChunkingMethodEnum.CHARACTER.value,
+        description="How chunks are cut: 'character' (chunk_size characters), 'token' "
+                    "(sized to the embedding model's token window, overlap kept proportional) or "
+                    "'semantic' (cut where adjacent sentences diverge, at most chunk_size characters)"
+    )
     do_reset: int = Field(
         default=0,
         ge=0,
@@ -0,0 +1,6 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class EmbedRequest(BaseModel):
+    texts: List[str]
+    document_type: Optional[str] = None
@@ -1,11 +1,14 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List, Dict
 
 class HREmailRequest(BaseModel):
     email_type: str = Field(..., description="Type of email: 'offer_letter', 'rejection', 'interview_invitation', 'onboarding', 'performance_review', 'termination', 'reminder', 'announcement', 'appreciation', 'custom'")
     recipient_name: str = Field(..., description="Name of the recipient")
     context: str = Field(..., description="Additional context or details for the email")
     tone: Optional[str] = Field("professional", description="Tone of the email: 'professional', 'friendly', 'formal'")
+    generation_mode: Optional[str] = Field("auto", description="'auto' (template when the context is fully structured, LLM otherwise), 'template' or 'llm'")
+    details: Optional[Dict[str, str]] = Field(None, description="Structured fields (e.g. position, date, time, location) merged over the ones parsed from context")
+    use_cache: Optional[bool] = Field(True, description="Reuse a cached email for an identical request, set to false to force a fresh generation")
     
     class Config:
         schema_extra = {
@@ -15,4 +18,29 @@ class HREmailRequest(BaseModel):
                 "context": "Position: Senior Software Engineer, Date: January 15th, 2024, Time: 2:00 PM, Location: Virtual via Zoom",
                 "tone": "professional"
             }
-        }
\ No newline at end of file
+        }
+
+class HREmailBatchRecipient(BaseModel):
+    recipient_name: str = Field(..., description="Name of the recipient")
+    context: str = Field(..., description="Additional context or details for this recipient's email")
+    details: Optional[Dict[str, str]] = Field(None, description="Structured fields merged over the ones parsed from context")
+
+class HREmailBatchRequest(BaseModel):
+    email_type: str = Field(..., description="Type of email shared by the whole batch (same values as /generate)")
+    tone: Optional[str] = Field("professional", description="Tone of the emails: 'professional', 'friendly', 'formal'")
+    generation_mode: Optional[str] = Field("auto", description="'auto', 'template' or 'llm', applied to every recipient")
+    use_cache: Optional[bool] = Field(True, description="Reuse cached emails for identical recipients, set to false to force fresh generations")
+    recipients: List[HREmailBatchRecipient] = Field(..., min_length=1, max_length=500,
+                                                    description="Recipients and their contexts")
+    
+    class Config:
+        schema_extra = {
+            "example": {
+                "email_type": "interview_invitation",
+                "tone": "professional",
+                "recipients": [
+                    {"recipient_name": "John Doe", "context": "Position: Backend Engineer, Date: January 15th, 2024, Time: 2:00 PM"},
+                    {"recipient_name": "Jane Smith", "context": "Position: Backend Engineer, Date: January 16th, 2024, Time: 11:00 AM"}
+                ]
+            }
+        }
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
@@ -7,3 +7,8 @@ class PushRequest(BaseModel):
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+
+class SearchBatchRequest(BaseModel):
+    texts: List[str] = Field(..., min_length=1, max_length=100,
+                             description="Query texts, embedded together and searched in one vector db round trip")
+    limit: Optional[int] = 5
@@ -1,8 +1,12 @@
 from pydantic import BaseModel, Field
+from typing import Optional
 
 class WebScrapingRequest(BaseModel):
     company_name: str = Field(..., description="Name of the company")
     url: str = Field(..., description="URL of the website to scrape")
+    crawl_depth: Optional[int] = Field(0, ge=0, description="Same-domain link hops to follow from the landing page (capped by WEB_SCRAPER_MAX_DEPTH)")
+    max_pages: Optional[int] = Field(1, ge=1, description="Page budget for the crawl, landing page included (capped by WEB_SCRAPER_MAX_PAGES)")
+    use_cache: Optional[bool] = Field(True, description="Reuse a cached summary of the same page, set to false to force a fresh scrape and summary")
     
     class Config:
         schema_extra = {
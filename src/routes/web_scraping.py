@@ -20,18 +20,24 @@ async def summarize_website(request: Request, scrape_request: WebScrapingRequest
     try:
         web_scraping_controller = WebScrapingController(
             generation_client=request.app.generation_client,
-            template_parser=request.app.template_parser
+            template_parser=request.app.template_parser,
+            generation_cache=request.app.generation_cache,
+            web_scraper=request.app.web_scraper
         )
         
-        summary = web_scraping_controller.summarize_website(
+        summary, cache_status = await web_scraping_controller.summarize_website(
             company_name=scrape_request.company_name,
-            url=scrape_request.url
+            url=scrape_request.url,
+            use_cache=scrape_request.use_cache,
+            crawl_depth=scrape_request.crawl_depth,
+            max_pages=scrape_request.max_pages
         )
         
         return JSONResponse(
             content={
                 "signal": ResponseSignal.WEB_SUMMARY_SUCCESS.value,
-                "summary": summary
+                "summary": summary,
+                "cache": cache_status
             }
         )
     except Exception as e:
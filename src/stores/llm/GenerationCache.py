@@ -0,0 +1,225 @@
+from helpers.metrics import CACHE_REQUESTS
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+class GenerationCache:
+    """
+    Size-bounded on-disk cache for LLM generations
+
+    Entries are JSON files keyed by a hash of the normalized request, the
+    generation model id and the temperature, and expire after a TTL. When the
+    directory grows past max_size_bytes the least recently used entries are
+    evicted. Concurrent identical requests are coalesced: only the first one
+    calls upstream and the others await its result.
+    """
+
+    HIT = "hit"
+    MISS = "miss"
+    COALESCED = "coalesced"
+    BYPASS = "bypass"
+
+    def __init__(self, cache_dir: str, max_size_bytes: int=256 * 1024 * 1024,
+                 default_ttl: float=86400, enabled: bool=True, name: str="generation"):
+        self.cache_dir = cache_dir
+        self.name = name
+        self.max_size_bytes = max_size_bytes
+        self.default_ttl = default_ttl
+        self.enabled = enabled
+
+        # key -> (size in bytes, last access time), rebuilt from disk at startup
+        self.index = {}
+        self.total_size = 0
+        self.lock = threading.Lock()
+
+        # key -> task generating the value, shared by concurrent identical requests
+        self.in_flight = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self.logger = logging.getLogger(__name__)
+
+        if self.enabled:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.load_index()
+
+    def load_index(self):
+        for root, _, files in os.walk(self.cache_dir):
+            for file_name in files:
+                if not file_name.endswith(".json"):
+                    continue
+                stat = os.stat(os.path.join(root, file_name))
+                self.index[file_name[:-len(".json")]] = (stat.st_size, stat.st_mtime)
+                self.total_size += stat.st_size
+
+    @staticmethod
+    def normalize_text(text) -> str:
+        if text is None:
+            return ""
+        return re.sub(r"\s+", " ", str(text)).strip()
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        parts = urlsplit(url.strip())
+        path = parts.path.rstrip("/") or "/"
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, parts.query, ""))
+
+    def make_key(self, namespace: str, payload: dict, model_id: str=None, temperature: float=None) -> str:
+        normalized = {
+            key: (
+                { k: self.normalize_text(v) for k, v in sorted(value.items()) }
+                if isinstance(value, dict) else self.normalize_text(value)
+            )
+            for key, value in payload.items()
+        }
+        raw_key = json.dumps({
+            "namespace": namespace,
+            "payload": normalized,
+            "model_id": model_id,
+            "temperature": temperature,
+        }, sort_keys=True, ensure_ascii=False)
+
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        entry_path = self.get_entry_path(key)
+        try:
+            with open(entry_path, "r", encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("expires_at") and entry["expires_at"] < time.time():
+            self.delete(key)
+            return None
+
+        now = time.time()
+        with self.lock:
+            if key in self.index:
+                self.index[key] = (self.index[key][0], now)
+        try:
+            # the mtime doubles as the last access time across restarts
+            os.utime(entry_path, (now, now))
+        except OSError:
+            pass
+
+        return entry.get("value")
+
+    def set(self, key: str, value: str, ttl: float=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = json.dumps({
+            "value": value,
+            "created_at": time.time(),
+            "expires_at": time.time() + ttl if ttl else None,
+        }, ensure_ascii=False).encode("utf-8")
+
+        if len(entry) > self.max_size_bytes:
+            return
+
+        entry_path = self.get_entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+
+        # write to a temp file then rename so readers never see a partial entry
+        temp_path = f"{entry_path}.{threading.get_ident()}.tmp"
+        with open(temp_path, "wb") as entry_file:
+            entry_file.write(entry)
+        os.replace(temp_path, entry_path)
+
+        with self.lock:
+            previous_size = self.index.get(key, (0, 0))[0]
+            self.index[key] = (len(entry), time.time())
+            self.total_size += len(entry) - previous_size
+
+        self.evict()
+
+    def delete(self, key: str):
+        try:
+            os.remove(self.get_entry_path(key))
+        except OSError:
+            pass
+
+        with self.lock:
+            size, _ = self.index.pop(key, (0, 0))
+            self.total_size -= size
+
+    def evict(self):
+        with self.lock:
+            if self.total_size <= self.max_size_bytes:
+                return
+            by_last_access = sorted(self.index.items(), key=lambda item: item[1][1])
+
+        for key, _ in by_last_access:
+            if self.total_size <= self.max_size_bytes:
+                break
+            self.delete(key)
+
+    async def get_or_generate(self, key: str, generate: Callable[[], Awaitable[str]],
+                              ttl: float=None, use_cache: bool=True):
+        """
+        Return the cached value for key, or generate, store and return it
+
+        Args:
+            key: Cache key built with make_key
+            generate: Coroutine function producing the value on a miss
+            ttl: Seconds before the entry expires, defaults to default_ttl
+            use_cache: When False the cache is neither read nor written
+
+        Returns:
+            Tuple of the value and the cache status (hit, miss, coalesced or bypass)
+        """
+        if not self.enabled or not use_cache:
+            CACHE_REQUESTS.labels(cache=self.name, status=self.BYPASS).inc()
+            return await generate(), self.BYPASS
+
+        value = await asyncio.to_thread(self.get, key)
+        if value is not None:
+            self.hits += 1
+            CACHE_REQUESTS.labels(cache=self.name, status=self.HIT).inc()
+            return value, self.HIT
+
+        if key in self.in_flight:
+            self.coalesced += 1
+            CACHE_REQUESTS.labels(cache=self.name, status=self.COALESCED).inc()
+            return await asyncio.shield(self.in_flight[key]), self.COALESCED
+
+        async def generate_and_store():
+            try:
+                value = await generate()
+                if value:
+                    await asyncio.to_thread(self.set, key, value, ttl)
+                return value
+            finally:
+                self.in_flight.pop(key, None)
+
+        self.misses += 1
+        CACHE_REQUESTS.labels(cache=self.name, status=self.MISS).inc()
+        # shielded so a client disconnecting does not cancel the call other
+        # requests are waiting on
+        task = asyncio.ensure_future(generate_and_store())
+        self.in_flight[key] = task
+        return await asyncio.shield(task), self.MISS
+
+    def get_metrics(self):
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self.index),
+                "size_bytes": self.total_size,
+                "max_size_bytes": self.max_size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "in_flight": len(self.in_flight),
+            }
@@ -0,0 +1,48 @@
+import httpx
+
+class HTTPClientPool:
+    """
+    HTTP clients shared by every LLM provider, so all upstream calls go through
+    one tunable connection pool (one sync and one async client, created lazily).
+    The web scraper keeps its own instance with redirects and a user agent, the
+    embedding sidecar client one bound to a Unix socket (uds).
+    """
+
+    def __init__(self, max_connections: int=100, max_keepalive_connections: int=20,
+                       timeout: float=60.0, connect_timeout: float=10.0,
+                       follow_redirects: bool=False, headers: dict=None, uds: str=None):
+
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=min(connect_timeout, timeout))
+        self.follow_redirects = follow_redirects
+        self.headers = headers
+        self.uds = uds
+
+        self.sync_client = None
+        self.async_client = None
+
+    def get_sync_client(self) -> httpx.Client:
+        if self.sync_client is None:
+            transport = httpx.HTTPTransport(uds=self.uds, limits=self.limits) if self.uds else None
+            self.sync_client = httpx.Client(limits=self.limits, timeout=self.timeout, transport=transport,
+                                            follow_redirects=self.follow_redirects, headers=self.headers)
+        return self.sync_client
+
+    def get_async_client(self) -> httpx.AsyncClient:
+        if self.async_client is None:
+            transport = httpx.AsyncHTTPTransport(uds=self.uds, limits=self.limits) if self.uds else None
+            self.async_client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout, transport=transport,
+                                                  follow_redirects=self.follow_redirects, headers=self.headers)
+        return self.async_client
+
+    async def close(self):
+        if self.sync_client is not None:
+            self.sync_client.close()
+            self.sync_client = None
+
+        if self.async_client is not None:
+            await self.async_client.aclose()
+            self.async_client = None
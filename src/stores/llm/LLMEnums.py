@@ -4,6 +4,8 @@ class LLMEnums(Enum):
     OPENAI = "OPENAI"
     COHERE = "COHERE"
     HUGGINGFACE = "HUGGINGFACE"
+    ONNX = "ONNX"
+    SIDECAR = "SIDECAR"
 
 class OpenAIEnums(Enum):
     SYSTEM = "system"
@@ -23,6 +25,12 @@ class HuggingFaceEnums(Enum):
     USER = "user"
     ASSISTANT = "assistant"
 
+class ChatRoleEnum(Enum):
+    # provider-agnostic roles of achat / achat_stream messages
+    SYSTEM = "system"
+    USER = "user"
+    ASSISTANT = "assistant"
+
 class DocumentTypeEnum(Enum):
     DOCUMENT = "document"
     QUERY = "query"
\ No newline at end of file
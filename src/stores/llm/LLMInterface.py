@@ -19,6 +19,48 @@ class LLMInterface(ABC):
     def embed_text(self, text: str, document_type: str = None):
         pass
 
+    @abstractmethod
+    def embed_texts(self, texts: list, document_type: str = None):
+        pass
+
+    @abstractmethod
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        pass
+
+    @abstractmethod
+    async def aembed_text(self, text: str, document_type: str = None):
+        pass
+
+    @abstractmethod
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        pass
+
+    @abstractmethod
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        """
+        Generate a reply to a list of {"role", "content"} messages (ChatRoleEnum roles)
+
+        Returns:
+            {"text": reply, "usage": {"prompt_tokens", "completion_tokens", "cached_tokens"}}
+            or None
+        """
+        pass
+
+    @abstractmethod
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        """
+        Stream a reply to a list of messages
+
+        Yields:
+            {"text": delta} for each generated piece, then one {"usage": {...}}
+        """
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
+
+    def count_tokens(self, text: str) -> int:
+        # providers with a tokenizer for their generation model override this estimate
+        return len(text or "") // 4 + 1
@@ -1,18 +1,89 @@
 from .LLMEnums import LLMEnums
-from .providers import OpenAIProvider, CoHereProvider, LangChainHFProvider
+from .HTTPClientPool import HTTPClientPool
+from .RetryPolicy import RetryPolicy
+from .RateLimiter import RateLimiter
+from .RateLimitedProvider import RateLimitedProvider
+from .MicroBatchingProvider import MicroBatchingProvider
+from .providers import OpenAIProvider, CoHereProvider, LangChainHFProvider, ONNXEmbeddingProvider, EmbeddingSidecarProvider
+from controllers.BaseController import BaseController
 
 class LLMProviderFactory:
     def __init__(self, config: dict):
         self.config = config
 
+        # one connection pool and retry policy shared by every remote provider
+        self.http_pool = HTTPClientPool(
+            max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            timeout=self.config.LLM_HTTP_TIMEOUT,
+        )
+        self.retry_policy = RetryPolicy(
+            max_retries=self.config.LLM_MAX_RETRIES,
+            backoff_base=self.config.LLM_RETRY_BACKOFF_BASE,
+            backoff_max=self.config.LLM_RETRY_BACKOFF_MAX,
+            deadline=self.config.LLM_REQUEST_DEADLINE,
+        )
+
+        # separate pool bound to the embedding sidecar's Unix socket, created on first use
+        self.sidecar_http_pool = None
+
+        # providers are deduplicated per backend: generation and embedding
+        # share one instance (and its clients) when they use the same backend
+        self.providers = {}
+
     def create(self, provider: str):
+        if provider not in self.providers:
+            instance = self.build(provider=provider)
+            if instance is None:
+                return None
+
+            # every backend call is queued through the backend's rate limiter
+            rate_limits = (self.config.LLM_RATE_LIMITS or {}).get(provider, {})
+            instance = RateLimitedProvider(
+                provider=instance,
+                rate_limiter=RateLimiter(
+                    name=provider,
+                    requests_per_minute=rate_limits.get("requests_per_minute"),
+                    tokens_per_minute=rate_limits.get("tokens_per_minute"),
+                    max_concurrency=rate_limits.get("max_concurrency"),
+                )
+            )
+
+            # concurrent single-query embeddings share one batched call (and one rate limit slot)
+            if self.config.EMBEDDING_MICRO_BATCH_ENABLED:
+                instance = MicroBatchingProvider(
+                    provider=instance,
+                    max_wait_ms=self.config.EMBEDDING_MICRO_BATCH_MAX_WAIT_MS,
+                    max_batch_size=self.config.EMBEDDING_MICRO_BATCH_MAX_SIZE,
+                )
+
+            self.providers[provider] = instance
+
+        return self.providers[provider]
+
+    def get_rate_limit_metrics(self):
+        return [
+            provider.rate_limiter.get_metrics()
+            for provider in self.providers.values()
+        ]
+
+    def get_micro_batch_metrics(self):
+        return {
+            name: provider.get_metrics()
+            for name, provider in self.providers.items()
+            if isinstance(provider, MicroBatchingProvider)
+        }
+
+    def build(self, provider: str):
         if provider == LLMEnums.OPENAI.value:
             return OpenAIProvider(
                 api_key = self.config.OPENROUTER_API_KEY,
                 api_url = self.config.OPENAI_API_URL,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_pool=self.http_pool,
+                retry_policy=self.retry_policy,
             )
 
         if provider == LLMEnums.COHERE.value:
@@ -20,7 +91,9 @@ class LLMProviderFactory:
                 api_key = self.config.COHERE_API_KEY,
                 default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
-                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE,
+                http_pool=self.http_pool,
+                retry_policy=self.retry_policy,
             )
 
         if provider == LLMEnums.HUGGINGFACE.value:
@@ -31,4 +104,36 @@ class LLMProviderFactory:
                 default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
             )
 
-        return None
\ No newline at end of file
+        if provider == LLMEnums.ONNX.value:
+            return ONNXEmbeddingProvider(
+                model_dir=BaseController().get_cache_path(cache_name=self.config.ONNX_MODEL_DIR),
+                quantize=self.config.ONNX_QUANTIZE,
+                intra_op_threads=self.config.ONNX_INTRA_OP_THREADS,
+                batch_size=self.config.ONNX_BATCH_SIZE,
+                max_length=self.config.EMBEDDING_MODEL_MAX_TOKENS,
+                default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+            )
+
+        if provider == LLMEnums.SIDECAR.value:
+            self.sidecar_http_pool = HTTPClientPool(
+                max_connections=self.config.EMBEDDING_SIDECAR_MAX_CONNECTIONS,
+                max_keepalive_connections=self.config.EMBEDDING_SIDECAR_MAX_CONNECTIONS,
+                timeout=self.config.EMBEDDING_SIDECAR_TIMEOUT,
+                uds=self.config.EMBEDDING_SIDECAR_SOCKET,
+            )
+            return EmbeddingSidecarProvider(
+                http_pool=self.sidecar_http_pool,
+                ready_timeout=self.config.EMBEDDING_SIDECAR_READY_TIMEOUT,
+                default_input_max_characters=self.config.INPUT_DAFAULT_MAX_CHARACTERS,
+                default_generation_max_output_tokens=self.config.GENERATION_DAFAULT_MAX_TOKENS,
+                default_generation_temperature=self.config.GENERATION_DAFAULT_TEMPERATURE
+            )
+
+        return None
+
+    async def close(self):
+        await self.http_pool.close()
+        if self.sidecar_http_pool is not None:
+            await self.sidecar_http_pool.close()
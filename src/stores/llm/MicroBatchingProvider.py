@@ -0,0 +1,138 @@
+from .LLMInterface import LLMInterface
+import asyncio
+import logging
+
+class MicroBatchingProvider(LLMInterface):
+    """
+    Coalesce concurrent single-text aembed_text calls into batched aembed_texts calls
+
+    A call waits up to max_wait_ms for others with the same document type; the
+    batch is sent as soon as it reaches max_batch_size or the wait expires, and
+    every caller gets its own embedding back. Everything else is passed
+    through to the wrapped provider.
+    """
+
+    def __init__(self, provider: LLMInterface, max_wait_ms: float=5, max_batch_size: int=32):
+        self.provider = provider
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        # document type -> [(text, future)] waiting for the next batch
+        self.pending = {}
+        self.flush_handles = {}
+        # the event loop only keeps weak references to tasks
+        self.tasks = set()
+
+        self.batches = 0
+        self.batched_items = 0
+        self.max_seen_batch_size = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        return getattr(self.provider, name)
+
+    def set_generation_model(self, model_id: str):
+        return self.provider.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        return self.provider.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        return self.provider.generate_text(prompt=prompt, chat_history=chat_history,
+                                           max_output_tokens=max_output_tokens, temperature=temperature)
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        return await self.provider.agenerate_text(prompt=prompt, chat_history=chat_history,
+                                                  max_output_tokens=max_output_tokens, temperature=temperature)
+
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        return await self.provider.achat(messages=messages, max_output_tokens=max_output_tokens,
+                                         temperature=temperature)
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        async for event in self.provider.achat_stream(messages=messages, max_output_tokens=max_output_tokens,
+                                                      temperature=temperature):
+            yield event
+
+    def embed_text(self, text: str, document_type: str = None):
+        return self.provider.embed_text(text=text, document_type=document_type)
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        return self.provider.embed_texts(texts=texts, document_type=document_type)
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        # callers that already batch go straight through
+        return await self.provider.aembed_texts(texts=texts, document_type=document_type)
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        if not text or not text.strip():
+            # an empty text would fail the whole batch it joins
+            return await self.provider.aembed_text(text=text, document_type=document_type)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self.pending.setdefault(document_type, [])
+        batch.append((text, future))
+
+        if len(batch) >= self.max_batch_size:
+            self.flush(document_type)
+        elif document_type not in self.flush_handles:
+            self.flush_handles[document_type] = loop.call_later(self.max_wait, self.flush, document_type)
+
+        return await future
+
+    def flush(self, document_type: str):
+        handle = self.flush_handles.pop(document_type, None)
+        if handle:
+            handle.cancel()
+
+        batch = self.pending.pop(document_type, None)
+        if batch:
+            task = asyncio.ensure_future(self.run_batch(document_type, batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def run_batch(self, document_type: str, batch: list):
+        self.batches += 1
+        self.batched_items += len(batch)
+        self.max_seen_batch_size = max(self.max_seen_batch_size, len(batch))
+
+        try:
+            embeddings = await self.provider.aembed_texts(
+                texts=[ text for text, _ in batch ], document_type=document_type
+            )
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not embeddings or len(embeddings) != len(batch):
+            self.logger.error(f"Micro-batch of {len(batch)} texts returned incomplete embeddings")
+            embeddings = [None] * len(batch)
+
+        for (_, future), embedding in zip(batch, embeddings):
+            # a caller that was cancelled while waiting already has a done future
+            if not future.done():
+                future.set_result(embedding)
+
+    def get_metrics(self):
+        return {
+            "max_wait_ms": self.max_wait * 1000,
+            "max_batch_size": self.max_batch_size,
+            "batches": self.batches,
+            "batched_items": self.batched_items,
+            "mean_batch_size": round(self.batched_items / self.batches, 2) if self.batches else None,
+            "max_seen_batch_size": self.max_seen_batch_size,
+            "pending": sum(len(batch) for batch in self.pending.values()),
+        }
+
+    def construct_prompt(self, prompt: str, role: str):
+        return self.provider.construct_prompt(prompt=prompt, role=role)
+
+    def count_tokens(self, text: str) -> int:
+        return self.provider.count_tokens(text=text)
@@ -0,0 +1,135 @@
+from .LLMInterface import LLMInterface
+from .RateLimiter import RateLimiter
+from helpers.metrics import track_time, record_token_usage, LLM_REQUEST_SECONDS, LLM_ERRORS
+from helpers.tracing import start_span, set_span_attributes
+from contextlib import contextmanager
+
+class RateLimitedProvider(LLMInterface):
+    """
+    Wrap an LLMInterface implementation so every generation and embedding call
+    goes through its backend's RateLimiter
+
+    Token usage is estimated up front (about 4 characters per token, plus the
+    output budget for generation). Any other attribute (enums, client,
+    generation_model_id, embedding_size...) is read from the wrapped provider.
+    Every call is also timed and counted per backend in the Prometheus metrics
+    and, when tracing is enabled, runs in an "llm.<operation>" span.
+    """
+
+    def __init__(self, provider: LLMInterface, rate_limiter: RateLimiter):
+        self.provider = provider
+        self.rate_limiter = rate_limiter
+
+    def __getattr__(self, name):
+        return getattr(self.provider, name)
+
+    @contextmanager
+    def observe(self, operation: str, **attributes):
+        attributes = { f"llm.{key}": value for key, value in attributes.items() }
+        with start_span(f"llm.{operation}", **{"llm.provider": self.rate_limiter.name}, **attributes) as span, \
+                track_time(LLM_REQUEST_SECONDS, LLM_ERRORS, provider=self.rate_limiter.name, operation=operation):
+            yield span
+
+    def record_usage(self, span, usage: dict):
+        record_token_usage(self.rate_limiter.name, usage)
+        if usage:
+            set_span_attributes(span, **{ f"llm.{kind}": usage.get(kind)
+                                          for kind in ("prompt_tokens", "completion_tokens", "cached_tokens") })
+
+    def check_result(self, operation: str, result):
+        # providers log and return None instead of raising
+        if result is None:
+            LLM_ERRORS.labels(provider=self.rate_limiter.name, operation=operation).inc()
+        return result
+
+    def estimate_tokens(self, texts: list) -> int:
+        return sum(len(text or "") for text in texts) // 4 + 1
+
+    def estimate_generation_tokens(self, prompt: str, chat_history: list, max_output_tokens: int=None) -> int:
+        history_texts = [
+            message.get("content") or message.get("text") or ""
+            for message in chat_history
+            if isinstance(message, dict)
+        ]
+        output_tokens = max_output_tokens or getattr(self.provider, "default_generation_max_output_tokens", 0) or 0
+        return self.estimate_tokens([prompt] + history_texts) + output_tokens
+
+    def set_generation_model(self, model_id: str):
+        return self.provider.set_generation_model(model_id=model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        return self.provider.set_embedding_model(model_id=model_id, embedding_size=embedding_size)
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        tokens = self.estimate_generation_tokens(prompt, chat_history, max_output_tokens)
+        with self.rate_limiter.limit(tokens=tokens):
+            with self.observe("generate_text", model=self.provider.generation_model_id):
+                result = self.provider.generate_text(prompt=prompt, chat_history=chat_history,
+                                                     max_output_tokens=max_output_tokens, temperature=temperature)
+            return self.check_result("generate_text", result)
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        tokens = self.estimate_generation_tokens(prompt, chat_history, max_output_tokens)
+        async with self.rate_limiter.alimit(tokens=tokens):
+            with self.observe("agenerate_text", model=self.provider.generation_model_id):
+                result = await self.provider.agenerate_text(prompt=prompt, chat_history=chat_history,
+                                                            max_output_tokens=max_output_tokens, temperature=temperature)
+            return self.check_result("agenerate_text", result)
+
+    def embed_text(self, text: str, document_type: str = None):
+        with self.rate_limiter.limit(tokens=self.estimate_tokens([text])):
+            with self.observe("embed_text", model=self.provider.embedding_model_id, input_count=1):
+                result = self.provider.embed_text(text=text, document_type=document_type)
+            return self.check_result("embed_text", result)
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        with self.rate_limiter.limit(tokens=self.estimate_tokens(texts)):
+            with self.observe("embed_texts", model=self.provider.embedding_model_id, input_count=len(texts)):
+                result = self.provider.embed_texts(texts=texts, document_type=document_type)
+            return self.check_result("embed_texts", result)
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        async with self.rate_limiter.alimit(tokens=self.estimate_tokens([text])):
+            with self.observe("aembed_text", model=self.provider.embedding_model_id, input_count=1):
+                result = await self.provider.aembed_text(text=text, document_type=document_type)
+            return self.check_result("aembed_text", result)
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        async with self.rate_limiter.alimit(tokens=self.estimate_tokens(texts)):
+            with self.observe("aembed_texts", model=self.provider.embedding_model_id, input_count=len(texts)):
+                result = await self.provider.aembed_texts(texts=texts, document_type=document_type)
+            return self.check_result("aembed_texts", result)
+
+    def estimate_chat_tokens(self, messages: list, max_output_tokens: int=None) -> int:
+        return self.estimate_generation_tokens(prompt="", chat_history=messages, max_output_tokens=max_output_tokens)
+
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        tokens = self.estimate_chat_tokens(messages, max_output_tokens)
+        async with self.rate_limiter.alimit(tokens=tokens):
+            with self.observe("achat", model=self.provider.generation_model_id, messages=len(messages),
+                              max_output_tokens=max_output_tokens) as span:
+                result = await self.provider.achat(messages=messages, max_output_tokens=max_output_tokens,
+                                                   temperature=temperature)
+                if result:
+                    self.record_usage(span, result.get("usage"))
+            return self.check_result("achat", result)
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        # the concurrency slot is held until the stream is fully consumed
+        tokens = self.estimate_chat_tokens(messages, max_output_tokens)
+        async with self.rate_limiter.alimit(tokens=tokens):
+            with self.observe("achat_stream", model=self.provider.generation_model_id, messages=len(messages),
+                              max_output_tokens=max_output_tokens) as span:
+                async for event in self.provider.achat_stream(messages=messages, max_output_tokens=max_output_tokens,
+                                                              temperature=temperature):
+                    if "usage" in event:
+                        self.record_usage(span, event["usage"])
+                    yield event
+
+    def construct_prompt(self, prompt: str, role: str):
+        return self.provider.construct_prompt(prompt=prompt, role=role)
+
+    def count_tokens(self, text: str) -> int:
+        return self.provider.count_tokens(text=text)
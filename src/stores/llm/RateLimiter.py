@@ -0,0 +1,216 @@
+from contextlib import contextmanager, asynccontextmanager
+import asyncio
+import threading
+import time
+
+class TokenBucket:
+    """Token bucket refilled continuously at rate_per_minute, holding at most one minute of tokens"""
+
+    def __init__(self, rate_per_minute: int):
+        self.capacity = float(rate_per_minute)
+        self.tokens = float(rate_per_minute)
+        self.refill_rate = rate_per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def get_wait_time(self, amount: float) -> float:
+        """Seconds until amount tokens are available (0 if they are now)"""
+        self.refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class ConcurrencyLimit:
+    """
+    Cap on in-flight calls shared by threads and event loop tasks
+
+    Sync callers wait on a condition, async callers on a future of their own loop
+    that every release resolves (they then retry), so both draw from one counter.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self.condition = threading.Condition()
+        self.async_waiters = []
+
+    def acquire(self):
+        with self.condition:
+            while self.in_use >= self.limit:
+                self.condition.wait()
+            self.in_use += 1
+
+    async def aacquire(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self.condition:
+                if self.in_use < self.limit:
+                    self.in_use += 1
+                    return
+                waiter = (loop, loop.create_future())
+                self.async_waiters.append(waiter)
+
+            try:
+                await waiter[1]
+            finally:
+                with self.condition:
+                    if waiter in self.async_waiters:
+                        self.async_waiters.remove(waiter)
+
+    def release(self):
+        with self.condition:
+            self.in_use -= 1
+            self.condition.notify()
+            waiters, self.async_waiters = self.async_waiters, []
+
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(self.wake, future)
+            except RuntimeError:
+                # the waiter's loop is closed, nobody is waiting on it anymore
+                pass
+
+    @staticmethod
+    def wake(future: asyncio.Future):
+        if not future.done():
+            future.set_result(None)
+
+
+class RateLimiter:
+    """
+    Client-side limits for one LLM backend: requests/min and tokens/min token buckets
+    plus a cap on in-flight calls
+
+    Callers over the limits are queued (they wait) instead of failing. Sync and async
+    callers share the buckets and one max_concurrency cap. The sync limit() sleeps while it waits, so it must only be used off the event loop
+    (semantic chunking in /data/process runs in a worker thread). Any limit left as None
+    is not enforced.
+    """
+
+    def __init__(self, name: str, requests_per_minute: int=None, tokens_per_minute: int=None,
+                       max_concurrency: int=None):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_concurrency = max_concurrency
+
+        self.request_bucket = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+
+        self.concurrency = ConcurrencyLimit(max_concurrency) if max_concurrency else None
+
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.waiting = 0
+        self.total_requests = 0
+        self.total_tokens = 0
+        self.total_wait_seconds = 0.0
+
+    def reserve(self, tokens: int) -> float:
+        """Consume one request and tokens from the buckets, or return how long to wait first"""
+        with self.lock:
+            wait_time = max(
+                self.request_bucket.get_wait_time(1) if self.request_bucket else 0.0,
+                self.token_bucket.get_wait_time(tokens) if self.token_bucket else 0.0,
+            )
+            if wait_time > 0:
+                return wait_time
+
+            if self.request_bucket:
+                self.request_bucket.consume(1)
+            if self.token_bucket:
+                self.token_bucket.consume(tokens)
+
+            self.total_requests += 1
+            self.total_tokens += tokens
+            return 0.0
+
+    def update_counters(self, in_flight: int=0, waiting: int=0, wait_seconds: float=0.0):
+        with self.lock:
+            self.in_flight += in_flight
+            self.waiting += waiting
+            self.total_wait_seconds += wait_seconds
+
+    @asynccontextmanager
+    async def alimit(self, tokens: int=0):
+        started = time.monotonic()
+        self.update_counters(waiting=1)
+        try:
+            if self.concurrency:
+                await self.concurrency.aacquire()
+            try:
+                while (wait_time := self.reserve(tokens)) > 0:
+                    await asyncio.sleep(wait_time)
+            except BaseException:
+                if self.concurrency:
+                    self.concurrency.release()
+                raise
+        finally:
+            self.update_counters(waiting=-1, wait_seconds=time.monotonic() - started)
+
+        self.update_counters(in_flight=1)
+        try:
+            yield
+        finally:
+            self.update_counters(in_flight=-1)
+            if self.concurrency:
+                self.concurrency.release()
+
+    @contextmanager
+    def limit(self, tokens: int=0):
+        started = time.monotonic()
+        self.update_counters(waiting=1)
+        try:
+            if self.concurrency:
+                self.concurrency.acquire()
+            try:
+                while (wait_time := self.reserve(tokens)) > 0:
+                    time.sleep(wait_time)
+            except BaseException:
+                if self.concurrency:
+                    self.concurrency.release()
+                raise
+        finally:
+            self.update_counters(waiting=-1, wait_seconds=time.monotonic() - started)
+
+        self.update_counters(in_flight=1)
+        try:
+            yield
+        finally:
+            self.update_counters(in_flight=-1)
+            if self.concurrency:
+                self.concurrency.release()
+
+    def get_metrics(self) -> dict:
+        with self.lock:
+            if self.request_bucket:
+                self.request_bucket.refill()
+            if self.token_bucket:
+                self.token_bucket.refill()
+
+            return {
+                "backend": self.name,
+                "requests_per_minute": self.requests_per_minute,
+                "tokens_per_minute": self.tokens_per_minute,
+                "max_concurrency": self.max_concurrency,
+                "requests_utilization": round(1 - self.request_bucket.tokens / self.request_bucket.capacity, 3)
+                                        if self.request_bucket else None,
+                "tokens_utilization": round(1 - self.token_bucket.tokens / self.token_bucket.capacity, 3)
+                                      if self.token_bucket else None,
+                "concurrency_utilization": round(self.in_flight / self.max_concurrency, 3)
+                                           if self.max_concurrency else None,
+                "in_flight": self.in_flight,
+                "waiting": self.waiting,
+                "total_requests": self.total_requests,
+                "total_tokens": self.total_tokens,
+                "total_wait_seconds": round(self.total_wait_seconds, 3),
+            }
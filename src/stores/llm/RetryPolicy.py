@@ -0,0 +1,126 @@
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import asyncio
+import logging
+import random
+import time
+import httpx
+
+class RetryPolicy:
+    """
+    Jittered exponential backoff for upstream LLM calls
+
+    Retries timeouts, connection errors and retryable HTTP statuses (429, 5xx...).
+    A Retry-After header on the error response overrides the computed delay.
+    All attempts and waits of one call must fit in the deadline (seconds).
+    """
+
+    retry_statuses = (408, 409, 429, 500, 502, 503, 504)
+
+    def __init__(self, max_retries: int=3, backoff_base: float=0.5,
+                       backoff_max: float=20.0, deadline: float=None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+
+        self.logger = logging.getLogger(__name__)
+
+    def get_status_code(self, error: Exception):
+        status_code = getattr(error, "status_code", None)
+        if status_code is None and getattr(error, "response", None) is not None:
+            status_code = getattr(error.response, "status_code", None)
+        return status_code
+
+    def get_retry_after(self, error: Exception):
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+        if not headers:
+            return None
+
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return float(retry_after_ms) / 1000
+            except ValueError:
+                pass
+
+        retry_after = headers.get("retry-after")
+        if not retry_after:
+            return None
+
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
+
+    def is_retryable(self, error: Exception) -> bool:
+        # SDK connection/timeout errors wrap the underlying httpx error
+        for candidate in (error, error.__cause__):
+            if isinstance(candidate, (httpx.TimeoutException, httpx.TransportError, asyncio.TimeoutError)):
+                return True
+
+        return self.get_status_code(error) in self.retry_statuses
+
+    def get_delay(self, attempt: int, error: Exception) -> float:
+        retry_after = self.get_retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, self.backoff_max)
+
+        # full jitter: uniform in [0, base * 2^attempt], capped
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def next_delay(self, attempt: int, error: Exception, started_at: float):
+        """Delay before the next attempt, or None if the error must be raised"""
+        if attempt >= self.max_retries or not self.is_retryable(error):
+            return None
+
+        delay = self.get_delay(attempt, error)
+        if self.deadline is not None and time.monotonic() - started_at + delay >= self.deadline:
+            return None
+
+        self.logger.warning(
+            f"Retrying upstream call in {delay:.2f}s (attempt {attempt + 1}/{self.max_retries}): "
+            f"{type(error).__name__} {self.get_status_code(error) or ''}"
+        )
+        return delay
+
+    def call(self, func, *args, **kwargs):
+        started_at = time.monotonic()
+        attempt = 0
+
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                delay = self.next_delay(attempt, e, started_at)
+                if delay is None:
+                    raise
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, func, *args, **kwargs):
+        started_at = time.monotonic()
+        attempt = 0
+
+        while True:
+            try:
+                if self.deadline is None:
+                    return await func(*args, **kwargs)
+
+                remaining = self.deadline - (time.monotonic() - started_at)
+                return await asyncio.wait_for(func(*args, **kwargs), timeout=max(remaining, 0.001))
+            except Exception as e:
+                delay = self.next_delay(attempt, e, started_at)
+                if delay is None:
+                    raise
+
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -1,6 +1,7 @@
 from ..LLMInterface import LLMInterface
-from ..LLMEnums import CoHereEnums, DocumentTypeEnum
-import cohere
+from ..LLMEnums import CoHereEnums, DocumentTypeEnum, ChatRoleEnum
+from ..HTTPClientPool import HTTPClientPool
+from ..RetryPolicy import RetryPolicy
 import logging
 
 class CoHereProvider(LLMInterface):
@@ -8,7 +9,9 @@ class CoHereProvider(LLMInterface):
     def __init__(self, api_key: str,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       http_pool: HTTPClientPool=None,
+                       retry_policy: RetryPolicy=None):
         
         self.api_key = api_key
 
@@ -21,7 +24,21 @@ class CoHereProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
-        self.client = cohere.Client(api_key=self.api_key)
+        self.http_pool = http_pool if http_pool else HTTPClientPool()
+        self.retry_policy = retry_policy if retry_policy else RetryPolicy()
+
+        # imported here so the SDK only loads when this backend is configured
+        import cohere
+
+        self.client = cohere.Client(
+            api_key=self.api_key,
+            httpx_client=self.http_pool.get_sync_client(),
+        )
+
+        self.async_client = cohere.AsyncClient(
+            api_key=self.api_key,
+            httpx_client=self.http_pool.get_async_client(),
+        )
 
         self.enums = CoHereEnums
         self.logger = logging.getLogger(__name__)
@@ -36,62 +53,200 @@ class CoHereProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
-                            temperature: float = None):
-
-        if not self.client:
+    def is_generation_ready(self, client):
+        if not client:
             self.logger.error("CoHere client was not set")
-            return None
+            return False
 
         if not self.generation_model_id:
             self.logger.error("Generation model for CoHere was not set")
-            return None
-        
+            return False
+
+        return True
+
+    def is_embedding_ready(self, client):
+        if not client:
+            self.logger.error("CoHere client was not set")
+            return False
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model for CoHere was not set")
+            return False
+
+        return True
+
+    def build_generation_request(self, prompt: str, chat_history: list, max_output_tokens: int,
+                                       temperature: float):
         max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
         temperature = temperature if temperature else self.default_generation_temperature
 
-        response = self.client.chat(
-            model = self.generation_model_id,
-            chat_history = chat_history,
-            message = self.process_text(prompt),
-            temperature = temperature,
-            max_tokens = max_output_tokens
-        )
+        return {
+            "model": self.generation_model_id,
+            "chat_history": chat_history,
+            "message": self.process_text(prompt),
+            "temperature": temperature,
+            "max_tokens": max_output_tokens,
+        }
+
+    def build_chat_request(self, messages: list, max_output_tokens: int, temperature: float):
+        # system messages become the preamble, which Cohere places first; the last
+        # user message is the message and everything in between the chat history
+        roles = {
+            ChatRoleEnum.USER.value: CoHereEnums.USER.value,
+            ChatRoleEnum.ASSISTANT.value: CoHereEnums.ASSISTANT.value,
+        }
+
+        preamble = "\n\n".join([
+            message["content"] for message in messages
+            if message["role"] == ChatRoleEnum.SYSTEM.value
+        ])
+        conversation = [ message for message in messages if message["role"] != ChatRoleEnum.SYSTEM.value ]
+        if not conversation:
+            raise ValueError("Chat messages must include a user message")
+
+        request = {
+            "model": self.generation_model_id,
+            "message": conversation[-1]["content"],
+            "chat_history": [
+                { "role": roles[message["role"]], "message": message["content"] }
+                for message in conversation[:-1]
+            ],
+            "max_tokens": max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens,
+            "temperature": temperature if temperature is not None else self.default_generation_temperature,
+        }
+        if preamble:
+            request["preamble"] = preamble
+
+        return request
+
+    def parse_chat_usage(self, meta):
+        billed_units = getattr(meta, "billed_units", None) if meta else None
+        if not billed_units:
+            return {"prompt_tokens": None, "completion_tokens": None, "cached_tokens": None}
+
+        # Cohere does not report prompt caching, cached_tokens stays 0
+        return {
+            "prompt_tokens": billed_units.input_tokens,
+            "completion_tokens": billed_units.output_tokens,
+            "cached_tokens": 0,
+        }
+
+    def build_embedding_request(self, texts: list, document_type: str):
+        input_type = CoHereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnums.QUERY.value
 
+        return {
+            "model": self.embedding_model_id,
+            "texts": [ self.process_text(text) for text in texts ],
+            "input_type": input_type,
+            "embedding_types": ['float'],
+        }
+
+    def parse_generation_response(self, response):
         if not response or not response.text:
             self.logger.error("Error while generating text with CoHere")
             return None
         
         return response.text
-    
-    def embed_text(self, text: str, document_type: str = None):
-        if not self.client:
-            self.logger.error("CoHere client was not set")
+
+    def parse_embedding_response(self, response):
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("Error while embedding text with CoHere")
             return None
         
-        if not self.embedding_model_id:
-            self.logger.error("Embedding model for CoHere was not set")
+        return response.embeddings.float
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+
+        if not self.is_generation_ready(self.client):
             return None
-        
-        input_type = CoHereEnums.DOCUMENT
-        if document_type == DocumentTypeEnum.QUERY:
-            input_type = CoHereEnums.QUERY
-
-        response = self.client.embed(
-            model = self.embedding_model_id,
-            texts = [self.process_text(text)],
-            input_type = input_type,
-            embedding_types=['float'],
+
+        response = self.retry_policy.call(
+            self.client.chat,
+            **self.build_generation_request(prompt, chat_history, max_output_tokens, temperature)
         )
 
-        if not response or not response.embeddings or not response.embeddings.float:
-            self.logger.error("Error while embedding text with CoHere")
+        return self.parse_generation_response(response)
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.is_generation_ready(self.async_client):
             return None
-        
-        return response.embeddings.float[0]
+
+        response = await self.retry_policy.acall(
+            self.async_client.chat,
+            **self.build_generation_request(prompt, chat_history, max_output_tokens, temperature)
+        )
+
+        return self.parse_generation_response(response)
+    
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+
+        if not self.is_generation_ready(self.async_client):
+            return None
+
+        response = await self.retry_policy.acall(
+            self.async_client.chat,
+            **self.build_chat_request(messages, max_output_tokens, temperature)
+        )
+
+        text = self.parse_generation_response(response)
+        if text is None:
+            return None
+
+        return {"text": text, "usage": self.parse_chat_usage(response.meta)}
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+
+        if not self.is_generation_ready(self.async_client):
+            return
+
+        meta = None
+        async for event in self.async_client.chat_stream(
+            **self.build_chat_request(messages, max_output_tokens, temperature)
+        ):
+            if event.event_type == "text-generation":
+                yield {"text": event.text}
+            elif event.event_type == "stream-end" and event.response:
+                meta = event.response.meta
+
+        yield {"usage": self.parse_chat_usage(meta)}
+
+    def embed_text(self, text: str, document_type: str = None):
+        embeddings = self.embed_texts(texts=[text], document_type=document_type)
+        return embeddings[0] if embeddings else None
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        if not self.is_embedding_ready(self.client):
+            return None
+
+        response = self.retry_policy.call(
+            self.client.embed,
+            **self.build_embedding_request(texts, document_type)
+        )
+
+        return self.parse_embedding_response(response)
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        embeddings = await self.aembed_texts(texts=[text], document_type=document_type)
+        return embeddings[0] if embeddings else None
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        if not self.is_embedding_ready(self.async_client):
+            return None
+
+        response = await self.retry_policy.acall(
+            self.async_client.embed,
+            **self.build_embedding_request(texts, document_type)
+        )
+
+        return self.parse_embedding_response(response)
     
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
             "text": self.process_text(prompt)
-        }
\ No newline at end of file
+        }
@@ -0,0 +1,150 @@
+from ..LLMInterface import LLMInterface
+from ..LLMEnums import HuggingFaceEnums
+from ..HTTPClientPool import HTTPClientPool
+import logging
+import time
+
+class EmbeddingSidecarProvider(LLMInterface):
+    """
+    Embeddings served by the local embedding sidecar (embedding_sidecar.py)
+
+    In multi-worker mode every worker uses this provider instead of loading
+    its own copy of the model: requests go over a Unix socket to the one
+    sidecar process holding the model, which also micro-batches single
+    queries coming from all workers together.
+    """
+
+    def __init__(self, http_pool: HTTPClientPool,
+                       ready_timeout: float=30.0,
+                       default_input_max_characters: int=1000,
+                       default_generation_max_output_tokens: int=1000,
+                       default_generation_temperature: float=0.1):
+
+        self.ready_timeout = ready_timeout
+
+        self.default_input_max_characters = default_input_max_characters
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_generation_temperature = default_generation_temperature
+
+        self.generation_model_id = None
+
+        self.embedding_model_id = None
+        self.embedding_size = None
+
+        # http_pool is bound to the sidecar's Unix socket, the host is ignored
+        self.base_url = "http://embedding-sidecar"
+        self.http_pool = http_pool
+
+        self.enums = HuggingFaceEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str):
+        """Generation not implemented for this provider"""
+        self.generation_model_id = model_id
+        self.logger.warning("Text generation not implemented for EmbeddingSidecarProvider")
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        """Wait (up to ready_timeout) for the sidecar to have its model loaded and take its embedding size"""
+        self.embedding_model_id = model_id
+        self.embedding_size = embedding_size
+
+        client = self.http_pool.get_sync_client()
+        deadline = time.monotonic() + self.ready_timeout
+        while True:
+            try:
+                response = client.get(f"{self.base_url}/health/ready")
+                if response.status_code == 200:
+                    break
+            except Exception:
+                pass
+
+            if time.monotonic() > deadline:
+                raise Exception(f"Embedding sidecar at {self.http_pool.uds} is not ready")
+            time.sleep(0.5)
+
+        sidecar_model = response.json()
+        if sidecar_model["model_id"] != model_id:
+            self.logger.warning(
+                f"WARNING: Configured model ({model_id}) != sidecar model ({sidecar_model['model_id']})"
+            )
+            self.embedding_model_id = sidecar_model["model_id"]
+
+        self.embedding_size = sidecar_model["embedding_size"]
+
+    def process_text(self, text: str):
+        return text[:self.default_input_max_characters].strip()
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        """Text generation not supported by EmbeddingSidecarProvider"""
+        self.logger.error("Text generation not supported by EmbeddingSidecarProvider")
+        return None
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        """Text generation not supported by EmbeddingSidecarProvider"""
+        return self.generate_text(prompt=prompt, chat_history=chat_history,
+                                  max_output_tokens=max_output_tokens, temperature=temperature)
+
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        """Chat generation not supported by EmbeddingSidecarProvider"""
+        self.logger.error("Chat generation not supported by EmbeddingSidecarProvider")
+        return None
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        """Chat generation not supported by EmbeddingSidecarProvider"""
+        self.logger.error("Chat generation not supported by EmbeddingSidecarProvider")
+        return
+        yield
+
+    def build_embed_request(self, texts: list, document_type: str = None):
+        return {
+            "texts": [ self.process_text(text) for text in texts ],
+            "document_type": document_type,
+        }
+
+    def parse_embed_response(self, response, expected: int):
+        if response.status_code != 200:
+            self.logger.error(f"Embedding sidecar answered {response.status_code}")
+            return None
+
+        embeddings = response.json().get("embeddings")
+        if not embeddings or len(embeddings) != expected:
+            self.logger.error("Embedding sidecar returned incomplete result")
+            return None
+
+        return embeddings
+
+    def embed_text(self, text: str, document_type: str = None):
+        embeddings = self.embed_texts(texts=[text], document_type=document_type)
+        return embeddings[0] if embeddings else None
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        try:
+            response = self.http_pool.get_sync_client().post(
+                f"{self.base_url}/embed", json=self.build_embed_request(texts, document_type)
+            )
+            return self.parse_embed_response(response, expected=len(texts))
+        except Exception as e:
+            self.logger.error(f"Error while embedding texts with the embedding sidecar: {e}")
+            return None
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        embeddings = await self.aembed_texts(texts=[text], document_type=document_type)
+        return embeddings[0] if embeddings else None
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        try:
+            response = await self.http_pool.get_async_client().post(
+                f"{self.base_url}/embed", json=self.build_embed_request(texts, document_type)
+            )
+            return self.parse_embed_response(response, expected=len(texts))
+        except Exception as e:
+            self.logger.error(f"Error while embedding texts with the embedding sidecar: {e}")
+            return None
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": self.process_text(prompt)
+        }
@@ -1,6 +1,6 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import HuggingFaceEnums, DocumentTypeEnum
-from langchain_community.embeddings import HuggingFaceEmbeddings
+import asyncio
 import logging
 
 class LangChainHFProvider(LLMInterface):
@@ -36,6 +36,10 @@ class LangChainHFProvider(LLMInterface):
 
     def set_embedding_model(self, model_id: str, embedding_size: int):
         """Initialize embedding model using LangChain's HuggingFaceEmbeddings"""
+        # langchain_community and sentence-transformers take seconds to import,
+        # so they are only loaded once a model is actually set
+        from langchain_community.embeddings import HuggingFaceEmbeddings
+
         try:
             self.embedding_model_id = model_id
             self.embedding_size = embedding_size
@@ -82,7 +86,24 @@ class LangChainHFProvider(LLMInterface):
         """Text generation not supported by LangChainHFProvider"""
         self.logger.error("Text generation not supported by LangChainHFProvider")
         return None
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        """Text generation not supported by LangChainHFProvider"""
+        return self.generate_text(prompt=prompt, chat_history=chat_history,
+                                  max_output_tokens=max_output_tokens, temperature=temperature)
     
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        """Chat generation not supported by LangChainHFProvider"""
+        self.logger.error("Chat generation not supported by LangChainHFProvider")
+        return None
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        """Chat generation not supported by LangChainHFProvider"""
+        self.logger.error("Chat generation not supported by LangChainHFProvider")
+        return
+        yield
+
     def embed_text(self, text: str, document_type: str = None):
         """Generate embeddings using LangChain's HuggingFaceEmbeddings"""
         if not self.embedding_model:
@@ -109,6 +130,41 @@ class LangChainHFProvider(LLMInterface):
             self.logger.error(f"Error while embedding text: {e}")
             self.logger.exception("Full traceback:")
             return None
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        """Generate embeddings for a batch of texts in one forward pass"""
+        if not self.embedding_model:
+            self.logger.error("HuggingFace embedding model was not set")
+            return None
+
+        try:
+            processed_texts = [ self.process_text(text) for text in texts ]
+
+            if not all(processed_texts):
+                self.logger.error("Processed texts batch contains empty text")
+                return None
+
+            # LangChain's embed_documents batches the texts through the model
+            embeddings = self.embedding_model.embed_documents(processed_texts)
+
+            if not embeddings or len(embeddings) != len(texts):
+                self.logger.error("Batch embedding generation returned incomplete result")
+                return None
+
+            return embeddings
+
+        except Exception as e:
+            self.logger.error(f"Error while embedding texts batch: {e}")
+            self.logger.exception("Full traceback:")
+            return None
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        """Run the local model in a worker thread so the event loop is not blocked"""
+        return await asyncio.to_thread(self.embed_text, text, document_type)
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        """Run the local model in a worker thread so the event loop is not blocked"""
+        return await asyncio.to_thread(self.embed_texts, texts, document_type)
     
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -0,0 +1,206 @@
+from ..LLMInterface import LLMInterface
+from ..LLMEnums import HuggingFaceEnums
+import asyncio
+import logging
+import os
+
+class ONNXEmbeddingProvider(LLMInterface):
+    """
+    Local sentence-transformers embeddings run with ONNX Runtime on CPU
+
+    The model is exported to ONNX once (with optimum) into model_dir and,
+    when quantize is set, converted to dynamic int8. Texts are sorted by
+    length and embedded in batches padded only to their longest member,
+    then mean-pooled and L2-normalized like HuggingFaceEmbeddings with
+    normalize_embeddings=True.
+    """
+
+    def __init__(self, model_dir: str,
+                       quantize: bool=False,
+                       intra_op_threads: int=0,
+                       batch_size: int=32,
+                       max_length: int=256,
+                       default_input_max_characters: int=1000,
+                       default_generation_max_output_tokens: int=1000,
+                       default_generation_temperature: float=0.1):
+
+        self.model_dir = model_dir
+        self.quantize = quantize
+        self.intra_op_threads = intra_op_threads
+        self.batch_size = batch_size
+        self.max_length = max_length
+
+        self.default_input_max_characters = default_input_max_characters
+        self.default_generation_max_output_tokens = default_generation_max_output_tokens
+        self.default_generation_temperature = default_generation_temperature
+
+        self.generation_model_id = None
+
+        self.embedding_model_id = None
+        self.embedding_size = None
+        self.session = None
+        self.tokenizer = None
+        self.input_names = []
+
+        self.enums = HuggingFaceEnums
+        self.logger = logging.getLogger(__name__)
+
+    def set_generation_model(self, model_id: str):
+        """Generation not implemented for this provider"""
+        self.generation_model_id = model_id
+        self.logger.warning("Text generation not implemented for ONNXEmbeddingProvider")
+
+    def get_model_path(self, model_id: str) -> str:
+        """Export model_id to ONNX (and quantize it) unless already done, return the .onnx path"""
+        export_dir = os.path.join(self.model_dir, model_id.replace("/", "__"))
+        model_path = os.path.join(export_dir, "model.onnx")
+        quantized_path = os.path.join(export_dir, "model_quantized.onnx")
+
+        if not os.path.exists(model_path):
+            from optimum.onnxruntime import ORTModelForFeatureExtraction
+            from transformers import AutoTokenizer
+
+            self.logger.info(f"Exporting {model_id} to ONNX in {export_dir}")
+            ORTModelForFeatureExtraction.from_pretrained(model_id, export=True).save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_id).save_pretrained(export_dir)
+
+        if not self.quantize:
+            return model_path
+
+        if not os.path.exists(quantized_path):
+            from onnxruntime.quantization import quantize_dynamic, QuantType
+
+            self.logger.info(f"Quantizing {model_path} to int8")
+            quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+
+        return quantized_path
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        import onnxruntime
+        from transformers import AutoTokenizer
+
+        try:
+            self.embedding_model_id = model_id
+            self.embedding_size = embedding_size
+
+            model_path = self.get_model_path(model_id)
+
+            session_options = onnxruntime.SessionOptions()
+            session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self.intra_op_threads:
+                session_options.intra_op_num_threads = self.intra_op_threads
+
+            self.session = onnxruntime.InferenceSession(
+                model_path, sess_options=session_options, providers=["CPUExecutionProvider"]
+            )
+            self.input_names = [ model_input.name for model_input in self.session.get_inputs() ]
+            self.tokenizer = AutoTokenizer.from_pretrained(os.path.dirname(model_path))
+
+            self.logger.info(f"Loaded ONNX embedding model {model_path} "
+                             f"(quantized: {self.quantize}, intra-op threads: {self.intra_op_threads or 'auto'})")
+
+            actual_size = len(self.embed_batch(["test"])[0])
+            if actual_size != embedding_size:
+                self.logger.warning(
+                    f"WARNING: Configured size ({embedding_size}) != actual size ({actual_size})"
+                )
+                self.embedding_size = actual_size
+
+        except Exception as e:
+            self.logger.error(f"Error loading ONNX embedding model: {e}")
+            self.session = None
+            raise Exception(f"Failed to initialize ONNX embedding model: {e}")
+
+    def process_text(self, text: str):
+        return text[:self.default_input_max_characters].strip()
+
+    def embed_batch(self, texts: list):
+        import numpy as np
+
+        encoded = self.tokenizer(
+            texts, padding=True, truncation=True, max_length=self.max_length, return_tensors="np"
+        )
+        inputs = {
+            name: encoded[name].astype(np.int64) if name in encoded
+                  else np.zeros_like(encoded["input_ids"], dtype=np.int64)
+            for name in self.input_names
+        }
+
+        token_embeddings = self.session.run(None, inputs)[0]
+
+        # mean pooling over real tokens, then L2 normalization
+        mask = encoded["attention_mask"][..., None].astype(token_embeddings.dtype)
+        embeddings = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+        return embeddings.tolist()
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        """Text generation not supported by ONNXEmbeddingProvider"""
+        self.logger.error("Text generation not supported by ONNXEmbeddingProvider")
+        return None
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+        """Text generation not supported by ONNXEmbeddingProvider"""
+        return self.generate_text(prompt=prompt, chat_history=chat_history,
+                                  max_output_tokens=max_output_tokens, temperature=temperature)
+
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        """Chat generation not supported by ONNXEmbeddingProvider"""
+        self.logger.error("Chat generation not supported by ONNXEmbeddingProvider")
+        return None
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+        """Chat generation not supported by ONNXEmbeddingProvider"""
+        self.logger.error("Chat generation not supported by ONNXEmbeddingProvider")
+        return
+        yield
+
+    def embed_text(self, text: str, document_type: str = None):
+        embeddings = self.embed_texts(texts=[text], document_type=document_type)
+        return embeddings[0] if embeddings else None
+
+    def embed_texts(self, texts: list, document_type: str = None):
+        """Embed texts in length-sorted batches so each batch pads to similar lengths"""
+        if not self.session:
+            self.logger.error("ONNX embedding model was not set")
+            return None
+
+        try:
+            processed_texts = [ self.process_text(text) for text in texts ]
+
+            if not all(processed_texts):
+                self.logger.error("Processed texts batch contains empty text")
+                return None
+
+            order = sorted(range(len(processed_texts)), key=lambda i: len(processed_texts[i]))
+            embeddings = [None] * len(processed_texts)
+
+            for start in range(0, len(order), self.batch_size):
+                batch_indices = order[start:start + self.batch_size]
+                batch_embeddings = self.embed_batch([ processed_texts[i] for i in batch_indices ])
+                for i, embedding in zip(batch_indices, batch_embeddings):
+                    embeddings[i] = embedding
+
+            return embeddings
+
+        except Exception as e:
+            self.logger.error(f"Error while embedding texts batch with ONNX Runtime: {e}")
+            self.logger.exception("Full traceback:")
+            return None
+
+    async def aembed_text(self, text: str, document_type: str = None):
+        """Run the session in a worker thread so the event loop is not blocked"""
+        return await asyncio.to_thread(self.embed_text, text, document_type)
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+        """Run the session in a worker thread so the event loop is not blocked"""
+        return await asyncio.to_thread(self.embed_texts, texts, document_type)
+
+    def construct_prompt(self, prompt: str, role: str):
+        return {
+            "role": role,
+            "content": self.process_text(prompt)
+        }
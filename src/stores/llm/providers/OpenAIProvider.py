@@ -1,14 +1,44 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from ..HTTPClientPool import HTTPClientPool
+from ..RetryPolicy import RetryPolicy
+from functools import lru_cache
 import logging
 
+
+@lru_cache(maxsize=8)
+def get_tiktoken_encoding(model_id: str):
+    """
+    tiktoken encoding for a model id (OpenRouter ids are "vendor/model")
+
+    None without tiktoken or when its BPE file cannot be downloaded (offline
+    hosts), callers then fall back to the character estimate.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+
+    model_name = (model_id or "").split("/")[-1]
+    try:
+        try:
+            return tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            # non-OpenAI models behind OpenRouter: cl100k is a close enough count
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"tiktoken encoding unavailable for {model_id}, "
+                                            f"estimating token counts: {e}")
+        return None
+
 class OpenAIProvider(LLMInterface):
 
     def __init__(self, api_key: str, api_url: str=None,
                        default_input_max_characters: int=1000,
                        default_generation_max_output_tokens: int=1000,
-                       default_generation_temperature: float=0.1):
+                       default_generation_temperature: float=0.1,
+                       http_pool: HTTPClientPool=None,
+                       retry_policy: RetryPolicy=None):
         
         self.api_key = api_key
         self.api_url = api_url
@@ -22,9 +52,25 @@ class OpenAIProvider(LLMInterface):
         self.embedding_model_id = None
         self.embedding_size = None
 
+        self.http_pool = http_pool if http_pool else HTTPClientPool()
+        self.retry_policy = retry_policy if retry_policy else RetryPolicy()
+
+        # imported here so the SDK only loads when this backend is configured
+        from openai import OpenAI, AsyncOpenAI
+
+        # retries are handled by the retry policy, not by the SDK
         self.client = OpenAI(
             api_key = self.api_key,
-            base_url = self.api_url if self.api_url and len(self.api_url) else None
+            base_url = self.api_url if self.api_url and len(self.api_url) else None,
+            http_client = self.http_pool.get_sync_client(),
+            max_retries = 0,
+        )
+
+        self.async_client = AsyncOpenAI(
+            api_key = self.api_key,
+            base_url = self.api_url if self.api_url and len(self.api_url) else None,
+            http_client = self.http_pool.get_async_client(),
+            max_retries = 0,
         )
 
         self.enums = OpenAIEnums
@@ -40,17 +86,8 @@ class OpenAIProvider(LLMInterface):
     def process_text(self, text: str):
         return text[:self.default_input_max_characters].strip()
 
-    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
-                            temperature: float = None):
-        
-        if not self.client:
-            self.logger.error("OpenAI client was not set")
-            return None
-
-        if not self.generation_model_id:
-            self.logger.error("Generation model for OpenAI was not set")
-            return None
-        
+    def build_generation_request(self, prompt: str, chat_history: list, max_output_tokens: int,
+                                       temperature: float):
         max_output_tokens = max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens
         temperature = temperature if temperature else self.default_generation_temperature
 
@@ -58,48 +95,203 @@ class OpenAIProvider(LLMInterface):
             self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
         )
 
-        response = self.client.chat.completions.create(
-            model = self.generation_model_id,
-            messages = chat_history,
-            max_tokens = max_output_tokens,
-            temperature = temperature
-        )
+        return {
+            "model": self.generation_model_id,
+            "messages": chat_history,
+            "max_tokens": max_output_tokens,
+            "temperature": temperature,
+        }
 
+    def parse_generation_response(self, response):
         if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
             self.logger.error("Error while generating text with OpenAI")
             return None
 
         return response.choices[0].message.content
 
+    def build_chat_request(self, messages: list, max_output_tokens: int, temperature: float,
+                                 stream: bool=False):
+        # messages are sent as given (not truncated): callers bound the prompt size,
+        # and an unchanged system message first keeps the cacheable prefix stable
+        request = {
+            "model": self.generation_model_id,
+            "messages": [
+                { "role": message["role"], "content": message["content"] }
+                for message in messages
+            ],
+            "max_tokens": max_output_tokens if max_output_tokens else self.default_generation_max_output_tokens,
+            "temperature": temperature if temperature is not None else self.default_generation_temperature,
+        }
+
+        if stream:
+            request["stream"] = True
+            request["stream_options"] = {"include_usage": True}
 
-    def embed_text(self, text: str, document_type: str = None):
-        
-        if not self.client:
-            self.logger.error("OpenAI client was not set")
+        return request
+
+    def parse_chat_usage(self, usage):
+        if not usage:
+            return {"prompt_tokens": None, "completion_tokens": None, "cached_tokens": None}
+
+        # prompt_tokens_details.cached_tokens is reported by OpenAI-compatible prefix caching
+        details = getattr(usage, "prompt_tokens_details", None)
+        if isinstance(details, dict):
+            cached_tokens = details.get("cached_tokens")
+        else:
+            cached_tokens = getattr(details, "cached_tokens", None)
+
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "cached_tokens": cached_tokens or 0,
+        }
+
+    def parse_embedding_response(self, response, expected_count: int):
+        if not response or not response.data or len(response.data) != expected_count \
+                or not response.data[0].embedding:
+            self.logger.error("Error while embedding text with OpenAI")
             return None
 
+        return [ record.embedding for record in response.data ]
+
+    def is_generation_ready(self, client):
+        if not client:
+            self.logger.error("OpenAI client was not set")
+            return False
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model for OpenAI was not set")
+            return False
+
+        return True
+
+    def is_embedding_ready(self, client):
+        if not client:
+            self.logger.error("OpenAI client was not set")
+            return False
+
         if not self.embedding_model_id:
             self.logger.error("Embedding model for OpenAI was not set")
+            return False
+
+        return True
+
+    def generate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                            temperature: float = None):
+        
+        if not self.is_generation_ready(self.client):
+            return None
+
+        response = self.retry_policy.call(
+            self.client.chat.completions.create,
+            **self.build_generation_request(prompt, chat_history, max_output_tokens, temperature)
+        )
+
+        return self.parse_generation_response(response)
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None):
+
+        if not self.is_generation_ready(self.async_client):
+            return None
+
+        response = await self.retry_policy.acall(
+            self.async_client.chat.completions.create,
+            **self.build_generation_request(prompt, list(chat_history), max_output_tokens, temperature)
+        )
+
+        return self.parse_generation_response(response)
+
+    async def achat(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+
+        if not self.is_generation_ready(self.async_client):
+            return None
+
+        response = await self.retry_policy.acall(
+            self.async_client.chat.completions.create,
+            **self.build_chat_request(messages, max_output_tokens, temperature)
+        )
+
+        text = self.parse_generation_response(response)
+        if text is None:
+            return None
+
+        return {"text": text, "usage": self.parse_chat_usage(response.usage)}
+
+    async def achat_stream(self, messages: list, max_output_tokens: int=None, temperature: float=None):
+
+        if not self.is_generation_ready(self.async_client):
+            return
+
+        # only opening the stream is retried, a stream broken midway is raised
+        stream = await self.retry_policy.acall(
+            self.async_client.chat.completions.create,
+            **self.build_chat_request(messages, max_output_tokens, temperature, stream=True)
+        )
+
+        usage = None
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                yield {"text": chunk.choices[0].delta.content}
+            if getattr(chunk, "usage", None):
+                usage = chunk.usage
+
+        yield {"usage": self.parse_chat_usage(usage)}
+
+    def embed_text(self, text: str, document_type: str = None):
+        
+        if not self.is_embedding_ready(self.client):
             return None
         
-        response = self.client.embeddings.create(
+        response = self.retry_policy.call(
+            self.client.embeddings.create,
             model = self.embedding_model_id,
             input = text,
         )
 
-        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
-            self.logger.error("Error while embedding text with OpenAI")
+        embeddings = self.parse_embedding_response(response, expected_count=1)
+        return embeddings[0] if embeddings else None
+
+    def embed_texts(self, texts: list, document_type: str = None):
+
+        if not self.is_embedding_ready(self.client):
+            return None
+
+        response = self.retry_policy.call(
+            self.client.embeddings.create,
+            model = self.embedding_model_id,
+            input = texts,
+        )
+
+        return self.parse_embedding_response(response, expected_count=len(texts))
+
+    async def aembed_text(self, text: str, document_type: str = None):
+
+        embeddings = await self.aembed_texts(texts=[text], document_type=document_type)
+        return embeddings[0] if embeddings else None
+
+    async def aembed_texts(self, texts: list, document_type: str = None):
+
+        if not self.is_embedding_ready(self.async_client):
             return None
 
-        return response.data[0].embedding
+        response = await self.retry_policy.acall(
+            self.async_client.embeddings.create,
+            model = self.embedding_model_id,
+            input = texts,
+        )
+
+        return self.parse_embedding_response(response, expected_count=len(texts))
 
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
             "content": self.process_text(prompt)
         }
-    
-
 
-    
+    def count_tokens(self, text: str) -> int:
+        encoding = get_tiktoken_encoding(self.generation_model_id)
+        if encoding is None:
+            return super().count_tokens(text)
 
+        return len(encoding.encode(text or "", disallowed_special=()))
@@ -1,5 +1,7 @@
 from .OpenAIProvider import OpenAIProvider
 from .CoHereProvider import CoHereProvider
 from .LangChainHFProvider import LangChainHFProvider
+from .ONNXEmbeddingProvider import ONNXEmbeddingProvider
+from .EmbeddingSidecarProvider import EmbeddingSidecarProvider
 
-__all__ = ['OpenAIProvider', 'CoHereProvider', 'LangChainHFProvider']
\ No newline at end of file
+__all__ = ['OpenAIProvider', 'CoHereProvider', 'LangChainHFProvider', 'ONNXEmbeddingProvider', 'EmbeddingSidecarProvider']
\ No newline at end of file
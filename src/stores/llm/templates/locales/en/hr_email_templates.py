@@ -0,0 +1,57 @@
+from string import Template
+
+#### HR EMAIL TEMPLATES ####
+# Deterministic emails rendered without the LLM when the request
+# carries every field the email type needs.
+
+#### Interview Invitation ####
+interview_invitation = Template("\n".join([
+    "**Subject:** Interview Invitation - $position",
+    "",
+    "$greeting",
+    "",
+    "Thank you for your interest in the **$position** position. We are pleased to invite you to an interview.",
+    "",
+    "- **Date:** $date",
+    "- **Time:** $time",
+    "- **Location:** $location",
+    "$additional_details",
+    "Please confirm your availability by replying to this email. If the proposed time does not suit you, let us know and we will find an alternative.",
+    "",
+    "$closing",
+    "HR Team",
+]))
+
+#### Reminder ####
+reminder = Template("\n".join([
+    "**Subject:** Reminder: $subject",
+    "",
+    "$greeting",
+    "",
+    "This is a friendly reminder about **$subject**.",
+    "",
+    "- **Date:** $date",
+    "$additional_details",
+    "If you have any questions, please do not hesitate to contact the HR team.",
+    "",
+    "$closing",
+    "HR Team",
+]))
+
+#### Performance Review ####
+performance_review = Template("\n".join([
+    "**Subject:** Performance Review Meeting",
+    "",
+    "$greeting",
+    "",
+    "We would like to invite you to your performance review meeting.",
+    "",
+    "- **Date:** $date",
+    "- **Time:** $time",
+    "- **Location:** $location",
+    "$additional_details",
+    "Please take some time beforehand to reflect on your achievements, challenges and goals for the coming period.",
+    "",
+    "$closing",
+    "HR Team",
+]))
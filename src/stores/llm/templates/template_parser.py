@@ -1,43 +1,136 @@
+import importlib
 import os
+import threading
+from string import Template
 
 class TemplateParser:
+    """
+    Prompt templates of every locale, loaded once into an in-memory registry
+
+    Each locale group module (locales/<language>/<group>.py) is imported at
+    construction; get() is then a dictionary lookup. Call reload() after
+    editing a locale file to pick up the changes without a restart.
+    """
+
+    LOCALES_PACKAGE = "stores.llm.templates.locales"
 
     def __init__(self, language: str=None, default_language='en'):
         self.current_path = os.path.dirname(os.path.abspath(__file__))
         self.default_language = default_language
         self.language = None
 
+        # (language, group) -> {key: Template}
+        self.registry = {}
+        # (language, group, key) -> template split into literal and placeholder parts
+        self.compiled = {}
+        self.lock = threading.Lock()
+
+        self.load()
         self.set_language(language)
 
-    
-    def set_language(self, language: str):
-        if not language:
-            self.language = self.default_language
+    def load(self, reload_modules: bool=False):
+        registry = {}
+        locales_path = os.path.join(self.current_path, "locales")
+
+        for language in sorted(os.listdir(locales_path)):
+            language_path = os.path.join(locales_path, language)
+            if not os.path.isdir(language_path) or language.startswith("__"):
+                continue
+
+            for file_name in sorted(os.listdir(language_path)):
+                if not file_name.endswith(".py") or file_name.startswith("__"):
+                    continue
 
-        language_path = os.path.join(self.current_path, "locales", language)
-        if os.path.exists(language_path):
+                group = file_name[:-len(".py")]
+                module = importlib.import_module(f"{self.LOCALES_PACKAGE}.{language}.{group}")
+                if reload_modules:
+                    module = importlib.reload(module)
+
+                registry[(language, group)] = {
+                    key: value
+                    for key, value in vars(module).items()
+                    if isinstance(value, Template)
+                }
+
+        # swap both maps at once so concurrent readers never see a partial registry
+        with self.lock:
+            self.registry = registry
+            self.compiled = {}
+
+    def reload(self):
+        """Re-import every locale module and rebuild the registry"""
+        self.load(reload_modules=True)
+
+    def get_languages(self):
+        return sorted({ language for language, _ in self.registry })
+
+    def set_language(self, language: str):
+        if language and language in self.get_languages():
             self.language = language
         else:
             self.language = self.default_language
 
-    def get(self, group: str, key: str, vars: dict={}):
+    def get_template(self, group: str, key: str):
         if not group or not key:
             return None
-        
-        group_path = os.path.join(self.current_path, "locales", self.language, f"{group}.py" )
-        targeted_language = self.language
-        if not os.path.exists(group_path):
-            group_path = os.path.join(self.current_path, "locales", self.default_language, f"{group}.py" )
-            targeted_language = self.default_language
-
-        if not os.path.exists(group_path):
+
+        templates = self.registry.get((self.language, group))
+        if templates is None:
+            templates = self.registry.get((self.default_language, group))
+
+        if not templates:
             return None
-        
-        # import group module
-        module = __import__(f"stores.llm.templates.locales.{targeted_language}.{group}", fromlist=[group])
 
-        if not module:
+        return templates.get(key)
+
+    def get(self, group: str, key: str, vars: dict={}):
+        template = self.get_template(group, key)
+        if template is None:
+            return None
+
+        return template.substitute(vars)
+
+    def compile(self, template: Template):
+        # split once into [literal, placeholder, literal, ...] so rendering many
+        # documents is list appends instead of a regex pass per document
+        parts, position = [], 0
+        for match in template.pattern.finditer(template.template):
+            literal = template.template[position:match.start()]
+            position = match.end()
+
+            if match.group("escaped") is not None:
+                parts.append((literal + template.delimiter, None))
+            elif match.group("named") is not None or match.group("braced") is not None:
+                parts.append((literal, match.group("named") or match.group("braced")))
+            else:
+                raise ValueError(f"Invalid placeholder in template: {template.template!r}")
+
+        parts.append((template.template[position:], None))
+        return parts
+
+    def render_block(self, group: str, key: str, vars_list: list, separator: str="\n\n"):
+        """
+        Render one template for every vars dict and join the results, in a single pass
+
+        Equivalent to separator.join(get(group, key, vars) for vars in vars_list).
+        """
+        template = self.get_template(group, key)
+        if template is None:
             return None
-        
-        key_attribute = getattr(module, key)
-        return key_attribute.substitute(vars)
+
+        compiled_key = (self.language, group, key)
+        parts = self.compiled.get(compiled_key)
+        if parts is None:
+            parts = self.compile(template)
+            self.compiled[compiled_key] = parts
+
+        output = []
+        for index, template_vars in enumerate(vars_list):
+            if index:
+                output.append(separator)
+            for literal, name in parts:
+                output.append(literal)
+                if name is not None:
+                    output.append(str(template_vars[name]))
+
+        return "".join(output)
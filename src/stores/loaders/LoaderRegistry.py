@@ -0,0 +1,89 @@
+from .providers import TextSegmentLoader, DocxLoader, HTMLLoader, CSVLoader, XLSXLoader
+from models import ProcessingEnum
+
+class LoaderRegistry:
+    """
+    Registry of document loaders keyed by file extension and MIME type
+
+    Each entry holds a factory(file_path, segment_size, max_characters) returning a
+    langchain loader whose lazy_load() streams the file as Documents, so every
+    file type is consumed the same way by ProcessController.
+    """
+
+    def __init__(self):
+        self.loaders = {}
+
+    def register(self, extension: str, mime_type: str, factory):
+        self.loaders[extension.lower()] = {
+            "mime_type": mime_type,
+            "factory": factory,
+        }
+
+    def get_extensions(self):
+        return list(self.loaders.keys())
+
+    def get_mime_type(self, extension: str):
+        entry = self.loaders.get(extension.lower()) if extension else None
+        return entry["mime_type"] if entry else None
+
+    def get_extension(self, mime_type: str):
+        for extension, entry in self.loaders.items():
+            if entry["mime_type"] == mime_type:
+                return extension
+        return None
+
+    def create(self, file_path: str, extension: str=None, mime_type: str=None,
+                     segment_size: int=512000, max_characters: int=1000):
+        if not extension and mime_type:
+            extension = self.get_extension(mime_type)
+
+        entry = self.loaders.get(extension.lower()) if extension else None
+        if not entry:
+            return None
+
+        return entry["factory"](
+            file_path=file_path,
+            segment_size=segment_size,
+            max_characters=max_characters,
+        )
+
+
+def create_pdf_loader(file_path: str, segment_size: int, max_characters: int):
+    # langchain_community and PyMuPDF (fitz) are only imported when a PDF is processed
+    from langchain_community.document_loaders import PyMuPDFLoader
+    return PyMuPDFLoader(file_path)
+
+
+loader_registry = LoaderRegistry()
+
+loader_registry.register(
+    ProcessingEnum.TXT.value, "text/plain",
+    lambda file_path, segment_size, max_characters: TextSegmentLoader(file_path, segment_size=segment_size)
+)
+loader_registry.register(
+    ProcessingEnum.MD.value, "text/markdown",
+    lambda file_path, segment_size, max_characters: TextSegmentLoader(file_path, segment_size=segment_size)
+)
+loader_registry.register(
+    ProcessingEnum.PDF.value, "application/pdf", create_pdf_loader
+)
+loader_registry.register(
+    ProcessingEnum.DOCX.value, "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    lambda file_path, segment_size, max_characters: DocxLoader(file_path, segment_size=segment_size)
+)
+loader_registry.register(
+    ProcessingEnum.HTML.value, "text/html",
+    lambda file_path, segment_size, max_characters: HTMLLoader(file_path, segment_size=segment_size)
+)
+loader_registry.register(
+    ProcessingEnum.HTM.value, "text/html",
+    lambda file_path, segment_size, max_characters: HTMLLoader(file_path, segment_size=segment_size)
+)
+loader_registry.register(
+    ProcessingEnum.CSV.value, "text/csv",
+    lambda file_path, segment_size, max_characters: CSVLoader(file_path, max_characters=max_characters)
+)
+loader_registry.register(
+    ProcessingEnum.XLSX.value, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    lambda file_path, segment_size, max_characters: XLSXLoader(file_path, max_characters=max_characters)
+)
@@ -0,0 +1,42 @@
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+from typing import Iterator
+import docx
+
+class DocxLoader(BaseLoader):
+    """
+    Read a DOCX file (paragraphs and tables, in document order) as segments
+    of roughly segment_size characters
+    """
+
+    def __init__(self, file_path: str, segment_size: int=512000):
+        self.file_path = file_path
+        self.segment_size = segment_size
+
+    def iter_blocks(self, document) -> Iterator[str]:
+        """Yield paragraphs and table rows in the order they appear in the body"""
+        paragraphs = {p._element: p for p in document.paragraphs}
+        tables = {t._element: t for t in document.tables}
+
+        for element in document.element.body.iterchildren():
+            if element in paragraphs:
+                yield paragraphs[element].text
+            elif element in tables:
+                for row in tables[element].rows:
+                    yield " | ".join(cell.text.strip() for cell in row.cells)
+                yield ""
+
+    def lazy_load(self) -> Iterator[Document]:
+        document = docx.Document(self.file_path)
+        buffer, buffer_size = [], 0
+
+        for block in self.iter_blocks(document):
+            buffer.append(block)
+            buffer_size += len(block) + 1
+
+            if buffer_size >= self.segment_size:
+                yield Document(page_content="\n".join(buffer), metadata={"source": self.file_path})
+                buffer, buffer_size = [], 0
+
+        if buffer:
+            yield Document(page_content="\n".join(buffer), metadata={"source": self.file_path})
@@ -0,0 +1,94 @@
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+from bs4 import BeautifulSoup, NavigableString, Tag
+from typing import Iterator
+
+class HTMLLoader(BaseLoader):
+    """
+    Read the visible text of an HTML file as segments of roughly segment_size characters,
+    cut at heading boundaries where possible
+    """
+
+    heading_tags = ["h1", "h2", "h3", "h4", "h5", "h6"]
+    block_tags = heading_tags + ["p", "li", "tr", "pre", "blockquote"]
+    # layout elements whose loose text (outside any block tag) forms its own block
+    container_tags = {"body", "div", "section", "article", "main", "header", "aside", "form",
+                      "ul", "ol", "dl", "dt", "dd", "table", "thead", "tbody", "tfoot", "td", "th",
+                      "figure", "figcaption", "details", "summary"}
+
+    def __init__(self, file_path: str, segment_size: int=512000, encoding: str="utf-8"):
+        self.file_path = file_path
+        self.segment_size = segment_size
+        self.encoding = encoding
+
+    def iter_blocks(self, element: Tag) -> Iterator[tuple]:
+        """
+        Yield (tag name, text) for the blocks under element in document order
+
+        A block tag without nested blocks is emitted whole. Text outside of those
+        (directly in a <div>, in <span>s, the lead text of an <li> wrapping a <p>)
+        is gathered per container into a "text" block, so none of it is dropped.
+        """
+        loose_text = []
+
+        def flush():
+            text = " ".join("".join(loose_text).split())
+            loose_text.clear()
+            return text
+
+        for child in element.children:
+            if isinstance(child, NavigableString):
+                # comments, doctypes and CDATA are NavigableString subclasses
+                if type(child) is NavigableString:
+                    loose_text.append(str(child))
+                continue
+
+            if not isinstance(child, Tag):
+                continue
+
+            has_nested_blocks = child.find(self.block_tags) is not None
+            if child.name in self.block_tags and not has_nested_blocks:
+                if text := flush():
+                    yield "text", text
+                yield child.name, child.get_text(separator=" ", strip=True)
+            elif child.name in self.block_tags or child.name in self.container_tags or has_nested_blocks:
+                if text := flush():
+                    yield "text", text
+                yield from self.iter_blocks(child)
+            else:
+                loose_text.append(child.get_text())
+
+        if text := flush():
+            yield "text", text
+
+    def lazy_load(self) -> Iterator[Document]:
+        with open(self.file_path, "r", encoding=self.encoding) as f:
+            soup = BeautifulSoup(f, "html.parser")
+
+        title = soup.title.string.strip() if soup.title and soup.title.string else None
+        root = soup.body or soup
+        for irrelevant in root(["script", "style", "input", "img", "nav", "footer", "head", "title"]):
+            irrelevant.decompose()
+
+        metadata = {"source": self.file_path}
+        if title:
+            metadata["title"] = title
+
+        buffer, buffer_size = [], 0
+        for name, text in self.iter_blocks(root):
+            if not text:
+                continue
+
+            if name in self.heading_tags and buffer_size >= self.segment_size // 2:
+                yield Document(page_content="\n\n".join(buffer), metadata=dict(metadata))
+                buffer, buffer_size = [], 0
+
+            buffer.append(text)
+            buffer_size += len(text) + 2
+
+            if buffer_size >= self.segment_size:
+                yield Document(page_content="\n\n".join(buffer), metadata=dict(metadata))
+                buffer, buffer_size = [], 0
+
+        if buffer:
+            yield Document(page_content="\n\n".join(buffer), metadata=dict(metadata))
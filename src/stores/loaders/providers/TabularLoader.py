@@ -0,0 +1,96 @@
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+from abc import ABC, abstractmethod
+from typing import Iterator
+import openpyxl
+import csv
+
+class TabularLoader(BaseLoader, ABC):
+    """
+    Base class for row-oriented files (CSV, XLSX)
+
+    Rows are rendered as "column: value" lines and emitted in row groups of at most
+    max_characters characters / max_rows rows, so every row group becomes one chunk
+    (marked with row_group metadata) and a row is never split across chunks.
+    """
+
+    def __init__(self, file_path: str, max_characters: int=1000, max_rows: int=50):
+        self.file_path = file_path
+        self.max_characters = max_characters
+        self.max_rows = max_rows
+
+    @abstractmethod
+    def iter_sheets(self) -> Iterator[tuple]:
+        """Yield (sheet_name, rows iterator) pairs; the first row of each sheet is its header"""
+        pass
+
+    def format_row(self, header: list, row: list) -> str:
+        return " | ".join(
+            f"{column}: {value}"
+            for column, value in zip(header, row)
+            if value is not None and str(value).strip() != ""
+        )
+
+    def build_row_group(self, sheet_name: str, lines: list, row_start: int, row_end: int) -> Document:
+        metadata = {
+            "source": self.file_path,
+            "row_group": True,
+            "row_start": row_start,
+            "row_end": row_end,
+        }
+        if sheet_name:
+            metadata["sheet"] = sheet_name
+
+        return Document(page_content="\n".join(lines), metadata=metadata)
+
+    def lazy_load(self) -> Iterator[Document]:
+        for sheet_name, rows in self.iter_sheets():
+            header = None
+            lines, size, row_start, row_end = [], 0, 1, 1
+
+            for row_no, row in enumerate(rows):
+                if header is None:
+                    header = [
+                        str(column).strip() if column is not None else f"column_{i + 1}"
+                        for i, column in enumerate(row)
+                    ]
+                    continue
+
+                line = self.format_row(header, row)
+                if not line:
+                    continue
+
+                if lines and (size + len(line) > self.max_characters or len(lines) >= self.max_rows):
+                    yield self.build_row_group(sheet_name, lines, row_start, row_end)
+                    lines, size, row_start = [], 0, row_no
+
+                lines.append(line)
+                size += len(line) + 1
+                row_end = row_no
+
+            if lines:
+                yield self.build_row_group(sheet_name, lines, row_start, row_end)
+
+
+class CSVLoader(TabularLoader):
+
+    def __init__(self, file_path: str, max_characters: int=1000, max_rows: int=50,
+                       encoding: str="utf-8"):
+        super().__init__(file_path=file_path, max_characters=max_characters, max_rows=max_rows)
+        self.encoding = encoding
+
+    def iter_sheets(self) -> Iterator[tuple]:
+        with open(self.file_path, "r", encoding=self.encoding, newline="") as f:
+            yield None, csv.reader(f)
+
+
+class XLSXLoader(TabularLoader):
+
+    def iter_sheets(self) -> Iterator[tuple]:
+        # read_only mode streams rows instead of loading the whole workbook
+        workbook = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
+        try:
+            for worksheet in workbook.worksheets:
+                yield worksheet.title, worksheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
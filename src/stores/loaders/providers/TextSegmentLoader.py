@@ -0,0 +1,32 @@
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+from typing import Iterator
+
+class TextSegmentLoader(BaseLoader):
+    """
+    Lazily read a text file as paragraph-aligned segments of roughly segment_size characters
+
+    The whole file is never held in memory: a segment is emitted at the first blank
+    line after segment_size characters (or hard-cut at a line boundary after twice that).
+    """
+
+    def __init__(self, file_path: str, segment_size: int=512000, encoding: str="utf-8"):
+        self.file_path = file_path
+        self.segment_size = segment_size
+        self.encoding = encoding
+
+    def lazy_load(self) -> Iterator[Document]:
+        buffer, buffer_size = [], 0
+
+        with open(self.file_path, "r", encoding=self.encoding) as f:
+            for line in f:
+                buffer.append(line)
+                buffer_size += len(line)
+
+                at_paragraph_break = buffer_size >= self.segment_size and not line.strip()
+                if at_paragraph_break or buffer_size >= 2 * self.segment_size:
+                    yield Document(page_content="".join(buffer), metadata={"source": self.file_path})
+                    buffer, buffer_size = [], 0
+
+        if buffer:
+            yield Document(page_content="".join(buffer), metadata={"source": self.file_path})
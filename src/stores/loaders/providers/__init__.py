@@ -0,0 +1,6 @@
+from .TextSegmentLoader import TextSegmentLoader
+from .DocxLoader import DocxLoader
+from .HTMLLoader import HTMLLoader
+from .TabularLoader import CSVLoader, XLSXLoader
+
+__all__ = ['TextSegmentLoader', 'DocxLoader', 'HTMLLoader', 'CSVLoader', 'XLSXLoader']
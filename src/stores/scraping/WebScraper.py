@@ -0,0 +1,204 @@
+from stores.llm.HTTPClientPool import HTTPClientPool
+from stores.llm.GenerationCache import GenerationCache
+from helpers.metrics import CACHE_REQUESTS
+from bs4 import BeautifulSoup
+from typing import List, Optional
+from urllib.parse import urljoin, urlsplit, urlunsplit
+import asyncio
+import json
+import logging
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+class WebPage:
+    """Title, visible text and same-domain links of one scraped page"""
+
+    def __init__(self, url: str, title: str, text: str, links: List[str], depth: int=0,
+                 from_cache: bool=False):
+        self.url = url
+        self.title = title
+        self.text = text
+        self.links = links
+        self.depth = depth
+        self.from_cache = from_cache
+
+    def get_content(self) -> str:
+        return f"website title:\n {self.title}\n webpage content: \n {self.text}\n\n"
+
+
+class WebScraper:
+    """
+    Async scraper on a pooled HTTP client
+
+    Responses carrying an ETag or Last-Modified header are kept in a local
+    response cache and revalidated with conditional requests, so an unchanged
+    page costs a 304. crawl() optionally follows same-domain links breadth
+    first, bounded by depth, a page budget and a concurrency limit.
+    """
+
+    def __init__(self, http_pool: HTTPClientPool, response_cache: GenerationCache=None,
+                 max_concurrency: int=5, max_page_bytes: int=2 * 1024 * 1024):
+        self.http_pool = http_pool
+        self.response_cache = response_cache
+        self.max_concurrency = max_concurrency
+        self.max_page_bytes = max_page_bytes
+
+        self.logger = logging.getLogger(__name__)
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        parts = urlsplit(url.strip())
+        return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+    @staticmethod
+    def get_domain(url: str) -> str:
+        netloc = urlsplit(url).netloc.lower()
+        return netloc[len("www."):] if netloc.startswith("www.") else netloc
+
+    def get_cache_key(self, url: str) -> str:
+        return self.response_cache.make_key(namespace="http_response", payload={"url": url})
+
+    async def get_cached_response(self, url: str) -> Optional[dict]:
+        if not self.response_cache or not self.response_cache.enabled:
+            return None
+
+        cached = await asyncio.to_thread(self.response_cache.get, self.get_cache_key(url))
+        return json.loads(cached) if cached else None
+
+    async def set_cached_response(self, url: str, response: dict):
+        if not self.response_cache or not self.response_cache.enabled:
+            return
+
+        # the entry is revalidated on every fetch, its TTL is the cache's default_ttl
+        await asyncio.to_thread(self.response_cache.set, self.get_cache_key(url), json.dumps(response))
+
+    async def fetch(self, url: str):
+        """
+        Fetch a page, revalidating a cached copy with If-None-Match / If-Modified-Since
+
+        Returns:
+            Tuple of the final url, the html text and whether the cached copy was used
+        """
+        cached = await self.get_cached_response(url)
+
+        headers = {}
+        if cached:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        client = self.http_pool.get_async_client()
+        async with client.stream("GET", url, headers=headers) as response:
+            if response.status_code == 304 and cached:
+                CACHE_REQUESTS.labels(cache="web_pages", status="not_modified").inc()
+                return cached["url"], cached["html"], True
+
+            CACHE_REQUESTS.labels(cache="web_pages", status="modified" if cached else "miss").inc()
+
+            response.raise_for_status()
+
+            content_type = response.headers.get("content-type", "")
+            if "html" not in content_type and "text" not in content_type:
+                raise ValueError(f"Unsupported content type {content_type} for {url}")
+
+            # stop downloading at max_page_bytes instead of buffering the whole body
+            body = bytearray()
+            async for block in response.aiter_bytes():
+                body += block
+                if len(body) >= self.max_page_bytes:
+                    break
+
+        html = bytes(body[:self.max_page_bytes]).decode(response.charset_encoding or "utf-8", errors="replace")
+        final_url = str(response.url)
+
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if etag or last_modified:
+            await self.set_cached_response(url, {
+                "url": final_url,
+                "html": html,
+                "etag": etag,
+                "last_modified": last_modified,
+            })
+
+        return final_url, html, False
+
+    def parse_page(self, url: str, html: str, depth: int=0, from_cache: bool=False) -> WebPage:
+        soup = BeautifulSoup(html, HTML_PARSER)
+        title = soup.title.string.strip() if soup.title and soup.title.string else "No title found"
+
+        domain = self.get_domain(url)
+        links = []
+        for anchor in soup.find_all("a", href=True):
+            link = self.normalize_url(urljoin(url, anchor["href"]))
+            if link.startswith(("http://", "https://")) and self.get_domain(link) == domain \
+                    and link not in links:
+                links.append(link)
+
+        root = soup.body if soup.body else soup
+        for irrelevant in root(['script', 'style', 'input', 'img', 'noscript', 'svg']):
+            irrelevant.decompose()
+        text = root.get_text(separator='\n', strip=True)
+
+        return WebPage(url=url, title=title, text=text, links=links, depth=depth, from_cache=from_cache)
+
+    async def scrape(self, url: str, depth: int=0) -> WebPage:
+        final_url, html, from_cache = await self.fetch(url)
+
+        # parsing is CPU bound, keep it off the event loop
+        return await asyncio.to_thread(self.parse_page, final_url, html, depth, from_cache)
+
+    async def crawl(self, url: str, max_depth: int=0, max_pages: int=1) -> List[WebPage]:
+        """
+        Scrape url and, up to max_depth link hops away, its same-domain pages
+
+        Args:
+            url: Landing page, its failure is raised
+            max_depth: 0 scrapes the landing page only
+            max_pages: Total page budget, landing page included
+
+        Returns:
+            Scraped pages in crawl order, landing page first; sub-pages that
+            fail are logged and skipped
+        """
+        landing_page = await self.scrape(self.normalize_url(url))
+        pages = [landing_page]
+        seen = {self.normalize_url(url), landing_page.url}
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def scrape_one(link: str, depth: int):
+            async with semaphore:
+                try:
+                    return await self.scrape(link, depth=depth)
+                except Exception as e:
+                    self.logger.warning(f"Skipping {link}: {e}")
+                    return None
+
+        frontier = [landing_page]
+        for depth in range(1, max_depth + 1):
+            links = []
+            for page in frontier:
+                for link in page.links:
+                    if link not in seen and len(pages) + len(links) < max_pages:
+                        seen.add(link)
+                        links.append(link)
+
+            if not links:
+                break
+
+            results = await asyncio.gather(*[scrape_one(link, depth) for link in links])
+            frontier = [page for page in results if page is not None]
+            pages.extend(frontier)
+            seen.update(page.url for page in frontier)
+
+        return pages
+
+    async def close(self):
+        await self.http_pool.close()
@@ -49,4 +49,8 @@ class VectorDBInterface(ABC):
     @abstractmethod
     def search_by_vector(self, collection_name: str, vector: list, limit: int) -> List[RetrievedDocument]:
         pass
+
+    @abstractmethod
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int) -> List[List[RetrievedDocument]]:
+        pass
     
\ No newline at end of file
@@ -1,4 +1,3 @@
-from .providers import QdrantDBProvider
 from .VectorDBEnums import VectorDBEnums
 from controllers.BaseController import BaseController
 
@@ -9,11 +8,15 @@ class VectorDBProviderFactory:
 
     def create(self, provider: str):
         if provider == VectorDBEnums.QDRANT.value:
+            # qdrant_client is only imported once the vector db is created
+            from .providers import QdrantDBProvider
+
             db_path = self.base_controller.get_database_path(db_name=self.config.VECTOR_DB_PATH)
 
             return QdrantDBProvider(
                 db_path=db_path,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                url=self.config.VECTOR_DB_URL,
             )
         
         return None
@@ -4,13 +4,21 @@ from ..VectorDBEnums import DistanceMethodEnums
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument
+from helpers.tracing import traced
+
+
+def collection_attributes(call: dict) -> dict:
+    return {"db.system": "qdrant", "db.collection": call.get("collection_name")}
+
 
 class QdrantDBProvider(VectorDBInterface):
 
-    def __init__(self, db_path: str, distance_method: str):
+    def __init__(self, db_path: str, distance_method: str, url: str=None):
 
         self.client = None
         self.db_path = db_path
+        # a Qdrant server can be shared by several workers, the local path is locked by one process
+        self.url = url
         self.distance_method = None
 
         if distance_method == DistanceMethodEnums.COSINE.value:
@@ -20,25 +28,36 @@ class QdrantDBProvider(VectorDBInterface):
 
         self.logger = logging.getLogger(__name__)
 
+    @traced("qdrant.connect", attributes=lambda call: {"db.system": "qdrant", "db.url": call["self"].url})
     def connect(self):
-        self.client = QdrantClient(path=self.db_path)
+        if self.url:
+            self.client = QdrantClient(url=self.url)
+        else:
+            self.client = QdrantClient(path=self.db_path)
 
     def disconnect(self):
         self.client = None
 
+    @traced("qdrant.collection_exists", attributes=collection_attributes)
     def is_collection_existed(self, collection_name: str) -> bool:
         return self.client.collection_exists(collection_name=collection_name)
     
+    @traced("qdrant.get_collections", attributes=collection_attributes)
     def list_all_collections(self) -> List:
         return self.client.get_collections()
     
+    @traced("qdrant.get_collection", attributes=collection_attributes)
     def get_collection_info(self, collection_name: str) -> dict:
         return self.client.get_collection(collection_name=collection_name)
     
+    @traced("qdrant.delete_collection", attributes=collection_attributes)
     def delete_collection(self, collection_name: str):
         if self.is_collection_existed(collection_name):
             return self.client.delete_collection(collection_name=collection_name)
         
+    @traced("qdrant.create_collection", attributes=lambda call: {
+        **collection_attributes(call), "db.embedding_size": call["embedding_size"], "db.do_reset": call["do_reset"]
+    })
     def create_collection(self, collection_name: str, 
                                 embedding_size: int,
                                 do_reset: bool = False):
@@ -58,6 +77,7 @@ class QdrantDBProvider(VectorDBInterface):
         
         return False
     
+    @traced("qdrant.insert_one", attributes=collection_attributes)
     def insert_one(self, collection_name: str, text: str, vector: list,
                          metadata: dict = None, 
                          record_id: str = None):
@@ -85,6 +105,9 @@ class QdrantDBProvider(VectorDBInterface):
 
         return True
     
+    @traced("qdrant.insert_many", attributes=lambda call: {
+        **collection_attributes(call), "db.record_count": len(call["texts"]), "db.batch_size": call["batch_size"]
+    })
     def insert_many(self, collection_name: str, texts: list, 
                           vectors: list, metadata: list = None, 
                           record_ids: list = None, batch_size: int = 50):
@@ -126,6 +149,8 @@ class QdrantDBProvider(VectorDBInterface):
 
         return True
         
+    @traced("qdrant.search", attributes=lambda call: {**collection_attributes(call), "db.limit": call["limit"]},
+            result_attributes=lambda results: {"db.result_count": len(results) if results else 0})
     def search_by_vector(self, collection_name: str, vector: list, limit: int = 5):
 
         results = self.client.search(
@@ -141,7 +166,34 @@ class QdrantDBProvider(VectorDBInterface):
             RetrievedDocument(**{
                 "score": result.score,
                 "text": result.payload["text"],
+                "metadata": result.payload.get("metadata"),
             })
             for result in results
         ]
 
+    @traced("qdrant.search_batch", attributes=lambda call: {**collection_attributes(call), "db.limit": call["limit"],
+                                                            "db.query_count": len(call["vectors"])},
+            result_attributes=lambda results: {"db.result_count": sum(len(r) for r in results)})
+    def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5):
+        """Search several vectors in one round trip, one list of results (maybe empty) per vector"""
+
+        batch_results = self.client.search_batch(
+            collection_name=collection_name,
+            requests=[
+                models.SearchRequest(vector=vector, limit=limit, with_payload=True)
+                for vector in vectors
+            ]
+        )
+
+        return [
+            [
+                RetrievedDocument(**{
+                    "score": result.score,
+                    "text": result.payload["text"],
+                    "metadata": result.payload.get("metadata"),
+                })
+                for result in results
+            ]
+            for results in batch_results
+        ]
+
@@ -0,0 +1,87 @@
+from dotenv import dotenv_values
+from http.server import ThreadingHTTPServer
+from tests.fixture_site import FixtureSiteHandler
+from tests.mock_llm_server import MockLLMHandler
+import asyncio
+import os
+import threading
+import pytest
+
+
+@pytest.fixture
+def settings_env(monkeypatch):
+    """The .env.example values for every setting not already in the environment"""
+    example_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env.example")
+    for key, value in dotenv_values(example_path).items():
+        if key not in os.environ and value is not None:
+            monkeypatch.setenv(key, value)
+
+
+READINESS_COMPONENTS = ["mongodb", "vector_db", "embedding_model"]
+
+
+@pytest.fixture
+def run_data_router(settings_env):
+    """
+    Run a test coroutine with a client of the data router, on mongomock-motor
+
+    The coroutine gets the client and the database. Only ready_components are
+    marked ready, the others stay pending. Character chunking does not embed,
+    so there is no embedding client.
+    """
+    mongomock_motor = pytest.importorskip("mongomock_motor")
+    from fastapi import FastAPI
+    from helpers.readiness import ReadinessTracker
+    from routes import data
+    import httpx
+
+    def run(test, ready_components: list=READINESS_COMPONENTS):
+
+        async def run_test():
+            app = FastAPI()
+            app.include_router(data.data_router)
+            app.mongo_conn = mongomock_motor.AsyncMongoMockClient()
+            app.db_client = app.mongo_conn["hr_toolkit_test"]
+            app.embedding_client = None
+
+            app.readiness = ReadinessTracker(components=READINESS_COMPONENTS)
+            for name in ready_components:
+                await app.readiness.run(name, asyncio.sleep(0))
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test/api/v1") as client:
+                return await test(client, app.db_client)
+
+        return asyncio.run(run_test())
+
+    return run
+
+
+@pytest.fixture
+def mock_llm_server(monkeypatch):
+    """Base url of a mock OpenAI-compatible server answering immediately and without errors"""
+    monkeypatch.setattr(MockLLMHandler, "latency_ms", 0)
+    monkeypatch.setattr(MockLLMHandler, "rate_limit_ratio", 0.0)
+    monkeypatch.setattr(MockLLMHandler, "server_error_ratio", 0.0)
+    monkeypatch.setattr(MockLLMHandler, "attempts", 0)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockLLMHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fixture_site(monkeypatch):
+    """Base url of a 20 page fixture site answering immediately, its response counters reset"""
+    monkeypatch.setattr(FixtureSiteHandler, "pages", 20)
+    monkeypatch.setattr(FixtureSiteHandler, "latency_ms", 0)
+    monkeypatch.setattr(FixtureSiteHandler, "full_responses", 0)
+    monkeypatch.setattr(FixtureSiteHandler, "not_modified_responses", 0)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureSiteHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,66 @@
+from http.server import BaseHTTPRequestHandler
+import hashlib
+import threading
+import time
+
+
+class FixtureSiteHandler(BaseHTTPRequestHandler):
+    """Synthetic same-domain site with ETag / Last-Modified validators"""
+
+    pages = 50
+    links_per_page = 4
+    latency_ms = 50
+    last_modified = "Mon, 06 Jan 2025 10:00:00 GMT"
+    full_responses = 0
+    not_modified_responses = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def render_page(self, page_id: int) -> bytes:
+        links = "".join(
+            f'<li><a href="/page/{(page_id * self.links_per_page + i + 1) % self.pages}#top">Page</a></li>'
+            for i in range(self.links_per_page)
+        )
+        paragraphs = "".join(
+            f"<p>Section {i} of page {page_id}: our teams build products for customers worldwide.</p>"
+            for i in range(20)
+        )
+        return (
+            f"<html><head><title>Fixture page {page_id}</title><style>p {{}}</style></head>"
+            f"<body><h1>Page {page_id}</h1>{paragraphs}<ul>{links}"
+            f'<li><a href="https://external.example.org/">External</a></li></ul>'
+            f"<script>var tracking = true;</script></body></html>"
+        ).encode("utf-8")
+
+    def do_GET(self):
+        time.sleep(self.latency_ms / 1000)
+
+        path = self.path.rstrip("/") or "/"
+        page_id = 0 if path == "/" else int(path.rsplit("/", 1)[-1]) if path.startswith("/page/") else None
+        if page_id is None or page_id >= self.pages:
+            self.send_response(404)
+            self.end_headers()
+            return
+
+        body = self.render_page(page_id)
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+
+        if self.headers.get("If-None-Match") == etag:
+            with FixtureSiteHandler.lock:
+                FixtureSiteHandler.not_modified_responses += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        with FixtureSiteHandler.lock:
+            FixtureSiteHandler.full_responses += 1
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", self.last_modified)
+        self.end_headers()
+        self.wfile.write(body)
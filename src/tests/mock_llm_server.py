@@ -0,0 +1,67 @@
+from http.server import BaseHTTPRequestHandler
+import json
+import random
+import threading
+import time
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    """OpenAI-compatible /chat/completions and /embeddings with injected latency and errors"""
+
+    latency_ms = 50
+    rate_limit_ratio = 0.0
+    server_error_ratio = 0.0
+    retry_after_seconds = 0.2
+    attempts = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status_code: int, payload: dict, headers: dict=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+
+        with MockLLMHandler.lock:
+            MockLLMHandler.attempts += 1
+
+        time.sleep(self.latency_ms / 1000 * random.uniform(0.5, 1.5))
+
+        roll = random.random()
+        if roll < self.rate_limit_ratio:
+            return self.send_json(429, {"error": {"message": "rate limited"}},
+                                  headers={"Retry-After": str(self.retry_after_seconds)})
+        if roll < self.rate_limit_ratio + self.server_error_ratio:
+            return self.send_json(503, {"error": {"message": "upstream unavailable"}})
+
+        if self.path.endswith("/embeddings"):
+            texts = request.get("input") or []
+            texts = [texts] if isinstance(texts, str) else texts
+            return self.send_json(200, {
+                "object": "list",
+                "model": request.get("model"),
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": [0.1] * 8}
+                    for i in range(len(texts))
+                ],
+                "usage": {"prompt_tokens": 1, "total_tokens": 1},
+            })
+
+        return self.send_json(200, {
+            "id": "mock", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get("model"),
+            "choices": [{
+                "index": 0, "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "mock answer"},
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+        })
@@ -0,0 +1,35 @@
+"""
+/data/process waits for the embedding model only for semantic chunking
+
+Run from the src directory:
+    python -m pytest tests
+"""
+from models import ResponseSignal
+
+
+def test_character_chunking_does_not_wait_for_the_embedding_model(run_data_router, monkeypatch):
+    monkeypatch.setenv("READINESS_WAIT_TIMEOUT_SECONDS", "0.1")
+
+    async def test(client, db_client):
+        response = await client.post("/data/process/readiness", json={"chunking_method": "character"})
+
+        # the empty project is reported, not the pending model
+        assert response.status_code == 400
+        assert response.json()["signal"] == ResponseSignal.NO_FILES_ERROR.value
+
+    run_data_router(test, ready_components=["mongodb"])
+
+
+def test_semantic_chunking_waits_for_the_embedding_model(run_data_router, monkeypatch):
+    monkeypatch.setenv("READINESS_WAIT_TIMEOUT_SECONDS", "0.1")
+
+    async def test(client, db_client):
+        response = await client.post("/data/process/readiness", json={"chunking_method": "semantic"})
+
+        assert response.status_code == 503
+        assert response.json()["detail"] == {
+            "signal": ResponseSignal.SERVICE_NOT_READY.value,
+            "components": {"embedding_model": "pending"},
+        }
+
+    run_data_router(test, ready_components=["mongodb"])
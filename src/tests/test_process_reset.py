@@ -0,0 +1,99 @@
+"""
+/data/process with do_reset=1 on part of a project: the assets it does not
+re-chunk must be re-chunked by the next incremental run
+
+Runs the data router in-process on mongomock-motor (requirements-dev.txt).
+
+Run from the src directory:
+    python -m pytest tests
+"""
+from controllers import ProcessController, ProjectController
+import os
+import shutil
+import pytest
+
+DOCUMENTS = {
+    "leave.txt": "Employees accrue two days of paid leave per month of service. " * 60,
+    "benefits.txt": "The health plan covers employees and their dependents from the first day. " * 60,
+}
+
+
+@pytest.fixture
+def project(settings_env):
+    """A project id whose uploaded files are removed afterwards"""
+    project_id = f"test{os.getpid()}"
+    yield project_id
+    shutil.rmtree(ProjectController().get_project_path(project_id=project_id), ignore_errors=True)
+
+
+async def upload_documents(client, project_id: str):
+    for file_name, content in DOCUMENTS.items():
+        response = await client.post(f"/data/upload/{project_id}",
+                                     files={"file": (file_name, content.encode("utf-8"), "text/plain")})
+        assert response.status_code == 200
+
+
+async def process(client, project_id: str, **kwargs):
+    response = await client.post(f"/data/process/{project_id}", json={"chunk_size": 500, **kwargs})
+    return response.status_code, response.json()
+
+
+async def get_asset_names(db_client):
+    return [ asset["asset_name"] for asset in await db_client["assets"].find({}).to_list(length=None) ]
+
+
+async def count_chunks(db_client):
+    return await db_client["chunks"].count_documents({})
+
+
+def test_filtered_reset_reprocesses_the_other_assets_next_run(project, run_data_router):
+
+    async def test(client, db_client):
+        await upload_documents(client, project)
+        first_file, _ = await get_asset_names(db_client)
+
+        status_code, body = await process(client, project)
+        assert status_code == 200 and body["processed_files"] == 2
+        total_chunks = await count_chunks(db_client)
+
+        # the reset deletes every chunk of the project but only re-chunks first_file
+        status_code, body = await process(client, project, file_id=first_file, do_reset=1)
+        assert status_code == 200 and body["processed_files"] == 1
+        assert await count_chunks(db_client) < total_chunks
+
+        status_code, body = await process(client, project)
+        assert status_code == 200
+        assert body["processed_files"] == 1 and body["skipped_files"] == 1
+        assert await count_chunks(db_client) == total_chunks
+
+    run_data_router(test)
+
+
+def test_interrupted_reset_reprocesses_every_asset_next_run(project, run_data_router, monkeypatch):
+
+    async def test(client, db_client):
+        await upload_documents(client, project)
+
+        status_code, _ = await process(client, project)
+        assert status_code == 200
+        total_chunks = await count_chunks(db_client)
+
+        # the reset fails on the first file, before the others are reached
+        iter_chunk_batches = ProcessController.iter_chunk_batches
+
+        def failing_iter_chunk_batches(self, *args, **kwargs):
+            raise RuntimeError("loader failed")
+            yield
+
+        monkeypatch.setattr(ProcessController, "iter_chunk_batches", failing_iter_chunk_batches)
+        status_code, _ = await process(client, project, do_reset=1)
+        assert status_code == 400
+        assert await count_chunks(db_client) == 0
+
+        monkeypatch.setattr(ProcessController, "iter_chunk_batches", iter_chunk_batches)
+        status_code, body = await process(client, project)
+        assert status_code == 200
+        assert body["processed_files"] == 2 and body["skipped_files"] == 0
+        assert await count_chunks(db_client) == total_chunks
+
+    run_data_router(test)
@@ -0,0 +1,78 @@
+"""
+Per-backend rate limiter: one max_concurrency cap for sync and async callers
+
+Run from the src directory:
+    python -m pytest tests
+"""
+from stores.llm.RateLimiter import RateLimiter
+import asyncio
+import threading
+import time
+
+
+class InFlightCounter:
+
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def enter(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+    def exit(self):
+        with self.lock:
+            self.current -= 1
+
+
+def test_sync_and_async_callers_share_max_concurrency():
+    rate_limiter = RateLimiter(name="test", max_concurrency=3)
+    counter = InFlightCounter()
+
+    def sync_call():
+        with rate_limiter.limit():
+            counter.enter()
+            time.sleep(0.02)
+            counter.exit()
+
+    async def async_call():
+        async with rate_limiter.alimit():
+            counter.enter()
+            await asyncio.sleep(0.02)
+            counter.exit()
+
+    async def run():
+        # worker threads (like semantic chunking) and event loop queries at once
+        threads = [ asyncio.to_thread(sync_call) for _ in range(8) ]
+        tasks = [ async_call() for _ in range(12) ]
+        await asyncio.gather(*threads, *tasks)
+
+    asyncio.run(run())
+
+    assert counter.peak == 3
+    assert rate_limiter.get_metrics()["in_flight"] == 0
+    assert rate_limiter.concurrency.in_use == 0
+
+
+def test_cancelled_async_waiter_does_not_hold_a_slot():
+    rate_limiter = RateLimiter(name="test", max_concurrency=1)
+
+    async def run():
+        with rate_limiter.limit():
+            waiter = asyncio.ensure_future(rate_limiter.alimit().__aenter__())
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+
+        # the slot is free again, for both kinds of callers
+        async with rate_limiter.alimit():
+            pass
+        with rate_limiter.limit():
+            pass
+
+    asyncio.run(asyncio.wait_for(run(), timeout=5))
+
+    assert rate_limiter.concurrency.in_use == 0
+    assert rate_limiter.concurrency.async_waiters == []
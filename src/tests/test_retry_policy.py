@@ -0,0 +1,128 @@
+"""
+Retry policy of the async LLM providers against the mock OpenAI-compatible
+server of tests/mock_llm_server.py
+
+Run from the src directory:
+    python -m pytest tests
+"""
+from stores.llm.HTTPClientPool import HTTPClientPool
+from stores.llm.LLMEnums import LLMEnums
+from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.RetryPolicy import RetryPolicy
+from stores.llm.providers import OpenAIProvider
+from tests.mock_llm_server import MockLLMHandler
+from types import SimpleNamespace
+import asyncio
+import time
+
+
+def generate(api_url: str, retry_policy: RetryPolicy):
+    """One agenerate_text call through a fresh provider, and its elapsed seconds"""
+
+    async def run():
+        http_pool = HTTPClientPool(timeout=10)
+        provider = OpenAIProvider(api_key="mock", api_url=api_url, http_pool=http_pool,
+                                  retry_policy=retry_policy)
+        provider.set_generation_model(model_id="mock-model")
+        try:
+            return await provider.agenerate_text(prompt="question", chat_history=[])
+        finally:
+            await http_pool.close()
+
+    started = time.perf_counter()
+    try:
+        return asyncio.run(run()), time.perf_counter() - started
+    except Exception as e:
+        return e, time.perf_counter() - started
+
+
+def test_success_needs_one_attempt(mock_llm_server):
+    result, _ = generate(mock_llm_server, RetryPolicy(max_retries=3, backoff_base=0.01))
+
+    assert result == "mock answer"
+    assert MockLLMHandler.attempts == 1
+
+
+def test_retry_after_is_honored(mock_llm_server, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "rate_limit_ratio", 1.0)
+    monkeypatch.setattr(MockLLMHandler, "retry_after_seconds", 0.3)
+
+    # without the header the backoff would be zero
+    error, elapsed = generate(mock_llm_server, RetryPolicy(max_retries=1, backoff_base=0.0))
+
+    assert getattr(error, "status_code", None) == 429
+    assert MockLLMHandler.attempts == 2
+    assert elapsed >= 0.3
+
+
+def test_retry_after_is_capped_by_backoff_max(mock_llm_server, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "rate_limit_ratio", 1.0)
+    monkeypatch.setattr(MockLLMHandler, "retry_after_seconds", 30)
+
+    error, elapsed = generate(mock_llm_server, RetryPolicy(max_retries=1, backoff_base=0.0, backoff_max=0.1))
+
+    assert getattr(error, "status_code", None) == 429
+    assert MockLLMHandler.attempts == 2
+    assert elapsed < 5
+
+
+def test_retries_are_bounded(mock_llm_server, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "server_error_ratio", 1.0)
+
+    error, _ = generate(mock_llm_server, RetryPolicy(max_retries=2, backoff_base=0.01))
+
+    assert getattr(error, "status_code", None) == 503
+    assert MockLLMHandler.attempts == 3
+
+
+def test_non_retryable_status_is_not_retried():
+    policy = RetryPolicy(max_retries=3)
+    error = Exception("bad request")
+    error.status_code = 400
+
+    assert policy.next_delay(attempt=0, error=error, started_at=time.monotonic()) is None
+
+
+def test_deadline_is_enforced(mock_llm_server, monkeypatch):
+    # every answer takes 250-750ms, far more than the deadline
+    monkeypatch.setattr(MockLLMHandler, "latency_ms", 500)
+
+    error, elapsed = generate(mock_llm_server, RetryPolicy(max_retries=5, backoff_base=0.01, deadline=0.2))
+
+    assert isinstance(error, asyncio.TimeoutError)
+    assert elapsed < 0.5
+    assert MockLLMHandler.attempts == 1
+
+
+def test_deadline_stops_retries(mock_llm_server, monkeypatch):
+    monkeypatch.setattr(MockLLMHandler, "rate_limit_ratio", 1.0)
+    monkeypatch.setattr(MockLLMHandler, "retry_after_seconds", 1.0)
+
+    # the Retry-After wait does not fit in the deadline, so the 429 is raised at once
+    error, elapsed = generate(mock_llm_server, RetryPolicy(max_retries=5, backoff_base=0.0, deadline=0.5))
+
+    assert getattr(error, "status_code", None) == 429
+    assert MockLLMHandler.attempts == 1
+    assert elapsed < 1.0
+
+
+def test_providers_are_deduplicated(mock_llm_server):
+    config = SimpleNamespace(
+        LLM_HTTP_MAX_CONNECTIONS=10, LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS=5, LLM_HTTP_TIMEOUT=10,
+        LLM_MAX_RETRIES=1, LLM_RETRY_BACKOFF_BASE=0.01, LLM_RETRY_BACKOFF_MAX=1.0, LLM_REQUEST_DEADLINE=5,
+        LLM_RATE_LIMITS={}, EMBEDDING_MICRO_BATCH_ENABLED=False,
+        OPENROUTER_API_KEY="mock", OPENAI_API_URL=mock_llm_server,
+        INPUT_DAFAULT_MAX_CHARACTERS=1000, GENERATION_DAFAULT_MAX_TOKENS=100, GENERATION_DAFAULT_TEMPERATURE=0.1,
+    )
+    factory = LLMProviderFactory(config)
+
+    generation_client = factory.create(provider=LLMEnums.OPENAI.value)
+    embedding_client = factory.create(provider=LLMEnums.OPENAI.value)
+
+    assert generation_client is embedding_client
+    assert len(factory.get_rate_limit_metrics()) == 1
+    # every remote backend shares the factory's pool and retry policy
+    assert generation_client.provider.http_pool is factory.http_pool
+    assert generation_client.provider.retry_policy is factory.retry_policy
+
+    asyncio.run(factory.close())
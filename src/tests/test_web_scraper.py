@@ -0,0 +1,101 @@
+"""
+WebScraper crawl bounds and response cache against the fixture site of
+tests/fixture_site.py
+
+Run from the src directory:
+    python -m pytest tests
+"""
+from stores.llm.HTTPClientPool import HTTPClientPool
+from stores.llm.GenerationCache import GenerationCache
+from stores.scraping.WebScraper import WebScraper
+from tests.fixture_site import FixtureSiteHandler
+import asyncio
+
+
+def crawl(url: str, cache_dir: str=None, rounds: int=1, **kwargs):
+    """The pages of each of rounds crawls of url by one scraper"""
+
+    async def run():
+        scraper = WebScraper(
+            http_pool=HTTPClientPool(timeout=10, follow_redirects=True),
+            response_cache=GenerationCache(cache_dir=cache_dir, name="web_pages") if cache_dir else None,
+        )
+        try:
+            return [ await scraper.crawl(url, **kwargs) for _ in range(rounds) ]
+        finally:
+            await scraper.close()
+
+    return asyncio.run(run())
+
+
+def test_revalidation_serves_cached_html(fixture_site, tmp_path):
+    cold, warm = crawl(fixture_site, cache_dir=str(tmp_path), rounds=2, max_depth=1, max_pages=10)
+
+    assert not any(page.from_cache for page in cold)
+    assert all(page.from_cache for page in warm)
+    # the warm crawl costs one 304 per page, and parses the same content
+    assert FixtureSiteHandler.full_responses == len(cold)
+    assert FixtureSiteHandler.not_modified_responses == len(warm)
+    assert [ (page.url, page.title, page.text) for page in warm ] == \
+           [ (page.url, page.title, page.text) for page in cold ]
+
+
+def test_no_cache_fetches_every_time(fixture_site):
+    first, second = crawl(fixture_site, rounds=2)
+
+    assert not first[0].from_cache and not second[0].from_cache
+    assert FixtureSiteHandler.full_responses == 2
+    assert FixtureSiteHandler.not_modified_responses == 0
+
+
+def test_depth_zero_scrapes_the_landing_page_only(fixture_site):
+    pages, = crawl(fixture_site, max_depth=0, max_pages=10)
+
+    assert [ page.url for page in pages ] == [fixture_site]
+    assert FixtureSiteHandler.full_responses == 1
+
+
+def test_crawl_respects_depth(fixture_site):
+    pages, = crawl(fixture_site, max_depth=1, max_pages=100)
+
+    # the landing page links to pages 1 to 4, their own links are one hop too far
+    assert pages[0].url == fixture_site
+    assert sorted(page.url for page in pages[1:]) == [ f"{fixture_site}page/{i}" for i in range(1, 5) ]
+    assert all(page.depth == 1 for page in pages[1:])
+    assert FixtureSiteHandler.full_responses == 5
+
+
+def test_crawl_respects_max_pages(fixture_site):
+    pages, = crawl(fixture_site, max_depth=3, max_pages=7)
+
+    assert len(pages) == 7
+    assert len({ page.url for page in pages }) == 7
+    assert max(page.depth for page in pages) <= 3
+    assert FixtureSiteHandler.full_responses == 7
+
+
+def test_off_domain_links_are_not_followed(fixture_site):
+    pages, = crawl(fixture_site, max_depth=2, max_pages=100)
+
+    domain = WebScraper.get_domain(fixture_site)
+    assert all(WebScraper.get_domain(page.url) == domain for page in pages)
+    # every page links to https://external.example.org/, which is dropped at parse time
+    assert all(WebScraper.get_domain(link) == domain for page in pages for link in page.links)
+    assert FixtureSiteHandler.full_responses == len(pages)
+
+
+def test_page_is_capped_at_max_page_bytes(fixture_site):
+
+    async def run():
+        scraper = WebScraper(http_pool=HTTPClientPool(timeout=10), max_page_bytes=300)
+        try:
+            return await scraper.fetch(fixture_site)
+        finally:
+            await scraper.close()
+
+    _, html, from_cache = asyncio.run(run())
+
+    # a fixture page is about 2 KB
+    assert len(html.encode("utf-8")) <= 300
+    assert html.startswith("<html><head><title>Fixture page 0</title>")
+    assert not from_cache
@@ -0,0 +1,68 @@
+"""
+Website summary sections: map-reduce only when the scraped content is over budget
+
+Run from the src directory:
+    python -m pytest tests
+"""
+from controllers.WebScrapingController import WebScrapingController
+from stores.scraping.WebScraper import WebPage
+import asyncio
+import pytest
+
+
+class FakeGenerationClient:
+    """Counts one token per word and records the section summaries it is asked for"""
+
+    default_input_max_characters = 100000
+
+    def __init__(self):
+        self.prompts = []
+
+    def count_tokens(self, text: str) -> int:
+        return len(text.split())
+
+    async def agenerate_text(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                             temperature: float=None):
+        self.prompts.append(prompt)
+        return "notes"
+
+
+@pytest.fixture
+def controller(settings_env, monkeypatch):
+    monkeypatch.setenv("WEB_SUMMARY_SECTION_TOKENS", "300")
+    monkeypatch.setenv("WEB_SUMMARY_SECTION_OVERLAP_TOKENS", "10")
+    return WebScrapingController(generation_client=FakeGenerationClient())
+
+
+def make_pages(count: int, words: int):
+    return [ WebPage(url=f"https://example.com/{i}", title=f"Page {i}", text="policy " * words, links=[])
+             for i in range(count) ]
+
+
+def test_small_crawl_fits_in_one_prompt(controller):
+    pages = make_pages(count=4, words=50)
+
+    assert controller.split_sections(pages) == [controller.get_website_content(pages)]
+    assert asyncio.run(controller.map_reduce_content("Acme", pages)) is None
+    assert controller.generation_client.prompts == []
+
+
+def test_large_crawl_is_split_per_page_within_budget(controller):
+    pages = make_pages(count=4, words=200)
+
+    sections = controller.split_sections(pages)
+
+    # 800 words over a 300 token budget, but each 200 word page fits on its own
+    assert len(sections) == 4
+    assert all(controller.get_section_length(section) <= 300 for section in sections)
+
+    notes = asyncio.run(controller.map_reduce_content("Acme", pages))
+    assert notes is not None
+    assert len(controller.generation_client.prompts) == 4
+
+
+def test_section_length_respects_the_input_truncation(controller):
+    # 1000 characters of a provider truncating at 1000 are over budget at any token count
+    controller.generation_client.default_input_max_characters = 1000
+
+    assert controller.get_section_length("x" * 1000) > 300